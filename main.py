@@ -1,94 +1,457 @@
+import cProfile
 import os
 import sys
+from collections import deque
 from pathlib import Path
-from uml_generator.entities import Project
-from uml_generator.file_scanner import FileScanner
+from typing import Callable, Iterable, Iterator
+from uml_generator import profiling, source_files
+from uml_generator.benchmark import Benchmark
+from uml_generator.budget import WALK_SHARE, BudgetClock, Coverage, FilePriority, ScanBudget
+from uml_generator.daemon import DEFAULT_MAX_MEMORY, DEFAULT_MAX_PROJECTS, DaemonClient, DiagramDaemon, WarmProjects, daemonCacheName, defaultSocket, limitsKey
+from uml_generator.dependency_index import DependencyIndex
+from uml_generator.entities import FileResult, Project, ProjectBuilder
+from uml_generator.git_delta import DeltaScanner, GitError
+from uml_generator.parallel_scanner import ParallelScanner
+from uml_generator.packages import PackageWriter
+from uml_generator.parsers import parserFor
+from uml_generator.prefetch import DEFAULT_DEPTH, DEFAULT_READERS
+from uml_generator.memory import memoryReport
+from uml_generator.mermaid import MermaidFragments, MermaidWriter, iterMermaid, openOutput, writeMermaidFile
+from uml_generator.project_model import ModelError, ProjectModel
+from uml_generator.renderers import defaultOutput, formats, writerFor
+from uml_generator.scan_cache import DEFAULT_MAX_BYTES, ScanCache
+from uml_generator.shards import ShardedOutput
+from uml_generator.source_files import DEFAULT_MAX_FILE_BYTES, SourceLimits
+from uml_generator.subgraph import DIRECTIONS, Focus
+from uml_generator.synthetic_corpus import CorpusSpec, SyntheticCorpus
+from uml_generator.walker import ProjectWalker, WalkStats
+from uml_generator.watcher import ProjectWatcher
+from uml_generator.workspace import Workspace, WorkspaceScanner
 
-from tree_sitter import Language, Parser
-import tree_sitter_javascript as javascript
-import tree_sitter_typescript as typescript
 
-JAVASCRIPT = Language(javascript.language())
-TSX = Language(typescript.language_tsx())
-TS = Language(typescript.language_typescript())
+class NavigateTroughtProject():
+    def __init__(self, include:Iterable[str]=(), exclude:Iterable[str]=(), useIgnoreFiles:bool=True, defaultExcludes:bool=True, limits:SourceLimits=SourceLimits(), readers:int=DEFAULT_READERS, prefetchDepth:int=DEFAULT_DEPTH):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.useIgnoreFiles = useIgnoreFiles
+        self.defaultExcludes = defaultExcludes
+        self.limits = limits
+        self.readers = readers
+        self.prefetchDepth = prefetchDepth
+        self.walkStats = WalkStats()
+        self.skipped: dict[str, int] = {}
+        self.coverage: Coverage | None = None
 
+    def walker(self, link:Path)->ProjectWalker:
+        return ProjectWalker(
+            root=link,
+            include=self.include,
+            exclude=self.exclude,
+            useIgnoreFiles=self.useIgnoreFiles,
+            defaultExcludes=self.defaultExcludes,
+            skipGenerated=self.limits.skipGenerated,
+            maxFileBytes=self.limits.maxBytes,
+        )
 
-class NavigateTroughtProject():
-    def registerFile(self, link:Path, fileName:str, project:Project)->Project|None:
-        if 'test' in fileName:
-            return project 
-        if fileName.endswith((".tsx",)):
-            parser = Parser(TSX)
-            project = FileScanner.fileScanner(link=link,project=project,parser=parser)
-        elif fileName.endswith((".ts")):
-            parser = Parser(TS)
-            project = FileScanner.fileScanner(link=link,project=project,parser=parser)
-        elif fileName.endswith((".js")):
-            parser = Parser(JAVASCRIPT)
-            project = FileScanner.fileScanner(link=link,project=project, parser=parser)
-        else:
-            return project
-        return project
+    def skipReport(self)->str|None:
+        # Au chemin pendant le parcours, au contenu à la lecture
+        generated = self.walkStats.generatedFiles + self.skipped.get("generated", 0)
+        oversized = self.walkStats.oversizedFiles + self.skipped.get("oversized", 0)
+        if not (generated or oversized or self.walkStats.generatedDirectories):
+            return None
+        return (
+            f"🧹 Non analysés : {generated} fichiers minifiés/générés, {self.walkStats.generatedDirectories} dossiers dist/build, "
+            f"{oversized} fichiers trop gros"
+        )
+
+    def listFiles(self, link:Path)->Iterable[Path]:
+        walker = self.walker(link)
+        yield from walker.walk()
+        self.walkStats = walker.stats
     
-    def navigationProject(self,link:Path, project:Project)->Project:
-        project = project 
-        for root, dirs, files in os.walk(link):
-            for file in files:
-                if 'node_modules' in root or root == str(link):
+    def scanFiles(self, files:list[Path], jobs:int=1, cache:ScanCache|None=None)->Iterable[FileResult]:
+        # Consultation du cache au fil de l'eau : un scan arrêté au budget ne
+        # paie ni stat ni hash pour les fichiers qu'il n'atteint pas
+        decisions: deque[tuple[Path, FileResult|None]] = deque()
+
+        def missing()->Iterator[Path]:
+            for path in files:
+                result = None
+                if cache:
+                    with profiling.stage("cache"):
+                        result = cache.lookup(path)
+                decisions.append((path, result))
+                if result is None:
+                    yield path
+
+        # Cache actif : le scanner hashe les octets qu'il lit et compare au hash en cache
+        known = cache.known if cache else None
+        if jobs > 1:
+            scanned = iter(ParallelScanner.scanFiles(files=missing(), jobs=jobs, chunk=ParallelScanner.chunkSize(files, jobs), known=known))
+        elif self.readers > 0:
+            # Lecture des fichiers suivants en tâche de fond pendant le parse
+            scanned = iter(ParallelScanner.scanPrefetched(files=missing(), readers=self.readers, depth=self.prefetchDepth, known=known))
+        else:
+            scanned = (ParallelScanner.scanFile(link=path, parser=parserFor(path.name), hashed=cache is not None, known=known(path) if known else None) for path in missing())
+        # Les scanners lisent en avance : leurs résultats attendent ici que les
+        # fichiers servis par le cache avant eux soient rendus, dans l'ordre de parcours
+        ready: deque[FileResult] = deque()
+        try:
+            while True:
+                if not decisions:
+                    try:
+                        ready.append(next(scanned))
+                    except StopIteration:
+                        if not decisions:
+                            break
                     continue
-                chemin_complet = Path(os.path.join(root, file))
-                project = self.registerFile(link=chemin_complet, fileName=file, project=project)
-        return project
-            
-    def setProject(self,link:Path)->Project:
+                path, result = decisions.popleft()
+                if result is None:
+                    result = ready.popleft() if ready else next(scanned)
+                    if cache:
+                        stored = cache.store(result)
+                        if stored is None:
+                            # Contenu inchangé mais entrée illisible : analyse complète
+                            stored = cache.store(ParallelScanner.scanFile(link=path, parser=parserFor(path.name), hashed=True))
+                        result = stored
+                if result.skipped:
+                    self.skipped[result.skipped] = self.skipped.get(result.skipped, 0) + 1
+                yield result
+        finally:
+            # Arrêt anticipé : libère les lectures et lots en attente
+            if hasattr(scanned, "close"):
+                scanned.close()
+    
+    def projectFiles(self, link:Path, clock:BudgetClock|None=None)->list[Path]:
+        with profiling.stage("walk"):
+            if clock is None:
+                return list(self.listFiles(link))
+            files = []
+            for path in self.listFiles(link):
+                files.append(path)
+                # Parcours borné lui aussi : sur un très gros dépôt, il peut coûter tout le budget
+                if clock.expired(WALK_SHARE):
+                    self.coverage.walkComplete = False
+                    break
+            return files
+
+    def budgetFiles(self, link:Path, budget:ScanBudget, clock:BudgetClock)->tuple[list[Path], dict[Path, int]]:
+        self.coverage = Coverage()
+        files, sizes = FilePriority.order(self.projectFiles(link, clock), clock, self.coverage)
+        if budget.maxFiles is not None:
+            files = files[:budget.maxFiles]
+        return files, sizes
+    
+    def navigationProject(self,link:Path, project:Project, jobs:int=1, cache:ScanCache|None=None, onFile:Callable[[FileResult], None]|None=None, budget:ScanBudget|None=None, onFlush:Callable[[Project], None]|None=None)->Project:
+        clock = BudgetClock(budget) if budget else None
+        if clock:
+            # Scan partiel : fichiers les plus utiles d'abord, arrêt au budget
+            files, sizes = self.budgetFiles(link, budget, clock)
+            clock.startScan()
+        else:
+            files = self.projectFiles(link)
+        builder = ProjectBuilder(name=project.name, path=project.path, classs=project.classs)
+        for result in self.scanFiles(files=files, jobs=jobs, cache=cache):
+            builder.addClasses(result.classs)
+            if onFile:
+                onFile(result)
+            if clock:
+                self.coverage.scanned += 1
+                self.coverage.scannedBytes += sizes.get(result.path, 0)
+                if clock.expired():
+                    self.coverage.reason = "time"
+                    break
+                if onFlush and clock.flushDue():
+                    with profiling.stage("flush"):
+                        onFlush(DependencyIndex.resolve(Project(name=builder.name, classs=list(builder.classs), path=builder.path)))
+        if clock:
+            if self.coverage.reason == "complete" and self.coverage.scanned < self.coverage.found:
+                self.coverage.reason = "files"
+            self.coverage.elapsed = clock.elapsed()
+        with profiling.stage("resolve"):
+            return DependencyIndex.resolve(builder.build())
+
+    def projectName(self, link:Path)->str:
         projectNames = str(link).split('/')
-        project = Project(name=projectNames[-1],classs=[],path=link)
-        result = self.navigationProject(link=link,project=project)
+        return projectNames[-1]
+            
+    def setProject(self,link:Path, jobs:int=1, cache:ScanCache|None=None, onFile:Callable[[FileResult], None]|None=None, budget:ScanBudget|None=None, onFlush:Callable[[Project], None]|None=None)->Project:
+        project = Project(name=self.projectName(link),classs=[],path=link)
+        result = self.navigationProject(link=link,project=project,jobs=jobs,cache=cache,onFile=onFile,budget=budget,onFlush=onFlush)
         return result
     
-def generate_mermaid(project: Project) -> str:
-    lines = [f"classDiagram", f'%% Diagramme UML du projet "{project.name}"']
+def generate_mermaid(project: Project, focus:Focus|None=None) -> str:
+    if focus:
+        project = focus.apply(project)
+    print(f"💡 Nombre de classes dans le projet : {len(project.classs)}")
+    return "".join(iterMermaid(project))
+
+def writeDiagram(project:Project, output:Path=Path("diagram.mmd"), focus:Focus|None=None, fragments:MermaidFragments|None=None)->None:
+    if focus:
+        project = focus.apply(project)
     print(f"💡 Nombre de classes dans le projet : {len(project.classs)}")
-    for classe in project.classs:
-        # Déclaration de la classe/fonction
-        # print(f"🧱 {classe.name} ({classe.class_type}) → méthodes : {len(c.method)} / dépendances : {c.children}")
-        label = f"class {classe.name}"
-        stereotype = f"«{classe.class_type}»"
-        lines.append(f"{label} {{")
-        lines.append(f"  {stereotype}")
-        
-        # Ajout des paramètres
-        for param in classe.params:
-            lines.append(f"  +{param}")
-        
-        # Ajout des méthodes
-        for method in classe.method:
-            params = ", ".join(method.params) if isinstance(method.params, list) else ""
-            retour = f": {method.retour}" if method.retour else ""
-            lines.append(f"  +{method.name}({params}){retour}")
-        
-        lines.append("}")
-
-    # Lien de dépendances
-    for classe in project.classs:
-        for dependency in classe.children:
-            lines.append(f"{classe.name} --> {dependency}")
-
-    return "\n".join(lines)
+    writeMermaidFile(project, output, fragments)
+
+def readOption(args:list[str], name:str, default:str|None=None)->str|None:
+    if name not in args:
+        return default
+    index = args.index(name)
+    if index + 1 >= len(args):
+        print(f"Missing value for {name}")
+        sys.exit(1)
+    return args[index + 1]
+
+def hasFlag(args:list[str], name:str)->bool:
+    return name in args
+
+def readOptions(args:list[str], name:str)->list[str]:
+    # Option répétable : --exclude a --exclude b
+    return [args[index + 1] for index, arg in enumerate(args[:-1]) if arg == name]
+
+def readFocus(options:list[str])->Focus|None:
+    patterns = readOptions(options, "--focus")
+    if not patterns:
+        return None
+    direction = readOption(options, "--direction", "both")
+    if direction not in DIRECTIONS:
+        print(f"--direction must be one of {', '.join(DIRECTIONS)}")
+        sys.exit(1)
+    try:
+        depth = int(readOption(options, "--depth", "1"))
+    except ValueError:
+        print("--depth must be a number")
+        sys.exit(1)
+    if depth < 0:
+        print("--depth must not be negative")
+        sys.exit(1)
+    return Focus(patterns=tuple(patterns), depth=depth, direction=direction)
+
+def readPackageView(options:list[str])->tuple[int, int]|None:
+    # --packages K : un noeud par dossier sur K niveaux, --min-weight N : liens plus fins écartés
+    if "--packages" not in options:
+        return None
+    try:
+        return int(readOption(options, "--packages")), int(readOption(options, "--min-weight", "1"))
+    except ValueError:
+        print("--packages and --min-weight must be numbers")
+        sys.exit(1)
+
+def readBudget(options:list[str])->ScanBudget|None:
+    if "--time-budget" not in options and "--max-files" not in options:
+        return None
+    try:
+        seconds = readOption(options, "--time-budget")
+        maxFiles = readOption(options, "--max-files")
+        return ScanBudget(
+            seconds=float(seconds) if seconds else None,
+            maxFiles=int(maxFiles) if maxFiles else None,
+            flushInterval=float(readOption(options, "--flush-interval", "2")),
+        )
+    except ValueError:
+        print("--time-budget, --max-files and --flush-interval must be numbers")
+        sys.exit(1)
+
+def writePackages(project:Project, output:Path, packageView:tuple[int, int])->None:
+    depth, minWeight = packageView
+    with openOutput(output) as sink:
+        writer = PackageWriter(sink, depth=depth, minWeight=minWeight)
+        writer.writeProject(project)
+    print(writer.report())
+
+def renderModel(source:Path, options:list[str], focus:Focus|None)->None:
+    # Aucun parse : le modèle enregistré par get_uml --save-model suffit
+    format = readOption(options, "--format", "mermaid")
+    if format not in formats():
+        print(f"--format must be one of {', '.join(formats())}")
+        sys.exit(1)
+    output = Path(readOption(options, "--output", defaultOutput(format)))
+    try:
+        project = ProjectModel.load(source)
+    except (OSError, ModelError) as error:
+        print(f"cannot read model {source}: {error}")
+        sys.exit(1)
+    if focus:
+        project = focus.apply(project)
+    packageView = readPackageView(options)
+    if packageView:
+        writePackages(project, output, packageView)
+        return
+    with openOutput(output) as sink:
+        writer = writerFor(format, sink)
+        writer.writeProject(project)
+    print(f"💡 Nombre de classes dans le projet : {writer.classCount}")
+    print(f"📄 Diagramme {format} écrit dans {output}")
+
+def navigatorSettings(options:list[str])->dict:
+    # Options du parcours, envoyées telles quelles au démon (clé du projet chaud)
+    return {
+        "include": readOptions(options, "--include"),
+        "exclude": readOptions(options, "--exclude"),
+        "useIgnoreFiles": not hasFlag(options, "--no-ignore-files"),
+        "defaultExcludes": not hasFlag(options, "--no-default-excludes"),
+    }
+
+def requestDaemon(folder:Path, options:list[str], output:Path, focus:Focus|None)->bool:
+    # Client léger : False si aucun démon ne répond, le scan se fait alors en local
+    request = {"command": "render", "root": str(folder), "format": "mermaid", "limits": limitsKey(source_files.limits()), **navigatorSettings(options)}
+    if focus:
+        request.update(focus=list(focus.patterns), depth=focus.depth, direction=focus.direction)
+    response = DaemonClient(Path(readOption(options, "--socket", str(defaultSocket())))).request(request)
+    if response is None:
+        return False
+    if not response.get("ok"):
+        print(f"⚠️ Démon ignoré : {response.get('error')}")
+        return False
+    with openOutput(output) as sink:
+        sink.write(response["diagram"])
+    if focus:
+        print(f"🔎 Focus : {response['classes']} classes sur {response['total']} (profondeur {focus.depth}, {focus.direction})")
+    state = "chaud" if response["warm"] else "froid"
+    print(f"🛰️ Démon ({state}) : {response['changed']} fichier(s) analysé(s), réponse en {response['elapsed']:.1f} ms")
+    print(f"💡 Nombre de classes dans le projet : {response['classes']}")
+    print('analyse terminée')
+    return True
+
+def serveDaemon(options:list[str], jobs:int, limits:SourceLimits, readers:int, prefetchDepth:int)->None:
+    socketPath = Path(readOption(options, "--socket", str(defaultSocket())))
+    client = DaemonClient(socketPath)
+    if hasFlag(options, "--stop") or hasFlag(options, "--status"):
+        response = client.request({"command": "stop" if hasFlag(options, "--stop") else "status"}, timeout=5.0)
+        if response is None:
+            print(f"no daemon listening on {socketPath}")
+            sys.exit(1)
+        if hasFlag(options, "--stop"):
+            print(f"🛑 Démon arrêté ({socketPath})")
+        for project in response.get("projects", []):
+            print(f"🔥 {project['root']} : {project['classes']} classes, ~{project['bytes'] / (1024 * 1024):.1f} Mo")
+        return
+    try:
+        maxProjects = int(readOption(options, "--max-projects", str(DEFAULT_MAX_PROJECTS)))
+        maxMemory = int(readOption(options, "--max-memory", str(DEFAULT_MAX_MEMORY // (1024 * 1024))))
+    except ValueError:
+        print("--max-projects and --max-memory must be numbers")
+        sys.exit(1)
+    noCache = hasFlag(options, "--no-cache")
+    # Même dossier que get_uml (relatif au dossier de lancement), jamais dans le dépôt analysé
+    cacheDir = Path(readOption(options, "--cache-dir", ".uml_cache")).resolve() / "daemon"
+
+    def build(root:Path, settings:dict)->ProjectWatcher:
+        navigator = NavigateTroughtProject(
+            include=settings.get("include", ()),
+            exclude=settings.get("exclude", ()),
+            useIgnoreFiles=settings.get("useIgnoreFiles", True),
+            defaultExcludes=settings.get("defaultExcludes", True),
+            limits=limits,
+            readers=readers,
+            prefetchDepth=prefetchDepth,
+        )
+        # Un cache par dépôt : un redémarrage du démon repart chaud, et deux dépôts
+        # construits en parallèle n'écrivent pas dans la même base
+        cache = None if noCache else ScanCache(folder=cacheDir / daemonCacheName(root))
+        try:
+            results = list(navigator.scanFiles(files=navigator.projectFiles(root), jobs=jobs, cache=cache))
+        finally:
+            if cache:
+                cache.close()
+        return ProjectWatcher(walker=navigator.walker(root), results=results, render=lambda project: None)
+
+    projects = WarmProjects(build=build, maxProjects=maxProjects, maxBytes=maxMemory * 1024 * 1024)
+    try:
+        DiagramDaemon(projects=projects, socketPath=socketPath).serve()
+    except (RuntimeError, OSError) as error:
+        print(f"cannot start daemon: {error}")
+        sys.exit(1)
+
+def writeDelta(folder:Path, rev:str, navigator:NavigateTroughtProject, jobs:int, cache:ScanCache|None, output:Path)->None:
+    # Seuls les fichiers modifiés depuis rev et leur voisinage sont analysés
+    scanner = DeltaScanner(folder=folder, rev=rev, walker=navigator.walker(folder), scan=lambda files: navigator.scanFiles(files=files, jobs=jobs, cache=cache))
+    try:
+        delta = scanner.run()
+    except GitError as error:
+        print(f"--since: {error}")
+        sys.exit(1)
+    with openOutput(output) as sink:
+        sink.write("\n".join(delta.lines(navigator.projectName(folder), rev)))
+    print(scanner.stats.report(rev))
+    print(f"📄 Diagramme des changements écrit dans {output}")
+
+def generateCorpus(folder:Path, options:list[str])->None:
+    defaults = CorpusSpec()
+    try:
+        spec = CorpusSpec(
+            files=int(readOption(options, "--files", str(defaults.files))),
+            classesPerFile=int(readOption(options, "--classes-per-file", str(defaults.classesPerFile))),
+            methodsPerClass=int(readOption(options, "--methods-per-class", str(defaults.methodsPerClass))),
+            fanOut=int(readOption(options, "--fan-out", str(defaults.fanOut))),
+            seed=int(readOption(options, "--seed", str(defaults.seed))),
+        )
+    except ValueError as error:
+        # int() invalide, ou valeur hors bornes (CorpusSpec)
+        print(error if str(error).startswith("--") else "corpus options must be integers")
+        sys.exit(1)
+    size = SyntheticCorpus.generate(folder, spec)
+    print(f"🏗️ Corpus généré : {spec.files} fichiers, {size / (1024 * 1024):.1f} Mo dans {folder}")
+
+def runBench(folder:Path, options:list[str])->None:
+    report = Benchmark(folder).run()
+    for line in Benchmark.summary(report):
+        print(line)
+    jsonOutput = readOption(options, "--json")
+    if jsonOutput:
+        Benchmark.save(report, Path(jsonOutput))
+        print(f"📄 Résultats enregistrés dans {jsonOutput}")
 
 def main() -> None:
     try:
         command = sys.argv[1]
-        link = sys.argv[2]
+        # serve n'a pas d'argument positionnel
+        link = sys.argv[2] if command != "serve" else None
     except IndexError:
-        print("Usage: main.py <COMMAND>")
+        print("Usage: main.py <get_uml|watch|bench> <FOLDER> | render <MODEL> | serve [--stop|--status] [--socket PATH] [--max-projects N] [--max-memory MB] [--no-daemon] [--since REV] [--workspace] [--time-budget S] [--max-files N] [--flush-interval S] [--format mermaid|plantuml|dot] [--save-model FILE] [--jobs N] [--no-cache] [--cache-dir DIR] [--cache-size MB] [--interval S] [--max-rss] [--output FILE] [--shards DIR] [--shard-depth K] [--packages K] [--min-weight N] [--focus NAME|GLOB]... [--depth K] [--direction dependencies|dependents|both] [--include GLOB]... [--exclude GLOB]... [--no-ignore-files] [--no-default-excludes] [--max-file-size KB] [--keep-generated] [--readers N] [--prefetch-depth N] [--profile] [--profile-top N] [--profile-trace FILE] [--profile-pstats FILE]")
         exit(1)
+    options = sys.argv[2:] if command == "serve" else sys.argv[3:]
+    try:
+        jobs = int(readOption(options, "--jobs", "1"))
+        cacheSize = int(readOption(options, "--cache-size", str(DEFAULT_MAX_BYTES // (1024 * 1024))))
+        interval = float(readOption(options, "--interval", "0.3"))
+        profileTop = int(readOption(options, "--profile-top", "10"))
+        shardDepth = int(readOption(options, "--shard-depth", "1"))
+        maxFileSize = int(readOption(options, "--max-file-size", str(DEFAULT_MAX_FILE_BYTES // 1024)))
+        readers = int(readOption(options, "--readers", str(DEFAULT_READERS)))
+        prefetchDepth = int(readOption(options, "--prefetch-depth", str(DEFAULT_DEPTH)))
+    except ValueError:
+        print("--jobs, --cache-size, --interval, --profile-top, --shard-depth, --max-file-size, --readers and --prefetch-depth must be numbers")
+        sys.exit(1)
+    cacheDir = readOption(options, "--cache-dir", ".uml_cache")
+    output = Path(readOption(options, "--output", "diagram.mmd"))
+    profileTrace = readOption(options, "--profile-trace")
+    profileStats = readOption(options, "--profile-pstats")
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    focus = readFocus(options)
+    # --max-file-size en Ko, 0 = pas de limite ; repris par les workers --jobs
+    limits = SourceLimits(maxBytes=maxFileSize * 1024 if maxFileSize > 0 else None, skipGenerated=not hasFlag(options, "--keep-generated"))
+    source_files.configure(limits)
+    packageView = readPackageView(options)
+    budget = readBudget(options)
+    shardDir = readOption(options, "--shards")
+    shardOutput = ShardedOutput(folder=Path(shardDir), depth=shardDepth, jobs=max(jobs, 4)) if shardDir else None
     
-    if(command != "get_uml"):
+    if(command not in ("get_uml", "watch", "bench", "render", "serve")):
         print("Unsupported command")
         sys.exit(1)
+
+    if command == "render":
+        renderModel(Path(link), options, focus)
+        return
+
+    if command == "serve":
+        serveDaemon(options, jobs, limits, readers, prefetchDepth)
+        return
     
     folder = Path(link).resolve()
+    if command == "bench" and hasFlag(options, "--generate"):
+        generateCorpus(folder, options)
     if not folder.exists():
         print("folder not found")
         sys.exit(1)
@@ -96,13 +459,139 @@ def main() -> None:
         print("path is not a folder")
         sys.exit(1)  
 
-    navigator = NavigateTroughtProject()
-    project = navigator.setProject(link=folder)
-    uml_code = generate_mermaid(project)
+    if command == "bench":
+        runBench(folder, options)
+        return
+
+    # Démon lancé par "serve" : réponse sans scan ; les options qu'il ne gère pas imposent le local
+    local = ("--no-daemon", "--since", "--workspace", "--time-budget", "--max-files", "--shards", "--packages", "--save-model", "--profile", "--profile-trace", "--profile-pstats", "--max-rss")
+    if command == "get_uml" and not any(hasFlag(options, flag) for flag in local):
+        if requestDaemon(folder, options, output, focus):
+            return
+
+    navigator = NavigateTroughtProject(
+        **navigatorSettings(options),
+        limits=limits,
+        readers=readers,
+        prefetchDepth=prefetchDepth,
+    )
+    workspace = None
+    if command == "get_uml" and hasFlag(options, "--workspace"):
+        packages = Workspace.discover(folder)
+        if not packages:
+            print("--workspace: no packages found in package.json workspaces or pnpm-workspace.yaml")
+            sys.exit(1)
+        # Un cache par paquet, sous le dossier de cache habituel
+        workspaceCache = None if hasFlag(options, "--no-cache") else Path(cacheDir) / "workspace"
+        workspace = WorkspaceScanner(root=folder, packages=packages, navigator=navigator, jobs=jobs, cacheFolder=workspaceCache, cacheBytes=cacheSize * 1024 * 1024)
+    cache = None if hasFlag(options, "--no-cache") or workspace else ScanCache(folder=Path(cacheDir), maxBytes=cacheSize * 1024 * 1024)
+    if command == "watch":
+        results = list(navigator.scanFiles(files=navigator.projectFiles(folder), jobs=jobs, cache=cache))
+        if cache:
+            cache.close()
+        print(navigator.walkStats.report())
+        skipReport = navigator.skipReport()
+        if skipReport:
+            print(skipReport)
+        # Texte des classes inchangées repris d'un rendu à l'autre
+        fragments = MermaidFragments()
+        def render(project:Project)->None:
+            if shardOutput:
+                # Seuls les shards dont le contenu a changé sont réécrits
+                print(shardOutput.write(focus.apply(project) if focus else project).report())
+            elif packageView:
+                writePackages(focus.apply(project) if focus else project, output, packageView)
+            else:
+                writeDiagram(project, output, focus, fragments)
+        watcher = ProjectWatcher(walker=navigator.walker(folder), results=results, render=render, interval=interval)
+        render(watcher.project())
+        watcher.run()
+        return
+
+    since = readOption(options, "--since")
+    if since:
+        writeDelta(folder, since, navigator, jobs, cache, output)
+        if cache:
+            cache.close()
+        return
 
-    with open("diagram.mmd", "w") as f:
-        f.write(uml_code)
+    profiler = profiling.enable() if hasFlag(options, "--profile") or profileTrace else None
+    statsProfile = cProfile.Profile() if profileStats else None
+    if statsProfile:
+        statsProfile.enable()
+
+    def writeFile(result:FileResult)->None:
+        with profiling.stage("render"):
+            writer.writeClasses(result.classs)
+
+    def flush(partial:Project)->None:
+        # Diagramme partiel publié pendant un scan à budget (renommage atomique)
+        writeMermaidFile(focus.apply(partial) if focus else partial, output)
+        print(f"💾 Diagramme partiel : {len(partial.classs)} classes, {navigator.coverage.scanned}/{navigator.coverage.found} fichiers")
+
+    if focus or shardOutput or packageView or workspace or budget:
+        # Le sous-graphe, les shards et les dossiers ne sont connus qu'une fois les liens résolus
+        if workspace:
+            project = workspace.project()
+            navigator.walkStats, navigator.skipped = workspace.walkStats(), workspace.skipped()
+            for line in workspace.report():
+                print(line)
+        else:
+            # Les flushs partiels ne concernent que le diagramme Mermaid unique
+            onFlush = flush if budget and not (shardOutput or packageView) else None
+            project = navigator.setProject(link=folder, jobs=jobs, cache=cache, budget=budget, onFlush=onFlush)
+        rendered = project
+        if focus:
+            with profiling.stage("focus"):
+                rendered = focus.apply(project)
+            print(f"🔎 Focus : {len(rendered.classs)} classes sur {len(project.classs)} (profondeur {focus.depth}, {focus.direction})")
+        with profiling.stage("render"):
+            if shardOutput:
+                print(shardOutput.write(rendered).report())
+            elif packageView:
+                writePackages(rendered, output, packageView)
+            else:
+                with openOutput(output) as sink:
+                    MermaidWriter(sink).writeProject(rendered)
+        classCount = len(rendered.classs)
+    else:
+        # Les classes sont écrites dès qu'un fichier est analysé, les liens après résolution
+        with openOutput(output) as sink:
+            writer = MermaidWriter(sink)
+            writer.writeHeader(navigator.projectName(folder))
+            project = navigator.setProject(link=folder, jobs=jobs, cache=cache, onFile=writeFile)
+            with profiling.stage("render"):
+                writer.writeEdges(project.classs)
+        classCount = writer.classCount
+    modelOutput = readOption(options, "--save-model")
+    if modelOutput:
+        with profiling.stage("model"):
+            ProjectModel.save(project, Path(modelOutput))
+        print(f"📄 Modèle du projet enregistré dans {modelOutput}")
+    if statsProfile:
+        statsProfile.disable()
+        statsProfile.dump_stats(profileStats)
+        print(f"📄 Profil cProfile enregistré dans {profileStats}")
+    if profiler:
+        profiling.disable()
+        for line in profiler.summary(top=profileTop):
+            print(line)
+        if profileTrace:
+            profiler.writeChromeTrace(Path(profileTrace))
+            print(f"📄 Trace Chrome enregistrée dans {profileTrace}")
+    print(navigator.walkStats.report())
+    skipReport = navigator.skipReport()
+    if skipReport:
+        print(skipReport)
+    if navigator.coverage:
+        print(navigator.coverage.report())
+    if cache:
+        cache.close()
+        print(f"🗃️ Cache : {cache.hits} fichiers réutilisés, {cache.misses} analysés")
+    print(f"💡 Nombre de classes dans le projet : {classCount}")
     print('analyse terminée')
+    if hasFlag(options, "--max-rss"):
+        print(memoryReport())
     sys.exit(1)
 
     
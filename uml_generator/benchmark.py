@@ -0,0 +1,121 @@
+import io
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from uml_generator.dependency_index import DependencyIndex
+from uml_generator.entities import ProjectBuilder
+from uml_generator.file_scanner import FileScanner
+from uml_generator.memory import peakRss
+from uml_generator.mermaid import MermaidWriter
+from uml_generator.parsers import parserFor
+from uml_generator.source_files import SkippedSource, readSource
+from uml_generator.walker import ProjectWalker
+
+STAGES = ("walk", "read", "parse", "extract", "resolve", "render")
+
+
+def _revision()->str|None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class Benchmark():
+    """Exécute le pipeline get_uml étape par étape et mesure chaque étape."""
+
+    def __init__(self, link:Path):
+        self.link = Path(link)
+        self.timings: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.files = 0
+        self.bytes = 0
+        self.classes = 0
+        self.edges = 0
+
+    def run(self)->Dict:
+        start = time.perf_counter()
+        files = list(ProjectWalker(root=self.link).walk())
+        self.timings["walk"] = time.perf_counter() - start
+        self.files = len(files)
+
+        builder = ProjectBuilder(name=self.link.name, path=self.link)
+        for path in files:
+            start = time.perf_counter()
+            try:
+                code = readSource(path)
+            except SkippedSource:
+                continue
+            finally:
+                self.timings["read"] += time.perf_counter() - start
+            self.bytes += len(code)
+
+            parser = parserFor(path.name)
+            start = time.perf_counter()
+            tree = parser.parse(code)
+            self.timings["parse"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            builder.addClasses(FileScanner.scanTree(root=tree.root_node, link=path, code=code))
+            self.timings["extract"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        project = DependencyIndex.resolve(builder.build())
+        self.timings["resolve"] = time.perf_counter() - start
+        self.classes = len(project.classs)
+        self.edges = sum(len(classe.children) for classe in project.classs)
+
+        start = time.perf_counter()
+        MermaidWriter(io.StringIO()).writeProject(project)
+        self.timings["render"] = time.perf_counter() - start
+        return self.report()
+
+    @classmethod
+    def _rate(cls, count:float, seconds:float)->float|None:
+        return round(count / seconds, 1) if seconds > 0 else None
+
+    def report(self)->Dict:
+        total = sum(self.timings.values())
+        megabytes = self.bytes / (1024 * 1024)
+        return {
+            "revision": _revision(),
+            "python": platform.python_version(),
+            "folder": str(self.link),
+            "files": self.files,
+            "bytes": self.bytes,
+            "classes": self.classes,
+            "edges": self.edges,
+            "stages": {stage: round(seconds, 6) for stage, seconds in self.timings.items()},
+            "total_seconds": round(total, 6),
+            "files_per_second": self._rate(self.files, total),
+            "classes_per_second": self._rate(self.classes, total),
+            "megabytes_per_second": self._rate(megabytes, total),
+            "parse_megabytes_per_second": self._rate(megabytes, self.timings["parse"]),
+            "peak_rss_bytes": peakRss(),
+        }
+
+    @classmethod
+    def summary(cls, report:Dict)->List[str]:
+        lines = [f"⏱️ {report['files']} fichiers, {report['classes']} classes, {report['edges']} liens"]
+        for stage, seconds in report["stages"].items():
+            lines.append(f"  {stage:<8} {seconds * 1000:10.1f} ms")
+        lines.append(
+            f"  total    {report['total_seconds'] * 1000:10.1f} ms — {report['files_per_second']} fichiers/s, "
+            f"{report['classes_per_second']} classes/s, {report['megabytes_per_second']} Mo/s"
+        )
+        return lines
+
+    @classmethod
+    def save(cls, report:Dict, output:Path)->None:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,124 @@
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from uml_generator import profiling
+
+# Parts du budget de temps au-delà desquelles le parcours, puis la pré-passe, s'arrêtent
+WALK_SHARE = 0.3
+PRIORITY_SHARE = 0.5
+# Les imports sont en tête de fichier : la pré-passe ne lit que ce début
+IMPORT_HEAD_BYTES = 4096
+RELATIVE_IMPORT = re.compile(rb"""(?:\bfrom\s*|\brequire\s*\(\s*|\bimport\s*\(\s*|\bimport\s+)['"](\.\.?/[^'"\n]+)['"]""")
+RESOLVE_SUFFIXES = ("", ".ts", ".tsx", ".js", ".jsx", "/index.ts", "/index.tsx", "/index.js", "/index.jsx")
+
+
+@dataclass(frozen=True, slots=True)
+class ScanBudget():
+    seconds: float | None = None
+    maxFiles: int | None = None
+    flushInterval: float = 2.0
+
+
+class BudgetClock():
+    def __init__(self, budget:ScanBudget):
+        self.budget = budget
+        self.start = time.perf_counter()
+        self.lastFlush = self.start
+
+    def elapsed(self)->float:
+        return time.perf_counter() - self.start
+
+    def expired(self, share:float=1.0)->bool:
+        return self.budget.seconds is not None and self.elapsed() >= self.budget.seconds * share
+
+    def startScan(self)->None:
+        # Premier flush un intervalle après le début de l'analyse, pas du parcours
+        self.lastFlush = time.perf_counter()
+
+    def flushDue(self)->bool:
+        now = time.perf_counter()
+        if now - self.lastFlush < self.budget.flushInterval:
+            return False
+        self.lastFlush = now
+        return True
+
+
+@dataclass(slots=True)
+class Coverage():
+    found: int = 0
+    foundBytes: int = 0
+    scanned: int = 0
+    scannedBytes: int = 0
+    prioritized: int = 0
+    walkComplete: bool = True
+    reason: str = "complete"
+    elapsed: float = 0.0
+
+    def report(self)->str:
+        files = self.scanned / self.found * 100 if self.found else 100.0
+        size = self.scannedBytes / self.foundBytes * 100 if self.foundBytes else 100.0
+        reasons = {"complete": "analyse complète", "time": "budget de temps atteint", "files": "nombre maximal de fichiers atteint"}
+        walk = "" if self.walkComplete else ", parcours interrompu"
+        return (
+            f"⏱️ Couverture : {self.scanned}/{self.found} fichiers ({files:.1f} %), {size:.1f} % des octets, "
+            f"{reasons[self.reason]} en {self.elapsed:.1f} s{walk}"
+        )
+
+
+class FilePriority():
+    """Ordre d'analyse pour un scan partiel : les fichiers les plus importés
+    d'abord, puis les moins profonds, puis les plus petits.
+
+    Le nombre d'imports vient d'une pré-passe regex sur le début de chaque
+    fichier (imports relatifs seulement), interrompue à PRIORITY_SHARE du budget.
+    """
+
+    @classmethod
+    def resolveImport(cls, folder:str, specifier:str, known:set)->str|None:
+        base = os.path.normpath(os.path.join(folder, specifier))
+        # import "./a.js" depuis TypeScript désigne a.ts
+        stem, extension = os.path.splitext(base)
+        for candidate in [base + suffix for suffix in RESOLVE_SUFFIXES] + ([stem + ".ts", stem + ".tsx"] if extension == ".js" else []):
+            if candidate in known:
+                return candidate
+        return None
+
+    @classmethod
+    def fanIn(cls, files:List[Path], clock:BudgetClock)->Tuple[Dict[str, int], int]:
+        known = {str(path) for path in files}
+        counts: Dict[str, int] = {}
+        prioritized = 0
+        for path in files:
+            if clock.expired(PRIORITY_SHARE):
+                break
+            prioritized += 1
+            try:
+                with open(path, "rb") as file:
+                    head = file.read(IMPORT_HEAD_BYTES)
+            except OSError:
+                continue
+            folder = os.path.dirname(str(path))
+            for specifier in dict.fromkeys(RELATIVE_IMPORT.findall(head)):
+                target = cls.resolveImport(folder, specifier.decode("utf-8", "replace"), known)
+                if target:
+                    counts[target] = counts.get(target, 0) + 1
+        return counts, prioritized
+
+    @classmethod
+    def order(cls, files:List[Path], clock:BudgetClock, coverage:Coverage)->Tuple[List[Path], Dict[Path, int]]:
+        with profiling.stage("priority"):
+            counts, coverage.prioritized = cls.fanIn(files, clock)
+            sizes: Dict[Path, int] = {}
+            for path in files:
+                try:
+                    sizes[path] = os.stat(path).st_size
+                except OSError:
+                    sizes[path] = 0
+            coverage.found = len(files)
+            coverage.foundBytes = sum(sizes.values())
+            ordered = sorted(files, key=lambda path: (-counts.get(str(path), 0), len(path.parts), sizes[path]))
+        return ordered, sizes
@@ -0,0 +1,257 @@
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from uml_generator import source_files
+from uml_generator.renderers import formats, writerFor
+from uml_generator.subgraph import Focus
+from uml_generator.watcher import ProjectWatcher
+
+DEFAULT_MAX_PROJECTS = 8
+DEFAULT_MAX_MEMORY = 512 * 1024 * 1024
+# Threads de rendu gardés d'une requête à l'autre : requêtes et parsers tree-sitter
+# sont propres à chaque thread, un thread neuf par connexion les recompilerait
+DEFAULT_WORKERS = 4
+# Estimation de l'empreinte d'un projet chaud (objets Python, pas de mesure exacte)
+CLASS_BYTES = 2048
+IDENTIFIER_BYTES = 64
+# Arbres tree-sitter gardés pour le re-parse incrémental : ~10 fois le source
+TREE_BYTES_PER_SOURCE_BYTE = 10
+CLIENT_TIMEOUT = 600.0
+
+
+def defaultSocket()->Path:
+    # Un démon par utilisateur, partagé entre tous les dépôts
+    folder = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(folder) / f"uml_generator-{os.getuid() if hasattr(os, 'getuid') else 'user'}.sock"
+
+
+def daemonCacheName(root:Path)->str:
+    # Nom lisible, plus un hash du chemin : deux dépôts homonymes ne partagent pas leur cache
+    return f"{Path(root).name}-{hashlib.blake2b(str(root).encode('utf-8'), digest_size=6).hexdigest()}"
+
+
+def limitsKey(limits:source_files.SourceLimits)->list:
+    return [limits.maxBytes, limits.skipGenerated]
+
+
+class WarmProject():
+    """Projet d'un dépôt gardé en mémoire, revalidé par mtime à chaque requête."""
+
+    def __init__(self, key:Tuple, lock:threading.Lock):
+        self.key = key
+        self.lock = lock
+        self.watcher: ProjectWatcher | None = None
+        self.footprint = 0
+
+    def refresh(self, build:Callable[[], ProjectWatcher])->Tuple[int, bool]:
+        if self.watcher is None:
+            self.watcher = build()
+            changed, warm = len(self.watcher.results), False
+        else:
+            # Même détection que le mode watch : un stat par fichier, re-parse des modifiés
+            paths = self.watcher.poll()
+            if paths:
+                self.watcher.applyChanges(paths)
+            changed, warm = len(paths), True
+        self.footprint = self.estimate()
+        return changed, warm
+
+    def estimate(self)->int:
+        size = 0
+        for result in self.watcher.results.values():
+            for classe in result.classs:
+                size += CLASS_BYTES + IDENTIFIER_BYTES * len(classe.identifiers)
+        for code, _ in self.watcher.trees.values():
+            size += len(code) * TREE_BYTES_PER_SOURCE_BYTE
+        return size
+
+
+class WarmProjects():
+    """LRU des projets chauds, borné en nombre de dépôts et en mémoire estimée.
+
+    Le projet qui vient de servir n'est jamais évincé, même s'il dépasse
+    seul la limite mémoire.
+    """
+
+    def __init__(self, build:Callable[[Path, Dict], ProjectWatcher], maxProjects:int=DEFAULT_MAX_PROJECTS, maxBytes:int=DEFAULT_MAX_MEMORY):
+        self.build = build
+        self.maxProjects = max(1, maxProjects)
+        self.maxBytes = maxBytes
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Tuple, WarmProject]" = OrderedDict()
+        # Un verrou par dépôt, partagé par ses différentes clés : leurs scans écrivent dans le
+        # même cache. Jamais retiré, un projet évincé peut encore être en cours de scan
+        self.rootLocks: Dict[str, threading.Lock] = {}
+        self.evicted = 0
+
+    @classmethod
+    def keyFor(cls, root:Path, settings:Dict)->Tuple:
+        # Les options qui changent la liste des fichiers donnent un autre projet
+        return (
+            str(root),
+            tuple(settings.get("include", ())),
+            tuple(settings.get("exclude", ())),
+            settings.get("useIgnoreFiles", True),
+            settings.get("defaultExcludes", True),
+        )
+
+    def project(self, root:Path, settings:Dict):
+        key = self.keyFor(root, settings)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = WarmProject(key, self.rootLocks.setdefault(key[0], threading.Lock()))
+            self.entries.move_to_end(key)
+        # Verrou par dépôt : un premier scan long ne bloque pas les autres dépôts
+        with entry.lock:
+            changed, warm = entry.refresh(lambda: self.build(root, settings))
+            project = entry.watcher.project()
+        with self.lock:
+            self.evict(keep=key)
+        return project, changed, warm
+
+    def evict(self, keep:Tuple)->None:
+        while len(self.entries) > 1:
+            over = len(self.entries) > self.maxProjects or self.memory() > self.maxBytes
+            oldest = next(iter(self.entries))
+            if not over or oldest == keep:
+                return
+            del self.entries[oldest]
+            self.evicted += 1
+
+    def memory(self)->int:
+        return sum(entry.footprint for entry in self.entries.values())
+
+    def status(self)->List[Dict]:
+        with self.lock:
+            return [
+                {"root": key[0], "classes": sum(len(result.classs) for result in entry.watcher.results.values()) if entry.watcher else 0, "bytes": entry.footprint}
+                for key, entry in self.entries.items()
+            ]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self)->None:
+        line = self.rfile.readline()
+        try:
+            response = self.server.diagramDaemon.answer(json.loads(line))
+        except Exception as error:  # une requête invalide ne doit pas arrêter le démon
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        # Arrêt après la réponse : le client reçoit la confirmation avant la fermeture
+        if self.server.diagramDaemon.stopping:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DiagramDaemon():
+    """Démon local : une requête JSON par connexion, sur une socket Unix.
+
+    Requêtes : {"command": "render", "root": ..., "format": ..., "focus": [...],
+    "depth": ..., "direction": ..., "include": [...], "exclude": [...]},
+    {"command": "status"} et {"command": "stop"}. Chaque réponse est une
+    ligne JSON ; "diagram" contient le texte du diagramme. Les rendus passent
+    par un petit groupe de threads gardés vivants, dont les requêtes et parsers
+    tree-sitter restent compilés d'une connexion à l'autre.
+    """
+
+    def __init__(self, projects:WarmProjects, socketPath:Path, workers:int=DEFAULT_WORKERS):
+        self.projects = projects
+        self.socketPath = Path(socketPath)
+        self.server: _UnixServer | None = None
+        self.stopping = False
+        self.workers = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="uml-render")
+
+    def answer(self, request:Dict)->Dict:
+        command = request.get("command")
+        if command == "status":
+            return {"ok": True, "pid": os.getpid(), "projects": self.projects.status(), "evicted": self.projects.evicted}
+        if command == "stop":
+            self.stopping = True
+            return {"ok": True}
+        if command != "render":
+            return {"ok": False, "error": f"unknown command {command!r}"}
+        return self.workers.submit(self.render, request).result()
+
+    def render(self, request:Dict)->Dict:
+        start = time.perf_counter()
+        # Les limites de lecture sont réglées pour tout le processus au démarrage
+        if request.get("limits", limitsKey(source_files.limits())) != limitsKey(source_files.limits()):
+            return {"ok": False, "error": "--max-file-size/--keep-generated differ from the daemon settings"}
+        format = request.get("format", "mermaid")
+        if format not in formats():
+            return {"ok": False, "error": f"unknown format {format!r}"}
+        root = Path(request["root"])
+        if not root.is_dir():
+            return {"ok": False, "error": f"{root} is not a folder"}
+        project, changed, warm = self.projects.project(root, request)
+        total = len(project.classs)
+        if request.get("focus"):
+            focus = Focus(patterns=tuple(request["focus"]), depth=int(request.get("depth", 1)), direction=request.get("direction", "both"))
+            project = focus.apply(project)
+        sink = io.StringIO()
+        writer = writerFor(format, sink)
+        writer.writeProject(project)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🛰️ {root} : {writer.classCount} classes, {changed} fichier(s) {'modifié(s)' if warm else 'analysé(s)'} en {elapsed:.1f} ms")
+        return {"ok": True, "diagram": sink.getvalue(), "classes": writer.classCount, "total": total, "changed": changed, "warm": warm, "elapsed": elapsed}
+
+    def serve(self)->None:
+        if DaemonClient(self.socketPath).request({"command": "status"}, timeout=1.0) is not None:
+            raise RuntimeError(f"a daemon is already listening on {self.socketPath}")
+        # Socket laissée par un démon arrêté brutalement
+        if self.socketPath.exists():
+            self.socketPath.unlink()
+        self.server = _UnixServer(str(self.socketPath), _RequestHandler)
+        self.server.diagramDaemon = self
+        os.chmod(self.socketPath, 0o600)
+        print(f"🛰️ Démon à l'écoute sur {self.socketPath} (Ctrl+C pour arrêter)")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+            self.workers.shutdown(wait=False, cancel_futures=True)
+            if self.socketPath.exists():
+                self.socketPath.unlink()
+            print("arrêt du démon")
+
+
+class DaemonClient():
+    """Client léger : None si aucun démon n'écoute, pour retomber sur un scan local."""
+
+    def __init__(self, socketPath:Path):
+        self.socketPath = Path(socketPath)
+
+    def request(self, payload:Dict, timeout:float=CLIENT_TIMEOUT)->Dict|None:
+        if not hasattr(socket, "AF_UNIX") or not self.socketPath.exists():
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(timeout)
+                connection.connect(str(self.socketPath))
+                connection.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+                with connection.makefile("rb") as stream:
+                    line = stream.readline()
+        except OSError:
+            return None
+        try:
+            return json.loads(line) if line else None
+        except ValueError:
+            # Réponse tronquée ou autre programme sur la socket : scan local
+            return None
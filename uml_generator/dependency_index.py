@@ -0,0 +1,82 @@
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from uml_generator.entities import Class, Project
+
+
+class DependencyIndex():
+    """Index des symboles du projet : nom de classe et alias d'instanciation.
+
+    Chaque classe est résolue en parcourant une seule fois ses identifiants,
+    avec une recherche par dictionnaire par token : le coût est linéaire
+    dans le nombre total de tokens, et les liens entre fichiers apparaissent.
+    Les alias ("const s = new Service()") sont des noms locaux : ils ne sont
+    résolus que dans leur propre fichier. Les compteurs permettent de retirer
+    les classes d'un fichier modifié.
+    """
+
+    def __init__(self, classs:Iterable[Class]=()):
+        self.names: Dict[str, int] = {}
+        # Fichier -> alias -> classe instanciée -> nombre de déclarations
+        self.aliases: Dict[Path, Dict[str, Dict[str, int]]] = {}
+        self.addClasses(classs)
+
+    def addClasses(self, classs:Iterable[Class])->None:
+        for classe in classs:
+            if classe.name:
+                self.names[classe.name] = self.names.get(classe.name, 0) + 1
+            if not classe.instanciation_class:
+                continue
+            aliases = self.aliases.setdefault(classe.path, {})
+            for alias, real_class in classe.instanciation_class.items():
+                targets = aliases.setdefault(alias, {})
+                targets[real_class] = targets.get(real_class, 0) + 1
+
+    def removeClasses(self, classs:Iterable[Class])->None:
+        for classe in classs:
+            if classe.name in self.names:
+                self.names[classe.name] -= 1
+                if not self.names[classe.name]:
+                    del self.names[classe.name]
+            aliases = self.aliases.get(classe.path)
+            if aliases is None:
+                continue
+            for alias, real_class in classe.instanciation_class.items():
+                targets = aliases.get(alias)
+                if not targets or real_class not in targets:
+                    continue
+                targets[real_class] -= 1
+                if not targets[real_class]:
+                    del targets[real_class]
+                if not targets:
+                    del aliases[alias]
+            if not aliases:
+                del self.aliases[classe.path]
+
+    @classmethod
+    def definedSymbols(cls, classs:Iterable[Class])->set[str]:
+        symbols = set()
+        for classe in classs:
+            if classe.name:
+                symbols.add(classe.name)
+            symbols.update(classe.instanciation_class)
+        return symbols
+
+    def dependenciesOf(self, classe:Class)->List[str]:
+        dependencies = {}
+        aliases = self.aliases.get(classe.path, {})
+        for token in classe.identifiers:
+            if token in self.names and token != classe.name:
+                dependencies[token] = None
+            for real_class in aliases.get(token, ()):
+                if real_class != classe.name:
+                    dependencies[real_class] = None
+        return list(dependencies)
+
+    def resolveClasses(self, classs:Iterable[Class])->List[Class]:
+        return [classe.addDependencies(self.dependenciesOf(classe)) for classe in classs]
+
+    @classmethod
+    def resolve(cls, project:Project)->Project:
+        index = cls(project.classs)
+        return project.setClasses(index.resolveClasses(project.classs))
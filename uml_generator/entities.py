@@ -1,10 +1,17 @@
 from dataclasses import dataclass, field, replace
 from tree_sitter import Node
 from pathlib import Path
-from typing import Dict, Iterable, Any, List
+from typing import Dict, Iterable, Any, List, Tuple
 
 
-@dataclass
+def _text(code:bytes, node:Node|None)->str:
+    return code[node.start_byte:node.end_byte].decode("utf-8") if node else ""
+
+
+# Les entités sont figées : les helpers add*/register* renvoient une copie.
+# Pendant l'analyse d'un fichier, on passe par les *Builder ci-dessous qui
+# ajoutent en place, pour éviter de recopier les listes à chaque ajout.
+@dataclass(frozen=True, slots=True)
 class Method():
     name:str
     params:list[str] = field(default_factory=list)
@@ -16,9 +23,9 @@ class Method():
         return replace(self, retour=self.retour + [returnType])
     
     def addParam(self, param:str)->'Method':
-        return replace(self, self.params + [param])
+        return replace(self, params=self.params + [param])
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Instance():
     name:str
     type:type
@@ -30,19 +37,21 @@ class File():
     dependancie_name:str
     code:str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Class():
     class_type:str
     path:Path
     name:str
-    code: str
-    node: Node
+    code: bytes | None
+    node: Node | None
     method: Iterable["Method"] = field(default_factory=list)
     instance: Iterable["Instance"] = field(default_factory=list)
     children: Iterable["str"] = field(default_factory=list)
     params: Iterable["str"] = field(default_factory=list)
     retour: Iterable["str"] = field(default_factory=list) 
     instanciation_class: Dict[str,str] = field(default_factory=dict) # allow to find dependency
+    identifiers: List[str] = field(default_factory=list) # identifiants du corps, dans l'ordre d'apparition
+    span: Tuple[int,int] = (0, 0) # octets [début, fin) de la déclaration dans le fichier
 
     @classmethod
     def register(cls, node:Node,link:Path, code:str)->'Class': # type: ignore
@@ -58,18 +67,17 @@ class Class():
             node=node,
         )
 
-    def addMethod(self, name:Node, params: Node | None, retour: Node | None, method:Method|None)->'Class':
+    def addMethod(self, name:Node|None=None, params: Node | None=None, retour: Node | None=None, method:Method|None=None)->'Class':
         if not method : 
-            nameString = self.code[name.start_byte:name.end_byte].decode("utf-8")
-            paramsString = self.code[params.start_byte:params.end_byte].decode("utf-8")if params else ""
-            retourString = self.code[retour.start_byte:retour.end_byte].decode("utf-8")if retour else ""
-            method = Method(name=nameString, params=[paramsString], retour=[retourString])
+            method = Class.methodFromNodes(code=self.code, name=name, params=params, retour=retour)
         return replace(self,method=self.method + [method])
+
+    @classmethod
+    def methodFromNodes(cls, code:bytes, name:Node, params: Node | None, retour: Node | None)->Method:
+        return Method(name=_text(code, name), params=[_text(code, params)], retour=[_text(code, retour)])
     
     def addInstance(self,name:Node, type:Node)->'Class':
-        nameString = self.code[name.start_byte:name.end_byte].decode("utf-8")
-        typeString = self.code[type.start_byte:type.end_byte].decode("utf-8")
-        instance = Instance(name=nameString, type=typeString)
+        instance = Instance(name=_text(self.code, name), type=_text(self.code, type))
         return replace(self,instance=self.instance + [instance])
     
     def addDependencies(self, dependencies:List)->'Class':
@@ -78,11 +86,32 @@ class Class():
     def addInstanciation_class(self, instanciation_class:dict)->'Class':
         return replace(self,instanciation_class=instanciation_class)
     
+    def addIdentifiers(self, identifiers:List[str])->'Class':
+        return replace(self,identifiers=identifiers)
+
     def registerNode(self,node:Node)->'Class':
         return replace(self,node=node)
+
+    def detach(self)->'Class':
+        # Le Node retient tout l'arbre tree-sitter et code tout le fichier :
+        # on ne garde que la plage d'octets, la classe devient légère et picklable
+        span = (self.node.start_byte, self.node.end_byte) if self.node else self.span
+        return replace(self,node=None,code=None,span=span)
+
+    @property
+    def isDetached(self)->bool:
+        return self.node is None and self.code is None
     
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class FileResult():
+    path:Path
+    classs:List[Class] = field(default_factory=list)
+    skipped: str | None = None # "oversized" ou "generated" : fichier lu mais pas analysé
+    digest: str | None = None # hash des octets analysés, calculé quand le cache est actif
+    unchanged: bool = False # même contenu que l'entrée du cache : rien n'a été analysé
+
+@dataclass(frozen=True, slots=True)
 class Project():
     name: str
     classs : Iterable[Class]
@@ -90,3 +119,107 @@ class Project():
 
     def addClasses(self,classes:Iterable[Class])->'Project':
         return replace(self,classs=self.classs+classes)
+
+    def setClasses(self,classes:Iterable[Class])->'Project':
+        return replace(self,classs=classes)
+
+
+
+class MethodBuilder():
+    __slots__ = ("name", "params", "retour", "_seen")
+
+    def __init__(self, name:str):
+        self.name = name
+        self.params: List[str] = []
+        self.retour: List[str] = []
+        self._seen: set[str] = set()
+
+    def addReturn(self,returnType)->'MethodBuilder':
+        if returnType not in self._seen:
+            self._seen.add(returnType)
+            self.retour.append(returnType)
+        return self
+
+    def addParam(self, param:str)->'MethodBuilder':
+        self.params.append(param)
+        return self
+
+    def build(self)->Method:
+        return Method(name=self.name, params=self.params, retour=self.retour)
+
+
+class ClassBuilder():
+    """Version mutable de Class, même API add*, figée par build()."""
+    __slots__ = ("classe", "node", "method", "instance", "children", "instanciation_class", "identifiers")
+
+    def __init__(self, classe:Class):
+        self.classe = classe
+        self.node = classe.node
+        self.method: List[Method] = list(classe.method)
+        self.instance: List[Instance] = list(classe.instance)
+        self.children: List[str] = list(classe.children)
+        self.instanciation_class: Dict[str,str] = dict(classe.instanciation_class)
+        self.identifiers: List[str] = list(classe.identifiers)
+
+    @property
+    def name(self)->str:
+        return self.classe.name
+
+    @property
+    def code(self)->bytes:
+        return self.classe.code
+
+    def addMethod(self, name:Node|None=None, params: Node | None=None, retour: Node | None=None, method:Method|None=None)->'ClassBuilder':
+        if not method : 
+            method = Class.methodFromNodes(code=self.code, name=name, params=params, retour=retour)
+        self.method.append(method)
+        return self
+
+    def addInstance(self,name:Node, type:Node)->'ClassBuilder':
+        self.instance.append(Instance(name=_text(self.code, name), type=_text(self.code, type)))
+        return self
+
+    def addDependencies(self, dependencies:List)->'ClassBuilder':
+        self.children = dependencies
+        return self
+
+    def addInstanciation_class(self, instanciation_class:dict)->'ClassBuilder':
+        self.instanciation_class = instanciation_class
+        return self
+
+    def addIdentifiers(self, identifiers:List[str])->'ClassBuilder':
+        self.identifiers = identifiers
+        return self
+
+    def registerNode(self,node:Node)->'ClassBuilder':
+        # Comme Class.registerNode : une copie qui pointe sur un autre noeud
+        copy = ClassBuilder(self.build())
+        copy.node = node
+        return copy
+
+    def build(self)->Class:
+        return replace(
+            self.classe,
+            node=self.node,
+            method=self.method,
+            instance=self.instance,
+            children=self.children,
+            instanciation_class=self.instanciation_class,
+            identifiers=self.identifiers,
+        )
+
+
+class ProjectBuilder():
+    __slots__ = ("name", "path", "classs")
+
+    def __init__(self, name:str, path:Path, classs:Iterable[Class]=()):
+        self.name = name
+        self.path = path
+        self.classs: List[Class] = list(classs)
+
+    def addClasses(self,classes:Iterable[Class])->'ProjectBuilder':
+        self.classs.extend(classes)
+        return self
+
+    def build(self)->Project:
+        return Project(name=self.name, classs=self.classs, path=self.path)
@@ -1,40 +1,23 @@
-from entities import Class,Method,Project
+from uml_generator.entities import Class,ClassBuilder,Method,MethodBuilder,Project
 from typing import Iterable, Any, List, Callable, Optional
-import re
 from pathlib import Path
 from tree_sitter import Node
 from tree_sitter import Parser
 
+from uml_generator import profiling
+from uml_generator.queries import FileCaptures
+from uml_generator.source_files import openSource, parseSource
+
 class FileScanner():
     @classmethod
-    def findDependencies(cls,classe:Class, classes: List["Class"]) ->Class:
-        dependencies = []
-        code_str = classe.code.decode("utf-8")
-        for other in classes:
-            if classe.name == other.name:
-                continue
-            if re.search(rf'\b{other.name}\b', code_str):
-                dependencies.append(other.name)
-            for alias, real_class in other.instanciation_class.items():
-                if re.search(rf'\b{alias}\b', code_str):
-                    dependencies.append(real_class)
-        return classe.addDependencies(dependencies)
+    def extractIdentifiers(cls, node:Node, captures:FileCaptures)->List[str]:
+        # Les tokens du sous-arbre servent ensuite à DependencyIndex
+        return captures.identifiersIn(node)
     
     @classmethod
-    def extractInstanceClasseMap(cls,classe:Class, code: bytes) -> Class:
-        instance_map = {}
-        code_str = code.decode("utf-8")
-        instantiations = re.findall(r'const\s+(\w+)\s*=\s*new\s+(\w+)\s*\(', code_str)
-        temp_map = {var: class_name for var, class_name in instantiations}
-        return_blocks = re.findall(r'return\s*{\s*([\w\s,]+)\s*}', code_str)
-
-        for block in return_blocks:
-            props = [p.strip() for p in block.split(',') if p.strip()]
-            for prop in props:
-                if prop in temp_map:
-                    instance_map[prop] = temp_map[prop]
-
-        return classe.addInstanciation_class(instance_map)
+    def extractInstanceClasseMap(cls,classe:Class, captures:FileCaptures) -> Class:
+        # Calculée une fois par fichier, partagée par toutes ses classes
+        return classe.addInstanciation_class(dict(captures.instanciations))
     
     @classmethod
     def isRootParent(cls, node:Any)->bool:
@@ -59,6 +42,9 @@ class FileScanner():
         params = []
         if not params_node:
             return params
+        if params_node.type == "identifier":
+            # Arrow function en mode x => {...} : champ "parameter", sans parenthèses
+            return [code[params_node.start_byte:params_node.end_byte].decode("utf-8")]
 
         for child in params_node.children:
             if child.type == "required_parameter":
@@ -86,91 +72,32 @@ class FileScanner():
 
         return params
     @classmethod
-    def extract_return_keys(cls,body_node: Node, code: bytes, params:str) -> list[str]:
-        keys = []
-        cursor = body_node.walk()
-        reached_root = False
-
-        while not reached_root:
-            node = cursor.node
-
-            if node.type == "return_statement":
-                expr = node.child_by_field_name("argument")
-                if expr and expr.type == "object":
-                    for prop in expr.named_children:
-                        if prop.type == "pair":
-                            key_node = prop.child_by_field_name("key")
-                            if key_node:
-                                key = code[key_node.start_byte:key_node.end_byte].decode("utf-8")
-                                keys.append(key)
-                        elif prop.type == "identifier" or prop.type == "shorthand_property_identifier":
-                            key = code[prop.start_byte:prop.end_byte].decode("utf-8")
-                            keys.append(key)
-            if node.type == "call_expression":
-                func_node = node.child_by_field_name("function")
-                retour = code[func_node.start_byte:func_node.end_byte].decode("utf-8")
-                if retour in params:
-
-                    keys.append(retour)
-            if cursor.goto_first_child():
-                continue
-            if cursor.goto_next_sibling():
-                continue
-
-            while True:
-                if not cursor.goto_parent():
-                    reached_root = True
-                    break
-                if cursor.goto_next_sibling():
-                    break
-
-        return keys
+    def extract_return_keys(cls,body_node: Node, captures:FileCaptures, params:str) -> list[str]:
+        # Fonctions appelées dans le corps qui viennent des paramètres
+        return [retour for retour in captures.callees(body_node) if retour in params]
     @classmethod
-    def searchClass(cls, root: Any,link:Path,code:str) -> Iterable["Class"]:
+    def searchClass(cls, captures:FileCaptures,link:Path,code:str) -> Iterable["Class"]:
+        # Déclarations de premier niveau (directes ou exportées), dans l'ordre du fichier
         top_level_nodes = []
-        for child in root.children:
-            if not cls.isRootParent(child):
-                continue
-
-            if child.type == "function_declaration" or child.type == "class_declaration":
-                top_level_nodes.append(Class.register(node=child, link=link,code=code))
-
-            elif child.type == "lexical_declaration":
-                result = LexicalDeclaration.class_lexical_declaration(node=child,link=link,code=code)
+        for child in captures.declarations:
+            if child.type == "lexical_declaration":
+                result = LexicalDeclaration.class_lexical_declaration(node=child,link=link,code=code,captures=captures)
                 if isinstance(result, Class):
                     top_level_nodes.append(result)
-
-            elif child.type == "export_statement":
-                for sub in child.children:
-                    if sub.type in ("function_declaration", "class_declaration","abstract_class_declaration"):
-                        top_level_nodes.append(Class.register(node=sub, link=link,code=code))
-                    elif sub.type == "lexical_declaration":
-                        result = LexicalDeclaration.class_lexical_declaration(node=sub,link=link,code=code)
-                        if isinstance(result, Class):
-                            top_level_nodes.append(result)
-                    elif sub.type == "identifier":
-                        continue  
-
+            else:
+                top_level_nodes.append(Class.register(node=child, link=link,code=code))
         return top_level_nodes
     @classmethod 
-    def paramsAndReturnFinder(cls, node:Node, method:Method, classe:Class)->Class:
-        method=method
-        for child in node.children:
-            if child.type == "lexical_declaration":
-                continue
-            if child.type == "call_expression":
-                func_node = child.child_by_field_name("function")
-                retour = classe.code[func_node.start_byte:func_node.end_byte].decode("utf-8")
-                if retour != "console.log":
-                    method = method.addReturn(returnType=retour)
-            if child.type == "required_parameter":
-                params = classe.code[child.start_byte:child.end_byte].decode("utf-8")if child else ""
-                method = method.addParam(params)
-            else : 
-                method = cls.paramsAndReturnFinder(node=child, method=method, classe=classe)
+    def paramsAndReturnFinder(cls, node:Node, method:MethodBuilder, captures:FileCaptures)->MethodBuilder:
+        callees, params = captures.callsAndParameters(node)
+        for retour in callees:
+            if retour != "console.log":
+                method = method.addReturn(returnType=retour)
+        for param in params:
+            method = method.addParam(param)
         return method
     @classmethod
-    def searchMethod(cls, classe:Class)->Class:
+    def searchMethod(cls, classe:Class, captures:FileCaptures)->Class:
         classe = classe
         class_body = classe.node.child_by_field_name("body")
         if not class_body : 
@@ -193,15 +120,15 @@ class FileScanner():
                 else:
                     nameString = classe.code[name.start_byte:name.end_byte].decode("utf-8")
                     if nameString != 'constructor':
-                        method = Method(name=nameString)
-                        newMethode = cls.paramsAndReturnFinder(node=child, method=method, classe=classe)
-                        classe = classe.addMethod(method=newMethode)
+                        method = MethodBuilder(name=nameString)
+                        newMethode = cls.paramsAndReturnFinder(node=child, method=method, captures=captures)
+                        classe = classe.addMethod(method=newMethode.build())
             if child.type == "expression_statement":
                 call_expr = child.child_by_field_name("expression")
                 if call_expr and call_expr.type == "call_expression":
                     func = call_expr.child_by_field_name("function")
-                    args = child.child_by_field_name("arguments")
-                    if func:
+                    args = call_expr.child_by_field_name("arguments")
+                    if func and args:
                         if not any(c.type == "array" for c in args.children):
                             classe = classe.addMethod(name=func, params=args, retour=None)
                         else : 
@@ -211,13 +138,15 @@ class FileScanner():
                                     body = arg_node.child_by_field_name("body")
                                     if body:
                                         temp_classe = classe.registerNode(node=body)
-                                        newclasse = cls.searchMethod(temp_classe)
+                                        newclasse = cls.searchMethod(temp_classe, captures)
                                         for method in newclasse.method:
                                             classe = classe.addMethod(method=method) 
                                     break
             if child.type == "lexical_declaration":
                 # Appeler la méthode d'extraction de la méthode 
-                classe.addMethod(method=LexicalDeclaration.method_lexical_declaration(node=child))
+                method = LexicalDeclaration.method_lexical_declaration(node=child, classe=classe, captures=captures)
+                if method:
+                    classe = classe.addMethod(method=method)
         return classe
 
     @classmethod
@@ -242,24 +171,43 @@ class FileScanner():
                                 classe = classe.addInstance(name=name,type=type)
         return classe
         
+    @classmethod
+    def scanTree(cls, root:Node, link:Path, code:bytes)->List[Class]:
+        with profiling.stage("extract", link) as span:
+            with profiling.stage("query", link):
+                captures = FileCaptures.capture(root, link, code)
+            with profiling.stage("searchClass", link):
+                classs = cls.searchClass(captures=captures,link=link, code=code)
+            new_classs = []
+            for classe in classs:
+                # Builder mutable le temps du fichier, Class figée en sortie
+                builder = ClassBuilder(classe)
+                with profiling.stage("searchInstance", link):
+                    classeWithInstance = cls.searchInstance(builder)
+                with profiling.stage("searchMethod", link):
+                    classeWithMethod = cls.searchMethod(classeWithInstance, captures)
+                with profiling.stage("instanceMap", link):
+                    classeWithInstance = cls.extractInstanceClasseMap(classeWithMethod, captures)
+                with profiling.stage("identifiers", link):
+                    identifiers = cls.extractIdentifiers(node=classe.node, captures=captures)
+                new_classs.append(classeWithInstance.addIdentifiers(identifiers).build().detach())
+            span.annotate(classes=len(new_classs))
+        return new_classs
+
     @classmethod
     def fileScanner(cls, link:Path, project:Project, parser:Parser)->Project:
-        contenu = link.read_text(encoding="utf-8")
-        code_bytes = contenu.encode("utf-8")
-        tree = parser.parse(code_bytes)
-        root = tree.root_node
-        classs = cls.searchClass(root=root,link=link, code=code_bytes)
-        new_classs = []
-        for classe in classs:
-            classeWithInstance = cls.searchInstance(classe)
-            classeWithMethod = cls.searchMethod(classeWithInstance)
-            classeWithInstance = cls.extractInstanceClasseMap(classeWithMethod,classe.code)
-            new_classs.append(classeWithInstance)
-        final_list_classes = []
-        for classe in new_classs:
-            classWihtDependancies = cls.findDependencies(classe=classe,classes=new_classs)
-            final_list_classes.append(classWihtDependancies)
-        return project.addClasses(final_list_classes)
+        # Octets bruts (mmap pour un gros fichier), sans décodage/ré-encodage ;
+        # SkippedSource remonte pour un fichier trop gros ou généré
+        with openSource(link) as code_bytes:
+            return cls.scanSource(link=link, code=code_bytes, project=project, parser=parser)
+
+    @classmethod
+    def scanSource(cls, link:Path, code, project:Project, parser:Parser)->Project:
+        # Contenu déjà lu (fileScanner ou prefetch) : parse puis extraction
+        with profiling.stage("parse", link):
+            tree = parseSource(parser, code)
+        # Les dépendances sont résolues à l'échelle du projet (DependencyIndex)
+        return project.addClasses(cls.scanTree(root=tree.root_node, link=link, code=code))
 
 class Params():
     @classmethod
@@ -292,20 +240,20 @@ class Params():
     
 class LexicalDeclaration():
     @classmethod
-    def class_lexical_declaration(cls, node:Any,link:Path,code:str)->Class|None:
+    def class_lexical_declaration(cls, node:Any,link:Path,code:str,captures:FileCaptures)->Class|None:
         for declarator in node.children:
             if declarator.type == "variable_declarator":
                 name_node = declarator.child_by_field_name("name")
                 value = declarator.child_by_field_name("value")
                 if name_node and value and value.type in ("arrow_function", "function"):
                     func_name = code[name_node.start_byte:name_node.end_byte].decode("utf-8")
-                    params_node = value.child_by_field_name("parameters")
+                    params_node = value.child_by_field_name("parameters") or value.child_by_field_name("parameter")
                     body_node = value.child_by_field_name("body")
 
-                    params_str = code[params_node.start_byte:params_node.end_byte].decode("utf-8")
+                    params_str = code[params_node.start_byte:params_node.end_byte].decode("utf-8") if params_node else ""
                     params = FileScanner.extract_param_list(params_node,code)
                     
-                    return_fields = list(set(FileScanner.extract_return_keys(body_node, code, params_str))) if body_node else []
+                    return_fields = list(dict.fromkeys(FileScanner.extract_return_keys(body_node, captures, params_str))) if body_node else []
 
                     return Class(
                         class_type=value.type,
@@ -318,10 +266,10 @@ class LexicalDeclaration():
 
                     )
                 elif name_node: 
-                    return cls.checkStyleSheet(node=declarator,link=link,code=code)
+                    return FileScanner.checkStyleSheet(node=declarator,link=link,code=code)
         return
     @classmethod 
-    def method_lexical_declaration(cls, node:Node)->Method:
+    def method_lexical_declaration(cls, node:Node, classe:Class, captures:FileCaptures)->Method|None:
         for declarator in node.children:
             if declarator.type != "variable_declarator":
                 continue
@@ -332,13 +280,14 @@ class LexicalDeclaration():
                     continue
                 params = type.child_by_field_name("parameters")  # Créer une méthode qui extrait proprement ca au lieu de sortir (text: string)
                 retour = type.child_by_field_name("return_type") #Créer une méthode qui extrait proprement les retours au lieu de sortir : string
+                func_name = classe.code[name.start_byte:name.end_byte].decode("utf-8")
                 if retour: 
-                    method = Method(name=name, params=params, retour=retour)
-                else : 
-                    func_name = classe.code[name.start_byte:name.end_byte].decode("utf-8")
-                    method = Method(name=func_name)
-                    newMethode = cls.paramsAndReturnFinder(node=type, method=method, classe=classe)
-                    classe = classe.addMethod(method=newMethode)
+                    paramsString = classe.code[params.start_byte:params.end_byte].decode("utf-8") if params else ""
+                    retourString = classe.code[retour.start_byte:retour.end_byte].decode("utf-8")
+                    return Method(name=func_name, params=[paramsString], retour=[retourString])
+                method = MethodBuilder(name=func_name)
+                return FileScanner.paramsAndReturnFinder(node=type, method=method, captures=captures).build()
+        return None
     @classmethod
     def parse_lexical_declaration(cls, node: Node) -> Optional[Any]:
         for declarator in node.children:
@@ -0,0 +1,221 @@
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from uml_generator import profiling, source_files
+from uml_generator.dependency_index import DependencyIndex
+from uml_generator.entities import Class, FileResult, Project
+from uml_generator.file_scanner import FileScanner
+from uml_generator.mermaid import classLines
+from uml_generator.parsers import parserFor
+from uml_generator.walker import ProjectWalker
+
+# Déclarations qui peuvent définir un symbole : classe, fonction, alias d'instanciation
+DEFINITION_PREFIX = "(class|function|const|let|var)[[:space:]]+"
+DELTA_STYLES = (
+    "classDef added fill:#dafbe1,stroke:#1a7f37",
+    "classDef removed fill:#ffebe9,stroke:#cf222e",
+    "classDef modified fill:#fff8c5,stroke:#9a6700",
+)
+
+
+class GitError(Exception):
+    pass
+
+
+def _git(folder:Path, args:List[str], input:bytes|None=None, allowed:Tuple[int, ...]=(0,))->bytes:
+    try:
+        completed = subprocess.run(["git", "-C", str(folder), *args], input=input, capture_output=True)
+    except FileNotFoundError:
+        raise GitError("git is not installed")
+    if completed.returncode not in allowed:
+        raise GitError(completed.stderr.decode("utf-8", "replace").strip() or f"git {args[0]} failed")
+    return completed.stdout
+
+
+def _paths(folder:Path, output:bytes)->List[Path]:
+    return [folder / name for name in output.decode("utf-8", "surrogateescape").split("\0") if name]
+
+
+class GitChanges():
+    """Questions posées au dépôt git local, chemins relatifs au dossier analysé."""
+
+    @classmethod
+    def changedFiles(cls, folder:Path, rev:str)->List[Path]:
+        try:
+            _git(folder, ["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"])
+        except GitError as error:
+            raise GitError(f"unknown revision {rev!r} in {folder} ({error})")
+        # Copie de travail comparée à rev (ajouts, modifications, suppressions), plus les non suivis
+        changed = _git(folder, ["diff", "--name-only", "-z", "--no-renames", "--relative", rev, "--"])
+        untracked = _git(folder, ["ls-files", "-z", "--others", "--exclude-standard"])
+        return sorted(set(_paths(folder, changed)) | set(_paths(folder, untracked)))
+
+    @classmethod
+    def oldContents(cls, folder:Path, rev:str, paths:List[Path])->Dict[Path, bytes]:
+        # Un seul git cat-file pour toutes les versions d'origine
+        if not paths:
+            return {}
+        names = "".join(f"{rev}:./{path.relative_to(folder).as_posix()}\n" for path in paths)
+        output = _git(folder, ["cat-file", "--batch"], input=names.encode("utf-8"))
+        contents: Dict[Path, bytes] = {}
+        offset = 0
+        for path in paths:
+            end = output.index(b"\n", offset)
+            header = output[offset:end].split()
+            offset = end + 1
+            if len(header) == 3 and header[1] == b"blob":
+                size = int(header[2])
+                contents[path] = output[offset:offset + size]
+                offset += size + 1
+        return contents
+
+    @classmethod
+    def filesMentioning(cls, folder:Path, words:Iterable[str], definitions:bool=False)->List[Path]:
+        # Recherche en C sur tout l'arbre : seuls les fichiers trouvés seront analysés
+        prefix = DEFINITION_PREFIX if definitions else ""
+        patterns = "".join(f"{prefix}{word.replace('$', chr(92) + '$')}\n" for word in sorted(set(words)) if word)
+        if not patterns:
+            return []
+        output = _git(folder, ["grep", "-l", "-z", "--untracked", "-w", "-E", "-f", "-"], input=patterns.encode("utf-8"), allowed=(0, 1))
+        return _paths(folder, output)
+
+
+@dataclass(slots=True)
+class DeltaStats():
+    changedFiles: int = 0
+    contextFiles: int = 0
+    added: int = 0
+    removed: int = 0
+    modified: int = 0
+    addedEdges: int = 0
+    removedEdges: int = 0
+
+    def report(self, rev:str)->str:
+        return (
+            f"🔀 Delta depuis {rev} : {self.changedFiles} fichiers modifiés, {self.contextFiles} fichiers de contexte ; "
+            f"classes +{self.added} ~{self.modified} -{self.removed} ; liens +{self.addedEdges} -{self.removedEdges}"
+        )
+
+
+@dataclass(slots=True)
+class Delta():
+    added: List[Class] = field(default_factory=list)
+    removed: List[Class] = field(default_factory=list)
+    modified: List[Class] = field(default_factory=list)
+    addedEdges: List[Tuple[str, str]] = field(default_factory=list)
+    removedEdges: List[Tuple[str, str]] = field(default_factory=list)
+
+    @classmethod
+    def signature(cls, classe:Class)->tuple:
+        methods = tuple((method.name, tuple(method.params), tuple(method.retour)) for method in classe.method)
+        return (classe.class_type, tuple(classe.params), tuple(classe.retour), methods)
+
+    @classmethod
+    def edges(cls, classs:Iterable[Class])->Dict[Tuple[str, str], None]:
+        return {(classe.name, dependency): None for classe in classs for dependency in classe.children}
+
+    @classmethod
+    def compare(cls, before:List[Class], after:List[Class], changed:Set[Path])->'Delta':
+        # Une classe est identifiée par son fichier et son nom
+        old = {(classe.path, classe.name): classe for classe in before if classe.path in changed}
+        new = {(classe.path, classe.name): classe for classe in after if classe.path in changed}
+        delta = cls()
+        delta.added = [classe for key, classe in new.items() if key not in old]
+        delta.removed = [classe for key, classe in old.items() if key not in new]
+        delta.modified = [classe for key, classe in new.items() if key in old and cls.signature(old[key]) != cls.signature(classe)]
+        oldEdges, newEdges = cls.edges(before), cls.edges(after)
+        delta.addedEdges = [edge for edge in newEdges if edge not in oldEdges]
+        delta.removedEdges = [edge for edge in oldEdges if edge not in newEdges]
+        return delta
+
+    def stats(self, changedFiles:int, contextFiles:int)->DeltaStats:
+        return DeltaStats(
+            changedFiles=changedFiles,
+            contextFiles=contextFiles,
+            added=len(self.added),
+            removed=len(self.removed),
+            modified=len(self.modified),
+            addedEdges=len(self.addedEdges),
+            removedEdges=len(self.removedEdges),
+        )
+
+    def lines(self, name:str, rev:str)->Iterable[str]:
+        yield "classDiagram"
+        yield f'%% Delta du projet "{name}" depuis {rev}'
+        shown = set()
+        for classe in self.added + self.modified + self.removed:
+            if classe.name not in shown:
+                shown.add(classe.name)
+                yield from classLines(classe)
+        # Extrémités inchangées des liens modifiés : nom seul, pour le contexte
+        for source, target in self.addedEdges + self.removedEdges:
+            for endpoint in (source, target):
+                if endpoint not in shown:
+                    shown.add(endpoint)
+                    yield f"class {endpoint}"
+        for source, target in self.addedEdges:
+            yield f"{source} --> {target} : ajouté"
+        for source, target in self.removedEdges:
+            yield f"{source} ..> {target} : supprimé"
+        yield from DELTA_STYLES
+        for style, classs in (("added", self.added), ("modified", self.modified), ("removed", self.removed)):
+            if classs:
+                yield f'cssClass "{",".join(dict.fromkeys(classe.name for classe in classs))}" {style}'
+
+
+class DeltaScanner():
+    """Diagramme des changements depuis une révision git, sans parcourir tout le projet.
+
+    Ne sont analysés que les fichiers modifiés (version d'origine via git et
+    copie de travail), puis les fichiers de contexte trouvés par git grep :
+    ceux qui définissent un symbole cité par une classe modifiée, et ceux qui
+    citent un symbole défini dans un fichier modifié. Les liens sont résolus
+    sur cet ensemble, avant et après, puis comparés.
+    """
+
+    def __init__(self, folder:Path, rev:str, walker:ProjectWalker, scan:Callable[[List[Path]], Iterable[FileResult]]):
+        self.folder = Path(folder)
+        self.rev = rev
+        self.walker = walker
+        self.scan = scan
+        self.stats = DeltaStats()
+
+    def scanOld(self, paths:List[Path])->List[Class]:
+        limits = source_files.limits()
+        classs: List[Class] = []
+        for path, code in GitChanges.oldContents(self.folder, self.rev, paths).items():
+            # Mêmes limites que la copie de travail (taille, fichiers générés)
+            if limits.maxBytes is not None and len(code) > limits.maxBytes:
+                continue
+            if limits.skipGenerated and source_files.looksGenerated(code):
+                continue
+            empty = Project(name='', classs=[], path=path)
+            with profiling.stage("parse", path):
+                classs += FileScanner.scanSource(link=path, code=code, project=empty, parser=parserFor(path.name)).classs
+        return classs
+
+    def scanCurrent(self, paths:List[Path])->List[Class]:
+        return [classe for result in self.scan(paths) for classe in result.classs]
+
+    def run(self)->Delta:
+        with profiling.stage("git"):
+            changed = [path for path in GitChanges.changedFiles(self.folder, self.rev) if self.walker.accepts(path)]
+        before = self.scanOld(changed)
+        after = self.scanCurrent([path for path in changed if path.exists()])
+        touched = before + after
+        with profiling.stage("git"):
+            tokens = {token for classe in touched for token in classe.identifiers}
+            context = set(GitChanges.filesMentioning(self.folder, tokens, definitions=True))
+            context |= set(GitChanges.filesMentioning(self.folder, DependencyIndex.definedSymbols(touched)))
+        changedSet = set(changed)
+        contextFiles = sorted(path for path in context if path not in changedSet and self.walker.accepts(path))
+        # Fichiers de contexte inchangés : même contenu avant et après
+        unchanged = self.scanCurrent(contextFiles)
+        with profiling.stage("resolve"):
+            before = DependencyIndex(before + unchanged).resolveClasses(before + unchanged)
+            after = DependencyIndex(after + unchanged).resolveClasses(after + unchanged)
+        delta = Delta.compare(before, after, changedSet)
+        self.stats = delta.stats(changedFiles=len(changed), contextFiles=len(contextFiles))
+        return delta
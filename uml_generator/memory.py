@@ -0,0 +1,35 @@
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows : pas de getrusage
+    resource = None
+
+
+def peakRss(children:bool=False)->int|None:
+    """Pic de mémoire résidente en octets, du processus ou de ses workers."""
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en kilo-octets ailleurs
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def formatBytes(size:int|None)->str:
+    if size is None:
+        return "n/a"
+    value = float(size)
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if value < 1024 or unit == "Go":
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} Go"
+
+
+def memoryReport()->str:
+    report = f"🧠 Pic RSS : {formatBytes(peakRss())}"
+    workers = peakRss(children=True)
+    if workers:
+        report += f" (workers : {formatBytes(workers)})"
+    return report
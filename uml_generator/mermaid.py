@@ -0,0 +1,154 @@
+import os
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, TextIO, Tuple
+
+from uml_generator.entities import Class, Project
+
+BUFFER_SIZE = 1 << 16
+
+
+def classLines(classe:Class)->Iterator[str]:
+    # Déclaration de la classe/fonction
+    yield f"class {classe.name} {{"
+    yield f"  «{classe.class_type}»"
+
+    # Ajout des paramètres
+    for param in classe.params:
+        yield f"  +{param}"
+
+    # Ajout des méthodes
+    for method in classe.method:
+        params = ", ".join(method.params) if isinstance(method.params, list) else ""
+        retour = f": {method.retour}" if method.retour else ""
+        yield f"  +{method.name}({params}){retour}"
+
+    yield "}"
+
+
+def edgeLines(classe:Class)->Iterator[str]:
+    for dependency in classe.children:
+        yield f"{classe.name} --> {dependency}"
+
+
+class MermaidWriter():
+    """Écrit le diagramme au fil de l'eau dans un flux texte.
+
+    Les blocs de classes peuvent être émis dès qu'un fichier est analysé,
+    les liens une fois les dépendances résolues. Le résultat est identique
+    à un "\\n".join de toutes les lignes (pas de saut de ligne final).
+    """
+
+    def __init__(self, sink:TextIO):
+        self.sink = sink
+        self.classCount = 0
+        self._started = False
+
+    def _write(self, lines:Iterable[str])->None:
+        for line in lines:
+            if self._started:
+                self.sink.write("\n")
+            self.sink.write(line)
+            self._started = True
+
+    def writeHeader(self, name:str)->None:
+        self._write(["classDiagram", f'%% Diagramme UML du projet "{name}"'])
+
+    def writeClasses(self, classs:Iterable[Class])->None:
+        for classe in classs:
+            self.classCount += 1
+            self._write(classLines(classe))
+
+    def writeEdges(self, classs:Iterable[Class])->None:
+        # Lien de dépendances
+        for classe in classs:
+            self._write(edgeLines(classe))
+
+    def writeProject(self, project:Project)->None:
+        self.writeHeader(project.name)
+        self.writeClasses(project.classs)
+        self.writeEdges(project.classs)
+
+
+class MermaidFragments():
+    """Texte Mermaid mémorisé par classe, pour les rendus successifs du mode watch.
+
+    Class est figée et une classe que le watcher n'a pas remplacée est le même
+    objet d'un rendu à l'autre : son bloc et ses liens sont repris tels quels, seules les classes
+    ré-analysées ou re-résolues sont reformatées. Le texte est identique à celui
+    de MermaidWriter.
+    """
+
+    def __init__(self):
+        self._fragments: Dict[int, Tuple[Class, str, str]] = {}
+
+    def writeProject(self, project:Project, sink:TextIO)->None:
+        fragments: Dict[int, Tuple[Class, str, str]] = {}
+        blocks = ["classDiagram", f'%% Diagramme UML du projet "{project.name}"']
+        edges = []
+        for classe in project.classs:
+            fragment = self._fragments.get(id(classe))
+            # La classe est gardée dans le fragment : son id ne peut pas être réutilisé
+            if fragment is None or fragment[0] is not classe:
+                fragment = (classe, "\n".join(classLines(classe)), "\n".join(edgeLines(classe)))
+            fragments[id(classe)] = fragment
+            blocks.append(fragment[1])
+            if fragment[2]:
+                edges.append(fragment[2])
+        self._fragments = fragments
+        sink.write("\n".join(blocks + edges))
+
+
+class _ChunkSink():
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text:str)->None:
+        self.chunks.append(text)
+
+
+def iterMermaid(project:Project)->Iterator[str]:
+    """Générateur de morceaux de texte, classe par classe puis lien par lien."""
+    sink = _ChunkSink()
+    writer = MermaidWriter(sink)
+    writer.writeHeader(project.name)
+    yield "".join(sink.chunks)
+    for classe in project.classs:
+        sink.chunks = []
+        writer.writeClasses([classe])
+        yield "".join(sink.chunks)
+    for classe in project.classs:
+        sink.chunks = []
+        writer.writeEdges([classe])
+        if sink.chunks:
+            yield "".join(sink.chunks)
+
+
+@contextmanager
+def openOutput(output:Path)->Iterator[TextIO]:
+    # Écriture dans un fichier temporaire puis renommage en sortie de bloc : un
+    # lecteur (éditeur, mode watch) ne voit jamais un diagramme à moitié écrit,
+    # et une erreur en cours d'écriture laisse l'ancien fichier intact
+    output = Path(output)
+    if output.exists() and not output.is_file():
+        # /dev/stdout, tube nommé : rien à renommer
+        with open(output, "w", encoding="utf-8", buffering=BUFFER_SIZE) as sink:
+            yield sink
+        return
+    temporary = output.with_name(f".{output.name}.tmp")
+    try:
+        with open(temporary, "w", encoding="utf-8", buffering=BUFFER_SIZE) as sink:
+            yield sink
+        os.replace(temporary, output)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temporary)
+        raise
+
+
+def writeMermaidFile(project:Project, output:Path, fragments:MermaidFragments|None=None)->None:
+    with openOutput(output) as sink:
+        if fragments:
+            fragments.writeProject(project, sink)
+        else:
+            MermaidWriter(sink).writeProject(project)
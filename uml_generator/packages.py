@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Dict, Iterable, TextIO, Tuple
+
+from uml_generator.entities import Project
+from uml_generator.shards import shardKey
+
+
+class PackageWriter():
+    """Vue d'architecture : une boîte par dossier (jusqu'à depth niveaux).
+
+    Les liens entre classes deviennent un seul lien par couple de dossiers,
+    annoté du nombre de liens d'origine ; ceux de poids inférieur à minWeight
+    sont écartés. Même API que les autres writers (writeProject, classCount).
+    """
+
+    def __init__(self, sink:TextIO, depth:int=1, minWeight:int=1):
+        self.sink = sink
+        self.depth = depth
+        self.minWeight = minWeight
+        self.classCount = 0
+        self.packageCount = 0
+        self.edgeCount = 0
+        self.dropped = 0
+
+    def aggregate(self, project:Project)->Tuple[Dict[str, int], Dict[Tuple[str, str], int]]:
+        # Une seule passe sur les classes : le dossier d'un nom n'étant connu qu'à la fin,
+        # les liens y sont comptés par (dossier, nom), puis rattachés aux dossiers du nom
+        root = Path(project.path)
+        keys: Dict[Path, str] = {}
+        sizes: Dict[str, int] = {}
+        homes: Dict[str, set] = {}
+        references: Dict[Tuple[str, str], int] = {}
+        for classe in project.classs:
+            key = keys.get(classe.path)
+            if key is None:
+                key = keys[classe.path] = shardKey(classe.path, root, self.depth)
+            sizes[key] = sizes.get(key, 0) + 1
+            homes.setdefault(classe.name, set()).add(key)
+            for dependency in classe.children:
+                references[(key, dependency)] = references.get((key, dependency), 0) + 1
+        weights: Dict[Tuple[str, str], int] = {}
+        for (source, dependency), count in references.items():
+            for target in homes.get(dependency, ()):
+                if target != source:
+                    weights[(source, target)] = weights.get((source, target), 0) + count
+        return dict(sorted(sizes.items())), dict(sorted(weights.items()))
+
+    def lines(self, project:Project)->Iterable[str]:
+        sizes, weights = self.aggregate(project)
+        identifiers = {package: f"p{position}" for position, package in enumerate(sizes)}
+        yield "flowchart LR"
+        yield f'%% Vue par dossiers du projet "{project.name}" (profondeur {self.depth})'
+        for package, size in sizes.items():
+            yield f'{identifiers[package]}["{package}<br/>{size} classes"]'
+        for (source, target), weight in weights.items():
+            if weight < self.minWeight:
+                self.dropped += 1
+                continue
+            self.edgeCount += 1
+            yield f"{identifiers[source]} -->|{weight}| {identifiers[target]}"
+        self.classCount += sum(sizes.values())
+        self.packageCount += len(sizes)
+
+    def writeProject(self, project:Project)->None:
+        self.sink.write("\n".join(self.lines(project)))
+
+    def report(self)->str:
+        dropped = f" ({self.dropped} sous le seuil de {self.minWeight})" if self.dropped else ""
+        return f"📦 Vue par dossiers : {self.packageCount} dossiers, {self.edgeCount} liens{dropped}"
@@ -0,0 +1,120 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+from tree_sitter import Parser
+
+from uml_generator import profiling, source_files
+from uml_generator.entities import FileResult, Project
+from uml_generator.file_scanner import FileScanner
+from uml_generator.parsers import parserFor
+from uml_generator.prefetch import DEFAULT_DEPTH, DEFAULT_READERS, Prefetcher
+from uml_generator.profiling import ProfileEvent
+from uml_generator.scan_cache import contentDigest
+from uml_generator.source_files import SkippedSource, SourceLimits, closeSource, openSource
+
+
+def _initWorker(profile:bool=False, limits:SourceLimits|None=None)->None:
+    if profile:
+        profiling.enable()
+    else:
+        profiling.disable()
+    if limits:
+        source_files.configure(limits)
+
+
+def _scanFileInWorker(link:Path, hashed:bool=False, known:str|None=None)->Tuple[FileResult, List[ProfileEvent] | None]:
+    # Chaque worker a son propre registre : un parser par langage, grammaire chargée à la demande
+    result = ParallelScanner.scanFile(link=link, parser=parserFor(link.name), hashed=hashed, known=known)
+    # Les mesures du worker repartent avec le résultat vers le processus principal
+    profiler = profiling.current()
+    return result, profiler.drain() if profiler else None
+
+
+def _scanBatchInWorker(batch:List[Tuple[Path, str | None]], hashed:bool)->List[Tuple[FileResult, List[ProfileEvent] | None]]:
+    return [_scanFileInWorker(link, hashed, known) for link, known in batch]
+
+
+class ParallelScanner():
+    """Analyse des fichiers en série, avec lecture anticipée, ou en processus.
+
+    Avec hashed (cache actif), le hash du contenu est calculé sur les octets
+    lus pour l'analyse : le fichier n'est lu qu'une fois. known est le hash
+    en cache d'un fichier dont le mtime a changé ; à contenu identique, le
+    parse est évité et le résultat marqué unchanged.
+    """
+
+    @classmethod
+    def scanSource(cls, link:Path, code, parser:Parser, hashed:bool=False, known:str|None=None)->FileResult:
+        digest = None
+        if hashed:
+            with profiling.stage("digest", link):
+                digest = contentDigest(code)
+            if digest == known:
+                return FileResult(path=link, digest=digest, unchanged=True)
+        empty = Project(name='', classs=[], path=link)
+        scanned = FileScanner.scanSource(link=link, code=code, project=empty, parser=parser)
+        return FileResult(path=link, classs=list(scanned.classs), digest=digest)
+
+    @classmethod
+    def scanFile(cls, link:Path, parser:Parser, hashed:bool=False, known:str|None=None)->FileResult:
+        # Octets bruts (mmap pour un gros fichier), sans décodage/ré-encodage
+        try:
+            with openSource(link) as code:
+                return cls.scanSource(link=link, code=code, parser=parser, hashed=hashed, known=known)
+        except SkippedSource as skipped:
+            return FileResult(path=link, skipped=skipped.reason)
+
+    @classmethod
+    def scanPrefetched(cls, files:Iterable[Path], readers:int=DEFAULT_READERS, depth:int=DEFAULT_DEPTH, known:Callable[[Path], str | None]|None=None)->Iterable[FileResult]:
+        # Un seul processus : la lecture des fichiers suivants recouvre le parse du courant
+        for link, source in Prefetcher(readers=readers, depth=depth).iterate(files):
+            try:
+                code = source.result()
+            except SkippedSource as skipped:
+                yield FileResult(path=link, skipped=skipped.reason)
+                continue
+            try:
+                result = cls.scanSource(link=link, code=code, parser=parserFor(link.name), hashed=known is not None, known=known(link) if known else None)
+            finally:
+                closeSource(code)
+            yield result
+
+    @classmethod
+    def chunkSize(cls, files:List[Path], jobs:int)->int:
+        # Des lots assez gros pour amortir le pickling, assez petits pour équilibrer
+        return max(1, min(64, len(files) // (jobs * 8)))
+
+    @classmethod
+    def scanFiles(cls, files:Iterable[Path], jobs:int, chunk:int|None=None, known:Callable[[Path], str | None]|None=None)->Iterable[FileResult]:
+        if chunk is None:
+            files = list(files)
+            chunk = cls.chunkSize(files, jobs)
+        files = iter(files)
+        profiler = profiling.current()
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_initWorker, initargs=(profiler is not None, source_files.limits())) as pool:
+            # Lots soumis au fur et à mesure : la liste des fichiers n'est consommée
+            # que quelques lots en avance, et les résultats rendus dans l'ordre
+            pending: deque[Future] = deque()
+
+            def submit()->bool:
+                batch = [(link, known(link) if known else None) for link in islice(files, chunk)]
+                if batch:
+                    pending.append(pool.submit(_scanBatchInWorker, batch, known is not None))
+                return bool(batch)
+
+            try:
+                for _ in range(jobs * 2):
+                    if not submit():
+                        break
+                while pending:
+                    batch = pending.popleft().result()
+                    submit()
+                    for result, events in batch:
+                        if profiler and events:
+                            profiler.extend(events)
+                        yield result
+            finally:
+                # Arrêt anticipé (budget de temps) : les lots pas encore lancés sont annulés
+                pool.shutdown(wait=False, cancel_futures=True)
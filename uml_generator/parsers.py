@@ -0,0 +1,74 @@
+import importlib
+import threading
+from typing import Dict
+from tree_sitter import Language, Parser
+
+# Grammaire -> (module Python, fonction qui renvoie le pointeur de langage)
+GRAMMARS = {
+    "javascript": ("tree_sitter_javascript", "language"),
+    "typescript": ("tree_sitter_typescript", "language_typescript"),
+    "tsx": ("tree_sitter_typescript", "language_tsx"),
+}
+
+# Seule table extension -> grammaire du projet
+EXTENSIONS = {
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".mts": "typescript",
+    ".cts": "typescript",
+    ".tsx": "tsx",
+}
+
+
+def grammarFor(fileName:str)->str|None:
+    # Même règle que PurePath(fileName).suffix, sans objet Path par entrée du parcours
+    name = fileName.rpartition("/")[2]
+    dot = name.rfind(".")
+    return EXTENSIONS.get(name[dot:]) if 0 < dot < len(name) - 1 else None
+
+
+def isSupported(fileName:str)->bool:
+    # Ne charge aucune grammaire : sert au filtrage pendant le parcours
+    return grammarFor(fileName) is not None
+
+
+class ParserRegistry():
+    """Charge une grammaire au premier fichier qui en a besoin, puis réutilise
+    un seul Parser par langage et par thread (un registre par processus/worker)."""
+
+    def __init__(self):
+        self._languages: Dict[str, Language] = {}
+        # Un Parser n'est pas partageable entre threads ; les Language le sont
+        self._local = threading.local()
+
+    def language(self, grammar:str)->Language:
+        language = self._languages.get(grammar)
+        if language is None:
+            moduleName, function = GRAMMARS[grammar]
+            module = importlib.import_module(moduleName)
+            language = Language(getattr(module, function)())
+            self._languages[grammar] = language
+        return language
+
+    def parserFor(self, fileName:str)->Parser|None:
+        grammar = grammarFor(fileName)
+        if grammar is None:
+            return None
+        parsers: Dict[str, Parser] | None = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(grammar)
+        if parser is None:
+            parser = Parser(self.language(grammar))
+            parsers[grammar] = parser
+        return parser
+
+
+registry = ParserRegistry()
+
+
+def parserFor(fileName:str)->Parser|None:
+    return registry.parserFor(fileName)
@@ -0,0 +1,51 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Deque, Iterable, Iterator, Tuple
+
+from uml_generator import profiling
+from uml_generator.source_files import closeSource, loadSource
+
+DEFAULT_READERS = 2
+DEFAULT_DEPTH = 16
+
+
+class Prefetcher():
+    """Lecture anticipée : des threads chargent les fichiers suivants pendant
+    que l'appelant analyse le fichier courant.
+
+    Au plus depth lectures sont en cours ou en attente : un fichier n'est
+    demandé qu'une fois un autre consommé (contre-pression), la mémoire reste
+    bornée à depth fichiers. Les résultats sortent dans l'ordre des fichiers.
+    """
+
+    def __init__(self, readers:int=DEFAULT_READERS, depth:int=DEFAULT_DEPTH, load:Callable[[Path], object]=loadSource):
+        self.readers = max(1, readers)
+        self.depth = max(1, depth)
+        self.load = load
+
+    def iterate(self, files:Iterable[Path])->Iterator[Tuple[Path, Future]]:
+        files = iter(files)
+        pending: Deque[Tuple[Path, Future]] = deque()
+        pool = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix="uml-reader")
+        try:
+            for path in islice(files, self.depth):
+                pending.append((path, pool.submit(self.load, path)))
+            while pending:
+                path, future = pending.popleft()
+                # Temps passé à attendre le disque : proche de zéro si la lecture suit
+                with profiling.stage("prefetchWait", path):
+                    future.exception()
+                for following in islice(files, 1):
+                    pending.append((following, pool.submit(self.load, following)))
+                yield path, future
+        finally:
+            # Arrêt anticipé : on libère ce qui a déjà été lu
+            for _, future in pending:
+                if not future.cancel() and not future.exception():
+                    closeSource(future.result())
+            # Sans join : un itérateur abandonné est fermé par le ramasse-miettes, parfois
+            # dans un thread qui démarre, où attendre la fin des lecteurs bloquerait.
+            # Toutes les lectures sont terminées ou annulées, les lecteurs s'arrêtent seuls
+            pool.shutdown(wait=False)
@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+# Instrumentation optionnelle : tant qu'aucun Profiler n'est activé, stage()
+# renvoie un contexte vide partagé et le pipeline ne mesure rien.
+
+
+@dataclass(slots=True)
+class ProfileEvent():
+    name: str
+    start: float
+    duration: float
+    pid: int
+    tid: int = 0
+    path: str | None = None
+    bytes: int = 0
+    classes: int = 0
+
+
+class _NullSpan():
+    __slots__ = ()
+
+    def annotate(self, **values)->None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_NULL = nullcontext(_NULL_SPAN)
+
+
+class Span():
+    __slots__ = ("profiler", "name", "path", "start", "values")
+
+    def __init__(self, profiler:'Profiler', name:str, path:str|Path|None):
+        self.profiler = profiler
+        self.name = name
+        self.path = path
+        self.values: Dict[str, int] = {}
+
+    def annotate(self, **values)->None:
+        self.values.update(values)
+
+    def __enter__(self)->'Span':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc)->None:
+        duration = time.perf_counter() - self.start
+        self.profiler.record(ProfileEvent(
+            name=self.name,
+            start=self.start,
+            duration=duration,
+            pid=os.getpid(),
+            tid=threading.get_ident(),
+            path=str(self.path) if self.path is not None else None,
+            bytes=self.values.get("bytes", 0),
+            classes=self.values.get("classes", 0),
+        ))
+
+
+class Profiler():
+    """Collecte les durées par étape et par fichier, et notifie les hooks."""
+
+    def __init__(self):
+        self.events: List[ProfileEvent] = []
+        self.hooks: List[Callable[[ProfileEvent], None]] = []
+        self.origin = time.perf_counter()
+
+    def addHook(self, hook:Callable[[ProfileEvent], None])->None:
+        self.hooks.append(hook)
+
+    def span(self, name:str, path:str|Path|None=None)->Span:
+        return Span(self, name, path)
+
+    def record(self, event:ProfileEvent)->None:
+        self.events.append(event)
+        for hook in self.hooks:
+            hook(event)
+
+    def extend(self, events:Iterable[ProfileEvent])->None:
+        for event in events:
+            self.record(event)
+
+    def drain(self)->List[ProfileEvent]:
+        events, self.events = self.events, []
+        return events
+
+    def stageTotals(self)->Dict[str, Dict[str, float]]:
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            total = totals.setdefault(event.name, {"count": 0, "seconds": 0.0, "bytes": 0, "classes": 0})
+            total["count"] += 1
+            total["seconds"] += event.duration
+            total["bytes"] += event.bytes
+            total["classes"] += event.classes
+        return totals
+
+    def slowestFiles(self, top:int=10)->List[tuple]:
+        perFile: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            if event.path is None or event.name not in ("read", "parse", "extract"):
+                continue
+            timings = perFile.setdefault(event.path, {"read": 0.0, "parse": 0.0, "extract": 0.0})
+            timings[event.name] += event.duration
+        ranked = sorted(perFile.items(), key=lambda item: item[1]["parse"] + item[1]["extract"], reverse=True)
+        return ranked[:top]
+
+    def summary(self, top:int=10)->List[str]:
+        lines = ["📊 Profil par étape :"]
+        for name, total in sorted(self.stageTotals().items(), key=lambda item: item[1]["seconds"], reverse=True):
+            details = ""
+            if total["bytes"]:
+                details += f", {total['bytes'] / (1024 * 1024):.2f} Mo"
+            if total["classes"]:
+                details += f", {int(total['classes'])} classes"
+            lines.append(f"  {name:<16} {total['seconds'] * 1000:10.1f} ms ({int(total['count'])} appels{details})")
+        slowest = self.slowestFiles(top)
+        if slowest:
+            lines.append(f"🐢 {len(slowest)} fichiers les plus lents (parse + extraction) :")
+            for path, timings in slowest:
+                lines.append(f"  {timings['parse'] * 1000:8.1f} ms parse, {timings['extract'] * 1000:8.1f} ms extraction  {path}")
+        return lines
+
+    def writeChromeTrace(self, output:Path)->None:
+        # Format "Trace Event" lisible par chrome://tracing ou Perfetto
+        events = [
+            {
+                "name": event.name,
+                "cat": "uml",
+                "ph": "X",
+                "ts": (event.start - self.origin) * 1_000_000,
+                "dur": event.duration * 1_000_000,
+                "pid": event.pid,
+                "tid": event.tid,
+                "args": {key: value for key, value in (("path", event.path), ("bytes", event.bytes), ("classes", event.classes)) if value},
+            }
+            for event in self.events
+        ]
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+_active: Profiler | None = None
+
+
+def current()->Profiler | None:
+    return _active
+
+
+def enable(profiler:Profiler | None = None)->Profiler:
+    global _active
+    _active = profiler or Profiler()
+    return _active
+
+
+def disable()->None:
+    global _active
+    _active = None
+
+
+def stage(name:str, path:str | Path | None = None):
+    if _active is None:
+        return _NULL
+    return _active.span(name, path)
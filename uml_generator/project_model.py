@@ -0,0 +1,129 @@
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List
+
+from uml_generator.entities import Class, Instance, Method, Project
+
+# A incrémenter dès que la forme des données enregistrées change
+MODEL_VERSION = 1
+MODEL_FORMAT = "uml-project"
+# En-tête du format binaire, suivi d'un pickle des mêmes données que le JSON
+BINARY_MAGIC = b"UMLPROJ\n"
+
+
+class ModelError(ValueError):
+    pass
+
+
+class _DataUnpickler(pickle.Unpickler):
+    # Le modèle n'est fait que de dict, list, str, int et None : aucune classe
+    # à importer, donc aucun appel possible depuis un fichier forgé
+    def find_class(self, module:str, name:str):
+        raise ModelError(f"unexpected object {module}.{name} in project model")
+
+
+class ProjectModel():
+    """Projet extrait, sans tree-sitter : classes, méthodes, instances, liens, chemins.
+
+    Deux formats, mêmes données : JSON (lisible, diffable) quand le fichier
+    finit par .json, binaire (pickle derrière un en-tête) sinon, plus rapide
+    à relire. Les chemins sont enregistrés relatifs au dossier du projet.
+    Le binaire est relu sans importer aucune classe ; il reste un format
+    local, à ne charger que depuis des fichiers de confiance.
+    """
+
+    @classmethod
+    def classToData(cls, classe:Class, root:Path)->Dict:
+        try:
+            path = Path(classe.path).relative_to(root).as_posix()
+        except ValueError:
+            path = Path(classe.path).as_posix()
+        return {
+            "name": classe.name,
+            "type": classe.class_type,
+            "path": path,
+            "span": list(classe.span),
+            "params": list(classe.params),
+            "retour": list(classe.retour),
+            "methods": [{"name": method.name, "params": list(method.params), "retour": list(method.retour)} for method in classe.method],
+            "instances": [{"name": instance.name, "type": instance.type} for instance in classe.instance],
+            "instanciations": dict(classe.instanciation_class),
+            "children": list(classe.children),
+        }
+
+    @classmethod
+    def classFromData(cls, data:Dict, root:Path)->Class:
+        return Class(
+            class_type=data["type"],
+            path=root / data["path"],
+            name=data["name"],
+            code=None,
+            node=None,
+            method=[Method(name=method["name"], params=method["params"], retour=method["retour"]) for method in data["methods"]],
+            instance=[Instance(name=instance["name"], type=instance["type"]) for instance in data["instances"]],
+            children=data["children"],
+            params=data["params"],
+            retour=data["retour"],
+            instanciation_class=data["instanciations"],
+            span=tuple(data["span"]),
+        )
+
+    @classmethod
+    def toData(cls, project:Project)->Dict:
+        root = Path(project.path)
+        return {
+            "format": MODEL_FORMAT,
+            "version": MODEL_VERSION,
+            "name": project.name,
+            "path": str(root),
+            "classes": [cls.classToData(classe, root) for classe in project.classs],
+        }
+
+    @classmethod
+    def fromData(cls, data:Dict)->Project:
+        if not isinstance(data, dict) or data.get("format") != MODEL_FORMAT:
+            raise ModelError("not a project model file")
+        if data.get("version") != MODEL_VERSION:
+            raise ModelError(f"unsupported model version {data.get('version')} (expected {MODEL_VERSION})")
+        root = Path(data["path"])
+        classs: List[Class] = [cls.classFromData(classe, root) for classe in data["classes"]]
+        return Project(name=data["name"], classs=classs, path=root)
+
+    @classmethod
+    def isJson(cls, output:Path)->bool:
+        return Path(output).suffix == ".json"
+
+    @classmethod
+    def save(cls, project:Project, output:Path)->None:
+        output = Path(output)
+        data = cls.toData(project)
+        # Fichier temporaire puis renommage, comme pour le diagramme
+        temporary = output.with_name(f".{output.name}.tmp")
+        if cls.isJson(output):
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+        else:
+            with open(temporary, "wb") as file:
+                file.write(BINARY_MAGIC)
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, output)
+
+    @classmethod
+    def load(cls, source:Path)->Project:
+        with open(source, "rb") as file:
+            head = file.read(len(BINARY_MAGIC))
+            if head == BINARY_MAGIC:
+                try:
+                    data = _DataUnpickler(file).load()
+                except ModelError:
+                    raise
+                except (pickle.UnpicklingError, EOFError, ValueError, TypeError, IndexError, KeyError) as error:
+                    raise ModelError(f"not a project model file: {error}")
+            else:
+                try:
+                    data = json.loads(head + file.read())
+                except (UnicodeDecodeError, json.JSONDecodeError) as error:
+                    raise ModelError(f"not a project model file: {error}")
+        return cls.fromData(data)
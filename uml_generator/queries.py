@@ -0,0 +1,168 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from operator import attrgetter, itemgetter
+from typing import Dict, List, Tuple
+from tree_sitter import Node, Query
+
+from uml_generator.parsers import grammarFor, registry
+
+# Deux Query par grammaire, compilés au premier fichier qui en a besoin :
+# les déclarations de premier niveau (limité à la racine, quasi gratuit), puis
+# une passe native restreinte à chaque déclaration pour tout ce que l'extraction
+# parcourait en Python. Les types propres à TypeScript (type_identifier,
+# required_parameter, abstract_class_declaration) n'existent pas en JavaScript.
+DECLARATION_PATTERNS = """
+(program [(function_declaration) (class_declaration) (lexical_declaration)] @declaration)
+(program (export_statement [(function_declaration) (class_declaration) (lexical_declaration)] @declaration))
+"""
+
+TYPESCRIPT_DECLARATION_PATTERNS = """
+(program (export_statement (abstract_class_declaration) @declaration))
+"""
+
+COMMON_PATTERNS = """
+[(identifier) (property_identifier) (shorthand_property_identifier) (shorthand_property_identifier_pattern)] @identifier
+(call_expression) @call
+(lexical_declaration) @lexical
+(lexical_declaration kind: "const"
+  (variable_declarator name: (identifier) value: (new_expression constructor: (identifier) arguments: (arguments))) @instanciation)
+(return_statement (object) @returnObject)
+"""
+
+TYPESCRIPT_PATTERNS = """
+(type_identifier) @identifier
+(required_parameter) @parameter
+"""
+
+PATTERNS = {
+    "javascript": (DECLARATION_PATTERNS, COMMON_PATTERNS),
+    "typescript": (DECLARATION_PATTERNS + TYPESCRIPT_DECLARATION_PATTERNS, COMMON_PATTERNS + TYPESCRIPT_PATTERNS),
+    "tsx": (DECLARATION_PATTERNS + TYPESCRIPT_DECLARATION_PATTERNS, COMMON_PATTERNS + TYPESCRIPT_PATTERNS),
+}
+
+# Ordre de tri à début égal : un bloc ignoré passe avant ce qu'il contient
+LEXICAL, PARAMETER, CALL = 0, 1, 2
+
+# Même forme que l'ancienne regex sur "return { a, b }"
+RETURN_BLOCK = re.compile(r'{\s*([\w\s,]+)\s*}')
+
+_span = attrgetter("start_byte", "end_byte")
+_itemOrder = itemgetter(0, 1, 2)
+
+# Une Query garde la plage de set_byte_range jusqu'au captures() suivant : un
+# jeu par thread (threads du workspace, requêtes du démon)
+_local = threading.local()
+
+
+def queriesFor(grammar:str)->Tuple[Query, Query]:
+    compiled: Dict[str, Tuple[Query, Query]] | None = getattr(_local, "queries", None)
+    if compiled is None:
+        compiled = _local.queries = {}
+    queries = compiled.get(grammar)
+    if queries is None:
+        language = registry.language(grammar)
+        declarations, body = PATTERNS[grammar]
+        declarationQuery = Query(language, declarations)
+        declarationQuery.set_max_start_depth(0)
+        queries = (declarationQuery, Query(language, body))
+        compiled[grammar] = queries
+    return queries
+
+
+def _preorder(nodes:List[Node])->List[Node]:
+    # Les captures ne sortent pas dans l'ordre du document : on trie comme un
+    # parcours préfixe (début croissant, le parent avant l'enfant qui commence pareil)
+    return sorted(nodes, key=lambda node: (node.start_byte, -node.end_byte))
+
+
+class FileCaptures():
+    """Captures d'un fichier triées, interrogées ensuite par plage d'octets."""
+    __slots__ = ("code", "declarations", "identifiers", "identifierStarts", "items", "itemStarts", "instanciations")
+
+    def __init__(self, code:bytes, declarations:List[Node], captures:Dict[str, List[Node]]):
+        self.code = code
+        self.declarations = declarations
+        # Les identifiants sont des feuilles : le début suffit à les ordonner
+        identifiers = sorted(map(_span, captures.get("identifier", [])))
+        self.identifiers = identifiers
+        self.identifierStarts = [start for start, _ in identifiers]
+        items: List[Tuple[int, int, int, Node]] = []
+        for kind, name in ((LEXICAL, "lexical"), (PARAMETER, "parameter"), (CALL, "call")):
+            nodes = captures.get(name, [])
+            items.extend((start, -end, kind, node) for (start, end), node in zip(map(_span, nodes), nodes))
+        items.sort(key=_itemOrder)
+        self.items = items
+        self.itemStarts = [item[0] for item in items]
+        self.instanciations = self.instanciationMap(captures)
+
+    @classmethod
+    def capture(cls, root:Node, link, code:bytes)->'FileCaptures':
+        declarationQuery, bodyQuery = queriesFor(grammarFor(link.name))
+        declarations = _preorder(declarationQuery.captures(root).get("declaration", []))
+        # Le reste du fichier (module.exports, IIFE...) n'est jamais parcouru
+        captures: Dict[str, List[Node]] = {}
+        for declaration in declarations:
+            bodyQuery.set_byte_range((declaration.start_byte, declaration.end_byte))
+            for name, nodes in bodyQuery.captures(root).items():
+                captures.setdefault(name, []).extend(nodes)
+        return cls(code, declarations, captures)
+
+    def text(self, node:Node)->str:
+        return self.code[node.start_byte:node.end_byte].decode("utf-8")
+
+    def instanciationMap(self, captures:Dict[str, List[Node]])->Dict[str,str]:
+        # "const x = new X()" puis "return { x }" : x est une instance de X
+        declared = {}
+        for declarator in _preorder(captures.get("instanciation", [])):
+            value = declarator.child_by_field_name("value")
+            declared[self.text(declarator.child_by_field_name("name"))] = self.text(value.child_by_field_name("constructor"))
+        instance_map = {}
+        if not declared:
+            return instance_map
+        for block in _preorder(captures.get("returnObject", [])):
+            match = RETURN_BLOCK.fullmatch(self.text(block))
+            if not match:
+                continue
+            for prop in match.group(1).split(','):
+                prop = prop.strip()
+                if prop in declared:
+                    instance_map[prop] = declared[prop]
+        return instance_map
+
+    def identifiersIn(self, node:Node)->List[str]:
+        start, end = node.start_byte, node.end_byte
+        lower = bisect_left(self.identifierStarts, start)
+        upper = bisect_right(self.identifierStarts, end)
+        code = self.code
+        # Dédoublonnés en octets, décodés une seule fois chacun
+        identifiers = dict.fromkeys(code[identifierStart:identifierEnd] for identifierStart, identifierEnd in self.identifiers[lower:upper] if identifierEnd <= end)
+        return [identifier.decode("utf-8") for identifier in identifiers]
+
+    def _itemsIn(self, node:Node)->List[Tuple[int, int, int, Node]]:
+        lower = bisect_left(self.itemStarts, node.start_byte)
+        upper = bisect_right(self.itemStarts, node.end_byte)
+        return [item for item in self.items[lower:upper] if -item[1] <= node.end_byte]
+
+    def callees(self, node:Node)->List[str]:
+        # Fonctions appelées dans le sous-arbre, noeud compris
+        return [self.text(item[3].child_by_field_name("function")) for item in self._itemsIn(node) if item[2] == CALL]
+
+    def callsAndParameters(self, node:Node)->Tuple[List[str], List[str]]:
+        # Descendants de node, sans entrer dans les lexical_declaration ni
+        # dans les required_parameter (comme l'ancien parcours récursif)
+        callees, parameters = [], []
+        blocked: List[int] = []
+        for start, negativeEnd, kind, item in self._itemsIn(node):
+            while blocked and blocked[-1] <= start:
+                blocked.pop()
+            isBlocked = bool(blocked)
+            if kind != CALL:
+                blocked.append(-negativeEnd)
+            if isBlocked:
+                continue
+            if kind == CALL:
+                callees.append(self.text(item.child_by_field_name("function")))
+            elif kind == PARAMETER:
+                parameters.append(self.text(item))
+        return callees, parameters
@@ -0,0 +1,122 @@
+import re
+from typing import Dict, Iterable, Iterator, List, TextIO
+
+from uml_generator.entities import Class, Method, Project
+from uml_generator.mermaid import MermaidWriter
+
+# Caractères réservés dans les labels "record" de Graphviz
+DOT_RECORD_SPECIALS = re.compile(r'([{}|<>"\\])')
+
+
+def _oneLine(text:str)->str:
+    # Les paramètres sont recopiés du source et peuvent tenir sur plusieurs lignes
+    return " ".join(str(text).split())
+
+
+def memberLines(classe:Class)->Iterator[str]:
+    for param in classe.params:
+        yield f"+{_oneLine(param)}"
+    for method in classe.method:
+        yield methodLine(method)
+
+
+def methodLine(method:Method)->str:
+    params = ", ".join(_oneLine(param) for param in method.params)
+    retour = f": {', '.join(_oneLine(retour) for retour in method.retour)}" if method.retour else ""
+    return f"+{method.name}({params}){retour}"
+
+
+class LineWriter():
+    """Base des writers PlantUML/DOT : même API que MermaidWriter."""
+
+    def __init__(self, sink:TextIO):
+        self.sink = sink
+        self.classCount = 0
+
+    def _write(self, lines:Iterable[str])->None:
+        for line in lines:
+            self.sink.write(line)
+            self.sink.write("\n")
+
+    def writeClasses(self, classs:Iterable[Class])->None:
+        for classe in classs:
+            self.classCount += 1
+            self._write(self.classLines(classe))
+
+    def writeEdges(self, classs:Iterable[Class])->None:
+        for classe in classs:
+            self._write(self.edgeLines(classe))
+
+    def writeProject(self, project:Project)->None:
+        self.writeHeader(project.name)
+        self.writeClasses(project.classs)
+        self.writeEdges(project.classs)
+        self.writeFooter()
+
+
+class PlantUMLWriter(LineWriter):
+    def writeHeader(self, name:str)->None:
+        self._write(["@startuml", f'title Diagramme UML du projet "{name}"'])
+
+    def classLines(self, classe:Class)->Iterator[str]:
+        yield f'class "{classe.name}" <<{classe.class_type}>> {{'
+        for line in memberLines(classe):
+            yield f"  {line}"
+        yield "}"
+
+    def edgeLines(self, classe:Class)->Iterator[str]:
+        for dependency in classe.children:
+            yield f'"{classe.name}" --> "{dependency}"'
+
+    def writeFooter(self)->None:
+        self._write(["@enduml"])
+
+
+class DotWriter(LineWriter):
+    @classmethod
+    def quote(cls, text:str)->str:
+        return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    @classmethod
+    def recordText(cls, text:str)->str:
+        return DOT_RECORD_SPECIALS.sub(r"\\\1", _oneLine(text))
+
+    def writeHeader(self, name:str)->None:
+        self._write([f"digraph {self.quote(name)} {{", '  node [shape=record, fontname="Helvetica"];'])
+
+    def classLines(self, classe:Class)->Iterator[str]:
+        title = f"{self.recordText(classe.name)}\\n«{self.recordText(classe.class_type)}»"
+        params = "".join(f"{self.recordText(f'+{param}')}\\l" for param in classe.params)
+        methods = "".join(f"{self.recordText(methodLine(method))}\\l" for method in classe.method)
+        label = f"{{{title}|{params}|{methods}}}"
+        # recordText échappe déjà guillemets et backslashes du label
+        yield f'  {self.quote(classe.name)} [label="{label}"];'
+
+    def edgeLines(self, classe:Class)->Iterator[str]:
+        for dependency in classe.children:
+            yield f"  {self.quote(classe.name)} -> {self.quote(dependency)};"
+
+    def writeFooter(self)->None:
+        self._write(["}"])
+
+
+# Format -> (writer, extension par défaut)
+RENDERERS: Dict[str, tuple] = {
+    "mermaid": (MermaidWriter, ".mmd"),
+    "plantuml": (PlantUMLWriter, ".puml"),
+    "dot": (DotWriter, ".dot"),
+}
+
+
+def formats()->List[str]:
+    return list(RENDERERS)
+
+
+def writerFor(format:str, sink:TextIO):
+    writer, _ = RENDERERS[format]
+    return writer(sink)
+
+
+def defaultOutput(format:str)->str:
+    _, extension = RENDERERS[format]
+    return f"diagram{extension}"
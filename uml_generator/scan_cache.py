@@ -0,0 +1,162 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from uml_generator import source_files
+from uml_generator.entities import FileResult
+
+# A incrémenter dès que l'extraction produit des classes différentes
+SCANNER_VERSION = 7
+GRAMMAR_PACKAGES = ("tree-sitter", "tree-sitter-javascript", "tree-sitter-typescript")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def grammarFingerprint(limits:source_files.SourceLimits|None=None)->str:
+    versions = []
+    for package in GRAMMAR_PACKAGES:
+        try:
+            versions.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}=?")
+    # Les limites de lecture décident des fichiers écartés : un résultat mis en
+    # cache avec --keep-generated ne doit pas servir à un run par défaut
+    limits = limits or source_files.limits()
+    versions.append(f"maxBytes={limits.maxBytes};skipGenerated={limits.skipGenerated}")
+    return f"scanner={SCANNER_VERSION};" + ";".join(versions)
+
+
+def contentDigest(data:bytes)->str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ScanCache():
+    """Cache disque des FileResult, indexé par chemin + mtime/taille + hash du contenu.
+
+    Un run à chaud ne coûte qu'un stat par fichier. Le cache ne lit jamais les
+    fichiers : le hash est calculé par le scanner sur les octets lus pour
+    l'analyse, et comparé à celui en cache quand mtime ou taille ont changé.
+    Les fichiers écartés (trop gros, générés) sont mis en cache eux aussi.
+    Tout le cache est invalidé quand la version
+    du scanner, des grammaires tree-sitter ou les limites de lecture
+    (source_files.limits()) changent.
+    """
+
+    def __init__(self, folder:Path, maxBytes:int=DEFAULT_MAX_BYTES):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[Path, Tuple[int, int, str | None]] = {}
+        # Entrées servies depuis le cache : last_used mis à jour en une fois, avant l'éviction
+        self._touched: List[str] = []
+        self._db = sqlite3.connect(self.folder / "scan_cache.sqlite3")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT, "
+            "payload BLOB, payload_size INTEGER, last_used INTEGER)"
+        )
+        self._checkFingerprint()
+
+    def _checkFingerprint(self)->None:
+        fingerprint = grammarFingerprint()
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row and row[0] == fingerprint:
+            return
+        self._db.execute("DELETE FROM entries")
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        self._db.commit()
+
+    def lookup(self, link:Path)->FileResult|None:
+        try:
+            stat = os.stat(link)
+        except OSError:
+            return None
+        key = str(link)
+        row = self._db.execute(
+            "SELECT mtime_ns, size, digest, payload FROM entries WHERE path = ?", (key,)
+        ).fetchone()
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            result = self._load(key, row[3])
+            if result is not None:
+                return result
+            row = None
+        # Nouveau fichier, ou mtime/taille différents : le scanner hashera les octets qu'il lit
+        self._pending[Path(link)] = (stat.st_mtime_ns, stat.st_size, row[2] if row else None)
+        return None
+
+    def known(self, link:Path)->str|None:
+        # Hash en cache d'un fichier dont seul le mtime a peut-être changé
+        pending = self._pending.get(Path(link))
+        return pending[2] if pending else None
+
+    def _load(self, key:str, payload:bytes)->FileResult|None:
+        try:
+            result = pickle.loads(payload)
+        except Exception:
+            self._db.execute("DELETE FROM entries WHERE path = ?", (key,))
+            return None
+        self._touched.append(key)
+        self.hits += 1
+        return result
+
+    def store(self, result:FileResult)->FileResult|None:
+        # Résultat du scanner : enregistré, ou pour un contenu inchangé, repris du
+        # cache (None si l'entrée est illisible, le fichier est alors ré-analysé)
+        link = Path(result.path)
+        key = str(link)
+        pending = self._pending.pop(link, None)
+        if pending is None:
+            stat = os.stat(link)
+            pending = (stat.st_mtime_ns, stat.st_size, None)
+        if result.unchanged:
+            row = self._db.execute("SELECT payload FROM entries WHERE path = ?", (key,)).fetchone()
+            self._db.execute("UPDATE entries SET mtime_ns = ?, size = ? WHERE path = ?", (pending[0], pending[1], key))
+            return self._load(key, row[0]) if row else None
+        # Un défaut n'est compté qu'une fois le fichier réellement analysé
+        self.misses += 1
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, pending[0], pending[1], result.digest, payload, len(payload), time.time_ns()),
+        )
+        return result
+
+    def touch(self)->None:
+        if not self._touched:
+            return
+        now = time.time_ns()
+        self._db.executemany("UPDATE entries SET last_used = ? WHERE path = ?", ((now, key) for key in self._touched))
+        self._touched = []
+
+    def evict(self)->int:
+        self.touch()
+        total = self._db.execute("SELECT COALESCE(SUM(payload_size), 0) FROM entries").fetchone()[0]
+        if total <= self.maxBytes:
+            return 0
+        rows = self._db.execute("SELECT path, payload_size FROM entries ORDER BY last_used ASC").fetchall()
+        victims = []
+        for path, size in rows:
+            if total <= self.maxBytes:
+                break
+            victims.append((path,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE path = ?", victims)
+        return len(victims)
+
+    def close(self)->None:
+        self.evict()
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self)->'ScanCache':
+        return self
+
+    def __exit__(self, *exc)->None:
+        self.close()
@@ -0,0 +1,149 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Tuple
+
+from uml_generator.entities import Class, Project
+from uml_generator.mermaid import MermaidWriter, openOutput
+
+INDEX_NAME = "index.mmd"
+# Liste des shards écrits au run précédent, pour supprimer ceux qui ont disparu
+MANIFEST_NAME = ".shards"
+ROOT_SHARD = "."
+
+
+@dataclass(slots=True)
+class ShardStats():
+    shards: int = 0
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def report(self)->str:
+        return f"🧩 Shards : {self.shards} fichiers, {self.written} réécrits, {self.unchanged} inchangés, {self.removed} supprimés"
+
+
+def shardKey(path:Path, root:Path, depth:int)->str:
+    try:
+        parts = PurePosixPath(Path(path).relative_to(root).as_posix()).parent.parts
+    except ValueError:
+        parts = PurePosixPath(Path(path).as_posix()).parent.parts
+    return "/".join(parts[:depth]) or ROOT_SHARD
+
+
+def shardFileName(shard:str)->str:
+    if shard == ROOT_SHARD:
+        return "_root.mmd"
+    name = shard.replace("/", "__")
+    # Sans "_" dans le chemin, "__" ne peut venir que d'un "/" : le nom reste lisible.
+    # Sinon ("a/b" et "a__b", "a_/b" et "a/_b"), ou pour un nom réservé, un hash du chemin
+    if "_" in shard or name + ".mmd" in (INDEX_NAME, "_root.mmd"):
+        name += "-" + hashlib.blake2b(shard.encode("utf-8"), digest_size=6).hexdigest()
+    return name + ".mmd"
+
+
+def _writeIfChanged(output:Path, text:str)->bool:
+    # Un shard identique n'est pas réécrit : mtime et diff restent stables
+    try:
+        with open(output, encoding="utf-8") as file:
+            if file.read() == text:
+                return False
+    except OSError:
+        pass
+    with openOutput(output) as file:
+        file.write(text)
+    return True
+
+
+class ShardedOutput():
+    """Un .mmd par dossier (jusqu'à depth niveaux) et un index des shards.
+
+    L'index relie les shards entre eux avec le nombre de liens qui traversent
+    la frontière ; chaque shard ne contient que ses classes et leurs liens.
+    """
+
+    def __init__(self, folder:Path, depth:int=1, jobs:int=4):
+        self.folder = Path(folder)
+        self.depth = depth
+        self.jobs = max(1, jobs)
+        self.stats = ShardStats()
+
+    def partition(self, project:Project)->Dict[str, List[Class]]:
+        shards: Dict[str, List[Class]] = {}
+        root = Path(project.path)
+        keys: Dict[Path, str] = {}
+        for classe in project.classs:
+            key = keys.get(classe.path)
+            if key is None:
+                key = keys[classe.path] = shardKey(classe.path, root, self.depth)
+            shards.setdefault(key, []).append(classe)
+        return dict(sorted(shards.items()))
+
+    @classmethod
+    def crossEdges(cls, shards:Dict[str, List[Class]])->Dict[Tuple[str, str], int]:
+        homes: Dict[str, set] = {}
+        for shard, classs in shards.items():
+            for classe in classs:
+                homes.setdefault(classe.name, set()).add(shard)
+        counts: Dict[Tuple[str, str], int] = {}
+        for shard, classs in shards.items():
+            for classe in classs:
+                for dependency in classe.children:
+                    for target in homes.get(dependency, ()):
+                        if target != shard:
+                            counts[(shard, target)] = counts.get((shard, target), 0) + 1
+        return dict(sorted(counts.items()))
+
+    @classmethod
+    def shardText(cls, project:Project, shard:str, classs:List[Class])->str:
+        sink = io.StringIO()
+        MermaidWriter(sink).writeProject(Project(name=f"{project.name}/{shard}", classs=classs, path=project.path))
+        return sink.getvalue()
+
+    @classmethod
+    def indexText(cls, project:Project, shards:Dict[str, List[Class]], edges:Dict[Tuple[str, str], int])->str:
+        identifiers = {shard: f"s{position}" for position, shard in enumerate(shards)}
+        lines = ["flowchart LR", f'%% Index des shards du projet "{project.name}"']
+        for shard, classs in shards.items():
+            lines.append(f'{identifiers[shard]}["{shard}<br/>{len(classs)} classes"]')
+            lines.append(f'click {identifiers[shard]} "{shardFileName(shard)}"')
+        for (source, target), count in edges.items():
+            lines.append(f"{identifiers[source]} -->|{count}| {identifiers[target]}")
+        return "\n".join(lines)
+
+    def _previousShards(self)->List[str]:
+        try:
+            with open(self.folder / MANIFEST_NAME, encoding="utf-8") as file:
+                return [line.strip() for line in file if line.strip()]
+        except OSError:
+            return []
+
+    def write(self, project:Project)->ShardStats:
+        self.folder.mkdir(parents=True, exist_ok=True)
+        shards = self.partition(project)
+        self.stats = ShardStats(shards=len(shards))
+
+        def writeShard(item:Tuple[str, List[Class]])->bool:
+            shard, classs = item
+            return _writeIfChanged(self.folder / shardFileName(shard), self.shardText(project, shard, classs))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for written in pool.map(writeShard, shards.items()):
+                if written:
+                    self.stats.written += 1
+                else:
+                    self.stats.unchanged += 1
+        _writeIfChanged(self.folder / INDEX_NAME, self.indexText(project, shards, self.crossEdges(shards)))
+
+        current = [shardFileName(shard) for shard in shards]
+        for name in set(self._previousShards()) - set(current):
+            try:
+                os.remove(self.folder / name)
+                self.stats.removed += 1
+            except OSError:
+                pass
+        _writeIfChanged(self.folder / MANIFEST_NAME, "\n".join(current) + "\n")
+        return self.stats
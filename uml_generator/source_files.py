@@ -0,0 +1,111 @@
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from uml_generator import profiling
+
+# Au-delà, le fichier est mappé en mémoire au lieu d'être copié dans le tas Python
+MMAP_THRESHOLD = 256 * 1024
+DEFAULT_MAX_FILE_BYTES = 2 * 1024 * 1024
+# Détection des fichiers minifiés/générés : commentaire de source map en fin de
+# fichier, ou lignes trop longues en moyenne sur le début du fichier
+SOURCE_MAP_MARKER = b"sourceMappingURL="
+SOURCE_MAP_TAIL = 512
+SAMPLE_BYTES = 64 * 1024
+MIN_SAMPLE_BYTES = 4 * 1024
+MAX_AVERAGE_LINE_LENGTH = 200
+
+
+class SkippedSource(Exception):
+    def __init__(self, reason:str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass(frozen=True, slots=True)
+class SourceLimits():
+    maxBytes: int | None = DEFAULT_MAX_FILE_BYTES
+    skipGenerated: bool = True
+
+
+_limits = SourceLimits()
+
+
+def limits()->SourceLimits:
+    return _limits
+
+
+def configure(sourceLimits:SourceLimits)->None:
+    # Réglage par processus, comme profiling.enable() (repris dans chaque worker)
+    global _limits
+    _limits = sourceLimits
+
+
+def looksGenerated(code)->bool:
+    if SOURCE_MAP_MARKER in code[-SOURCE_MAP_TAIL:]:
+        return True
+    sample = code[:SAMPLE_BYTES]
+    if len(sample) < MIN_SAMPLE_BYTES:
+        return False
+    return len(sample) / (sample.count(b"\n") + 1) > MAX_AVERAGE_LINE_LENGTH
+
+
+def loadSource(link:Path)->bytes | mmap.mmap:
+    """Contenu brut du fichier, sans décodage : bytes, ou mmap pour un gros fichier.
+
+    Les tranches code[a:b] renvoient des bytes dans les deux cas ; un mmap
+    se libère avec closeSource(). Lève SkippedSource pour un fichier trop
+    gros ou généré. Appelable depuis un thread de lecture (prefetch).
+    """
+    with open(link, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if _limits.maxBytes is not None and size > _limits.maxBytes:
+            raise SkippedSource("oversized")
+        with profiling.stage("read", link) as span:
+            if size >= MMAP_THRESHOLD:
+                code = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(code, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+                    # Lecture anticipée par le noyau, sans copie dans le tas Python
+                    code.madvise(mmap.MADV_WILLNEED)
+            else:
+                code = file.read()
+            span.annotate(bytes=size)
+    if _limits.skipGenerated and looksGenerated(code):
+        closeSource(code)
+        raise SkippedSource("generated")
+    return code
+
+
+def closeSource(code)->None:
+    if isinstance(code, mmap.mmap):
+        code.close()
+
+
+@contextmanager
+def openSource(link:Path)->Iterator[bytes | mmap.mmap]:
+    # Le mmap n'est valable que dans le bloc with
+    code = loadSource(link)
+    try:
+        yield code
+    finally:
+        closeSource(code)
+
+
+def readSource(link:Path)->bytes:
+    # Pour les appelants qui gardent le contenu au-delà de l'analyse (mode watch)
+    with openSource(link) as code:
+        return code if isinstance(code, bytes) else code[:]
+
+
+def parseSource(parser, code, old_tree=None):
+    # tree-sitter accepte un buffer : on lui passe une vue sur le mmap, sans copie
+    if isinstance(code, bytes):
+        return parser.parse(code, old_tree) if old_tree else parser.parse(code)
+    view = memoryview(code)
+    try:
+        return parser.parse(view, old_tree) if old_tree else parser.parse(view)
+    finally:
+        view.release()
@@ -0,0 +1,98 @@
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from uml_generator.entities import Class, Project
+from uml_generator.walker import IgnoreRules
+
+DIRECTIONS = ("dependencies", "dependents", "both")
+
+
+class AdjacencyIndex():
+    """Graphe des liens Class.children, construit une fois pour tout le projet.
+
+    Les noeuds sont les positions dans project.classs (plusieurs classes peuvent
+    porter le même nom) ; un lien vers un nom mène à toutes les classes de ce nom.
+    """
+
+    def __init__(self, classs:List[Class]):
+        self.classs = classs
+        self.byName: Dict[str, List[int]] = {}
+        self.dependents: Dict[str, List[int]] = {}
+        for position, classe in enumerate(classs):
+            self.byName.setdefault(classe.name, []).append(position)
+            for dependency in classe.children:
+                self.dependents.setdefault(dependency, []).append(position)
+
+    def neighbours(self, position:int, direction:str)->Iterable[int]:
+        classe = self.classs[position]
+        if direction in ("dependencies", "both"):
+            for dependency in classe.children:
+                yield from self.byName.get(dependency, ())
+        if direction in ("dependents", "both"):
+            yield from self.dependents.get(classe.name, ())
+
+    def seeds(self, patterns:Iterable[str], root:str)->List[int]:
+        # Un motif désigne un nom de classe, ou à défaut un glob de chemin (syntaxe .gitignore)
+        patterns = list(patterns)
+        names = [position for pattern in patterns for position in self.byName.get(pattern, ())]
+        paths = IgnoreRules.fromPatterns(base=root, patterns=patterns)
+        # Un motif de dossier (src/pkg0/, pkg0) retient tout ce qu'il contient :
+        # sans décision pour le fichier, c'est le dossier parent le plus proche qui tranche
+        folders: Dict[str, bool|None] = {}
+
+        def folderDecision(relative:str)->bool|None:
+            if relative not in folders:
+                decision = paths.decide(relative, isDirectory=True)
+                parent = relative.rpartition("/")[0]
+                if decision is None and parent:
+                    decision = folderDecision(parent)
+                folders[relative] = decision
+            return folders[relative]
+
+        matched: Dict[str, bool] = {}
+        for position, classe in enumerate(self.classs):
+            path = str(classe.path)
+            if path not in matched:
+                relative = os.path.relpath(path, root).replace(os.sep, "/")
+                decision = paths.decide(relative, isDirectory=False)
+                parent = relative.rpartition("/")[0]
+                if decision is None and parent and not relative.startswith("../"):
+                    decision = folderDecision(parent)
+                matched[path] = bool(decision)
+            if matched[path]:
+                names.append(position)
+        return sorted(set(names))
+
+    def reachable(self, seeds:Iterable[int], depth:int, direction:str)->List[int]:
+        # BFS borné à depth sauts : le coût ne dépend que du sous-graphe atteint
+        distances = {position: 0 for position in seeds}
+        pending = deque(distances)
+        while pending:
+            position = pending.popleft()
+            if distances[position] >= depth:
+                continue
+            for neighbour in self.neighbours(position, direction):
+                if neighbour not in distances:
+                    distances[neighbour] = distances[position] + 1
+                    pending.append(neighbour)
+        return sorted(distances)
+
+    def subgraph(self, positions:Iterable[int])->List[Class]:
+        # Ordre d'origine conservé, liens limités aux classes gardées
+        classs = [self.classs[position] for position in positions]
+        kept = {classe.name for classe in classs}
+        return [classe.addDependencies([name for name in classe.children if name in kept]) for classe in classs]
+
+
+@dataclass(frozen=True, slots=True)
+class Focus():
+    patterns: tuple[str, ...]
+    depth: int = 1
+    direction: str = "both"
+
+    def apply(self, project:Project, index:AdjacencyIndex|None=None)->Project:
+        index = index or AdjacencyIndex(list(project.classs))
+        seeds = index.seeds(self.patterns, str(project.path))
+        return project.setClasses(index.subgraph(index.reachable(seeds, self.depth, self.direction)))
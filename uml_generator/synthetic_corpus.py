@@ -0,0 +1,120 @@
+import posixpath
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+EXTENSIONS = (".ts", ".tsx", ".js")
+FILES_PER_FOLDER = 50
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusSpec():
+    files: int = 200
+    classesPerFile: int = 3
+    methodsPerClass: int = 5
+    fanOut: int = 3
+    seed: int = 42
+
+    def __post_init__(self):
+        # Mêmes noms que les options de "bench --generate"
+        for option, value, minimum in (("--files", self.files, 1), ("--classes-per-file", self.classesPerFile, 1), ("--methods-per-class", self.methodsPerClass, 0), ("--fan-out", self.fanOut, 0)):
+            if value < minimum:
+                raise ValueError(f"{option} must be at least {minimum}")
+
+
+class SyntheticCorpus():
+    """Génère un projet JS/TS/TSX déterministe pour les benchmarks."""
+
+    @classmethod
+    def className(cls, fileIndex:int, classIndex:int)->str:
+        return f"Module{fileIndex}Class{classIndex}"
+
+    @classmethod
+    def relativePath(cls, fileIndex:int)->str:
+        extension = EXTENSIONS[fileIndex % len(EXTENSIONS)]
+        return f"src/pkg{fileIndex // FILES_PER_FOLDER}/module{fileIndex}{extension}"
+
+    @classmethod
+    def importPath(cls, fileIndex:int, targetIndex:int)->str:
+        # Chemin relatif sans extension, résolu comme le ferait TypeScript
+        source = posixpath.dirname(cls.relativePath(fileIndex))
+        target = posixpath.splitext(cls.relativePath(targetIndex))[0]
+        relative = posixpath.relpath(target, source)
+        return relative if relative.startswith("../") else "./" + relative
+
+    @classmethod
+    def tsClass(cls, name:str, methods:int, targets:List[str])->List[str]:
+        lines = [f"export class {name} {{", "  private count: number;", "  label: string;"]
+        for index in range(methods):
+            target = targets[index % len(targets)] if targets else "Math"
+            lines += [
+                f"  method{index}(value: number, name: string): Promise<number> {{",
+                f"    const helper = new {target}();",
+                f"    return helper.method0(value + {index}, name);",
+                "  }",
+            ]
+        lines.append("}")
+        return lines
+
+    @classmethod
+    def jsClass(cls, name:str, methods:int, targets:List[str])->List[str]:
+        lines = [f"class {name} {{"]
+        for index in range(methods):
+            target = targets[index % len(targets)] if targets else "Object"
+            lines += [
+                f"  method{index}(value) {{",
+                f"    const result = {target}(value);",
+                "    console.log(result);",
+                f"    return compute{index}(result);",
+                "  }",
+            ]
+        lines.append("}")
+        return lines
+
+    @classmethod
+    def tsxComponent(cls, name:str, methods:int, targets:List[str])->List[str]:
+        lines = [f"export function {name}({{ items, title }}) {{"]
+        for index in range(methods):
+            target = targets[index % len(targets)] if targets else "String"
+            lines += [
+                f"  const handler{index} = async (event) => {{",
+                f"    setState{index}({target}(event));",
+                "  };",
+            ]
+        lines.append("  return <div title={title}>{items}</div>;")
+        lines.append("}")
+        return lines
+
+    @classmethod
+    def fileSource(cls, fileIndex:int, spec:CorpusSpec, rng:random.Random)->str:
+        extension = EXTENSIONS[fileIndex % len(EXTENSIONS)]
+        imported = {}
+        while len(imported) < min(spec.fanOut, spec.files - 1):
+            index = rng.randrange(spec.files)
+            if index != fileIndex:
+                imported[index] = None
+        targets = [cls.className(index, rng.randrange(spec.classesPerFile)) for index in imported]
+        lines = [f"import {{ {target} }} from '{cls.importPath(fileIndex, index)}';" for index, target in zip(imported, targets)]
+        for classIndex in range(spec.classesPerFile):
+            name = cls.className(fileIndex, classIndex)
+            if extension == ".tsx":
+                lines += cls.tsxComponent(name, spec.methodsPerClass, targets)
+            elif extension == ".ts":
+                lines += cls.tsClass(name, spec.methodsPerClass, targets)
+            else:
+                lines += cls.jsClass(name, spec.methodsPerClass, targets)
+            lines.append("")
+        return "\n".join(lines)
+
+    @classmethod
+    def generate(cls, folder:Path, spec:CorpusSpec)->int:
+        rng = random.Random(spec.seed)
+        total = 0
+        for fileIndex in range(spec.files):
+            path = Path(folder) / cls.relativePath(fileIndex)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            source = cls.fileSource(fileIndex, spec, rng)
+            path.write_text(source, encoding="utf-8")
+            total += len(source.encode("utf-8"))
+        return total
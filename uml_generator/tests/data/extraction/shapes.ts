@@ -0,0 +1,31 @@
+import { Logger } from "./logger";
+
+export abstract class Shape {
+  constructor(protected name: string) {}
+  abstract area(): number;
+  describe(logger: Logger): string {
+    logger.info(this.name);
+    return `${this.name}: ${this.area()}`;
+  }
+}
+
+export class Circle extends Shape implements Drawable {
+  private center: Point;
+  constructor(radius: number, center: Point) {
+    super("circle");
+    this.center = center;
+  }
+  area(): number { return Math.PI * this.radius ** 2; }
+  async move(delta: Vector, options?: MoveOptions): Promise<Point> {
+    const next = new Point(this.center.x + delta.x, this.center.y);
+    return next;
+  }
+}
+
+export function createCircle(radius: number): Circle {
+  return new Circle(radius, new Point(0, 0));
+}
+
+export const scale = (shape: Shape, factor: number): Shape => {
+  return shape;
+};
@@ -0,0 +1,29 @@
+const EventEmitter = require("events");
+
+class Store extends EventEmitter {
+  constructor(options) {
+    super();
+    this.items = new Map();
+    this.cache = new Cache(options.size);
+  }
+  add(item, { notify = true } = {}) {
+    this.items.set(item.id, item);
+    if (notify) this.emit("added", validate(item));
+  }
+  static create(...args) {
+    return new Store(...args);
+  }
+}
+
+function makeRepository(db) {
+  const users = new UserTable(db);
+  const orders = new OrderTable(db);
+  return { users, orders };
+}
+
+const handler = async (event, context) => {
+  const store = Store.create(event.options);
+  return store.add(event.item);
+};
+
+module.exports = { Store, makeRepository, handler };
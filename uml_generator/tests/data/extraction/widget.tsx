@@ -0,0 +1,9 @@
+export const Widget = ({ title, items }: WidgetProps) => {
+  const [state, setState] = useState<State>(initialState);
+  return <List title={title} items={items.map(format)} />;
+};
+
+export function Panel(props: PanelProps): JSX.Element {
+  const service = new PanelService(props.api);
+  return <Widget title={service.title()} items={[]} />;
+}
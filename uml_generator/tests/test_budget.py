@@ -0,0 +1,109 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from main import NavigateTroughtProject
+from uml_generator.budget import BudgetClock, Coverage, FilePriority, ScanBudget
+from uml_generator.entities import Project
+from uml_generator.scan_cache import ScanCache
+
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+
+
+def writeFiles(root:Path, files:dict[str, str])->list[Path]:
+    paths = []
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        paths.append(path)
+    return paths
+
+
+def writeClasses(root:Path, count:int)->None:
+    writeFiles(root, {f"f{index}.ts": f"export class C{index} {{}}\n" for index in range(count)})
+
+
+def budgetScan(root:Path, budget:ScanBudget, cache:ScanCache|None=None)->tuple[NavigateTroughtProject, Project]:
+    # Sans lecture anticipée : un fichier consulté est un fichier analysé
+    navigator = NavigateTroughtProject(readers=0)
+    project = navigator.setProject(root, cache=cache, budget=budget)
+    return navigator, project
+
+
+def stopAfter(monkeypatch, scanned:list, count:int)->None:
+    # Budget de temps atteint après count fichiers ; le parcours et la pré-passe vont au bout
+    monkeypatch.setattr(BudgetClock, "expired", lambda self, share=1.0: share == 1.0 and len(scanned) >= count)
+
+
+def test_time_budget_stops_before_cache_lookups(tmp_path, monkeypatch):
+    writeClasses(tmp_path / "src", 10)
+    scanned = []
+    stopAfter(monkeypatch, scanned, 3)
+    lookups = []
+    lookup = ScanCache.lookup
+    monkeypatch.setattr(ScanCache, "lookup", lambda self, link: lookups.append(link) or lookup(self, link))
+    with ScanCache(folder=tmp_path / "cache") as cache:
+        navigator = NavigateTroughtProject(readers=0)
+        project = navigator.setProject(tmp_path / "src", cache=cache, budget=ScanBudget(seconds=60), onFile=scanned.append)
+        # Les fichiers hors budget ne sont ni consultés ni comptés comme défauts
+        assert (len(lookups), cache.hits, cache.misses) == (3, 0, 3)
+    assert len(project.classs) == 3
+    assert navigator.coverage.reason == "time"
+    assert (navigator.coverage.scanned, navigator.coverage.found) == (3, 10)
+
+    scanned.clear()
+    stopAfter(monkeypatch, scanned, 5)
+    with ScanCache(folder=tmp_path / "cache") as cache:
+        navigator = NavigateTroughtProject(readers=0)
+        navigator.setProject(tmp_path / "src", cache=cache, budget=ScanBudget(seconds=60), onFile=scanned.append)
+        assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_max_files(tmp_path):
+    writeClasses(tmp_path, 5)
+    navigator, project = budgetScan(tmp_path, ScanBudget(maxFiles=2))
+    assert len(project.classs) == 2
+    assert (navigator.coverage.scanned, navigator.coverage.found, navigator.coverage.reason) == (2, 5, "files")
+    navigator, project = budgetScan(tmp_path, ScanBudget(maxFiles=10))
+    assert len(project.classs) == 5
+    assert navigator.coverage.reason == "complete"
+
+
+def test_coverage_report():
+    coverage = Coverage(found=8, foundBytes=400, scanned=2, scannedBytes=100, reason="time", elapsed=1.25, walkComplete=False)
+    assert coverage.report() == "⏱️ Couverture : 2/8 fichiers (25.0 %), 25.0 % des octets, budget de temps atteint en 1.2 s, parcours interrompu"
+    assert "100.0 % des octets, analyse complète" in Coverage().report()
+
+
+def test_coverage_report_from_cli(tmp_path):
+    writeClasses(tmp_path / "src", 4)
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "get_uml", str(tmp_path / "src"), "--no-cache", "--no-daemon", "--max-files", "3"],
+        capture_output=True, cwd=tmp_path, text=True,
+    )
+    assert "analyse terminée" in completed.stdout, completed.stdout + completed.stderr
+    assert "⏱️ Couverture : 3/4 fichiers (75.0 %)" in completed.stdout
+    assert "nombre maximal de fichiers atteint" in completed.stdout
+
+
+def test_fan_in_ordering(tmp_path):
+    files = writeFiles(tmp_path, {
+        "deep/nested/big.ts": "export class Big {}\n" * 20,
+        "deep/nested/small.ts": "export class Small {}\n",
+        "leaf.ts": "export class Leaf {}\n",
+        # core est importé quatre fois, util une fois (import "./util.js" depuis TypeScript)
+        "core/index.ts": "export class Core {}\n",
+        "util.ts": "export class Util {}\n",
+        "a.ts": "import { Core } from './core';\nimport { Util } from './util.js';\n",
+        "b.ts": "import { Core } from './core/index';\nimport { Core as Again } from './core';\n",
+        "deep/c.ts": "const core = require('../core');\nimport('./missing');\n",
+    })
+    coverage = Coverage()
+    ordered, sizes = FilePriority.order(files, BudgetClock(ScanBudget(seconds=60)), coverage)
+    names = [path.relative_to(tmp_path).as_posix() for path in ordered]
+    # Les plus importés d'abord, puis les moins profonds, puis les plus petits
+    assert names[:2] == ["core/index.ts", "util.ts"]
+    assert names[2:] == ["leaf.ts", "a.ts", "b.ts", "deep/c.ts", "deep/nested/small.ts", "deep/nested/big.ts"]
+    assert (coverage.found, coverage.prioritized) == (8, 8)
+    assert coverage.foundBytes == sum(sizes.values()) == sum(path.stat().st_size for path in files)
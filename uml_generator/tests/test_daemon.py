@@ -0,0 +1,150 @@
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+from main import NavigateTroughtProject
+from uml_generator.daemon import DaemonClient, DiagramDaemon, WarmProjects
+from uml_generator.queries import queriesFor
+from uml_generator.watcher import ProjectWatcher
+
+
+def build(root:Path, settings:dict)->ProjectWatcher:
+    navigator = NavigateTroughtProject(exclude=settings.get("exclude", ()))
+    results = list(navigator.scanFiles(files=navigator.projectFiles(root)))
+    return ProjectWatcher(walker=navigator.walker(root), results=results, render=lambda project: None)
+
+
+def makeRepo(root:Path, classes:int=1)->Path:
+    root.mkdir(parents=True)
+    for index in range(classes):
+        (root / f"c{index}.ts").write_text(f"export class {root.name.capitalize()}{index} {{ run(): void {{}} }}\n")
+    return root
+
+
+def roots(projects:WarmProjects)->list[str]:
+    return [Path(key[0]).name for key in projects.entries]
+
+
+def test_least_recently_used_project_is_evicted(tmp_path):
+    a, b, c = (makeRepo(tmp_path / name) for name in ("a", "b", "c"))
+    projects = WarmProjects(build=build, maxProjects=2)
+    projects.project(a, {})
+    projects.project(b, {})
+    project, changed, warm = projects.project(a, {})
+    assert (changed, warm) == (0, True)
+    projects.project(c, {})
+    assert roots(projects) == ["a", "c"]
+    assert projects.evicted == 1
+    # Les options de parcours font partie de la clé
+    projects.project(a, {"exclude": ["c0.ts"]})
+    assert roots(projects) == ["c", "a"]
+    assert projects.evicted == 2
+
+
+def test_memory_bound_keeps_the_served_project(tmp_path):
+    small, large = makeRepo(tmp_path / "small"), makeRepo(tmp_path / "large", classes=20)
+    projects = WarmProjects(build=build, maxBytes=1)
+    projects.project(small, {})
+    # Seul au-dessus de la limite, le projet servi reste chaud
+    assert roots(projects) == ["small"]
+    projects.project(large, {})
+    assert roots(projects) == ["large"]
+    footprint = projects.memory()
+    assert footprint > 0
+    projects.maxBytes = footprint + projects.entries[next(iter(projects.entries))].footprint
+    projects.project(small, {})
+    assert roots(projects) == ["large", "small"]
+    assert [entry["classes"] for entry in projects.status()] == [20, 1]
+
+
+def test_keys_of_one_root_build_one_at_a_time(tmp_path):
+    root = makeRepo(tmp_path / "repo")
+    active, overlaps = [], []
+
+    def slowBuild(root:Path, settings:dict)->ProjectWatcher:
+        # Deux scans du même dépôt écriraient dans la même base SQLite
+        active.append(1)
+        overlaps.append(len(active))
+        time.sleep(0.1)
+        active.pop()
+        return build(root, settings)
+
+    projects = WarmProjects(build=slowBuild)
+    threads = [threading.Thread(target=projects.project, args=(root, {"exclude": [str(index)]})) for index in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == [1, 1, 1]
+    assert len(projects.entries) == 3
+
+
+def startDaemon(tmp_path:Path)->tuple[DiagramDaemon, threading.Thread, DaemonClient]:
+    socketPath = tmp_path / "d.sock"
+    server = DiagramDaemon(projects=WarmProjects(build=build), socketPath=socketPath, workers=1)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    client = DaemonClient(socketPath)
+    for _ in range(100):
+        if client.request({"command": "status"}, timeout=1.0):
+            break
+        time.sleep(0.05)
+    return server, thread, client
+
+
+def test_status_render_and_stop(tmp_path, monkeypatch):
+    repo = makeRepo(tmp_path / "repo", classes=2)
+    server, thread, client = startDaemon(tmp_path)
+    queries = []
+    render = server.render
+    # Les requêtes tree-sitter compilées sont gardées d'une connexion à l'autre
+    monkeypatch.setattr(server, "render", lambda request: queries.append(queriesFor("typescript")) or render(request))
+    first = client.request({"command": "render", "root": str(repo)})
+    assert first["ok"] and (first["classes"], first["warm"]) == (2, False)
+    assert "class Repo1" in first["diagram"]
+    second = client.request({"command": "render", "root": str(repo), "focus": ["Repo0"], "depth": 0})
+    assert (second["classes"], second["total"], second["warm"]) == (1, 2, True)
+    assert queries[0] is queries[1]
+    status = client.request({"command": "status"})
+    assert status["ok"] and [project["classes"] for project in status["projects"]] == [2]
+    assert client.request({"command": "reload"}) == {"ok": False, "error": "unknown command 'reload'"}
+    assert client.request({"command": "render", "root": str(tmp_path / "missing")})["ok"] is False
+    assert client.request({"command": "stop"}) == {"ok": True}
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not (tmp_path / "d.sock").exists()
+    assert client.request({"command": "status"}) is None
+
+
+def test_invalid_requests_and_replies(tmp_path):
+    server, thread, client = startDaemon(tmp_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(tmp_path / "d.sock"))
+        connection.sendall(b"not json\n")
+        with connection.makefile("rb") as stream:
+            response = json.loads(stream.readline())
+    assert response["ok"] is False and "JSONDecodeError" in response["error"]
+    # Le démon répond toujours après une requête invalide
+    assert client.request({"command": "status"})["ok"]
+    client.request({"command": "stop"})
+    thread.join(timeout=5)
+
+    # Une réponse qui n'est pas du JSON : le client retombe sur un scan local
+    other = tmp_path / "other.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(other))
+    listener.listen(1)
+
+    def reply()->None:
+        connection, _ = listener.accept()
+        with connection:
+            connection.recv(1024)
+            connection.sendall(b"<html>\n")
+
+    replier = threading.Thread(target=reply)
+    replier.start()
+    assert DaemonClient(other).request({"command": "status"}) is None
+    replier.join()
+    listener.close()
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from main import NavigateTroughtProject
+from uml_generator.dependency_index import DependencyIndex
+
+
+def write(root:Path, name:str, text:str)->None:
+    (root / name).write_text(text)
+
+
+def links(root:Path)->dict[str, list[str]]:
+    return {classe.name: classe.children for classe in NavigateTroughtProject().setProject(link=root).classs}
+
+
+def test_aliases_are_local_to_their_file(tmp_path):
+    write(tmp_path, "service.ts", "export class Service {}\nexport class Thing {}\n")
+    # "s" et "t" ne sont des instances que dans factory.js
+    write(tmp_path, "factory.js", "function makeServices() {\n  const s = new Service();\n  const t = new Thing();\n  return { s, t };\n}\nfunction useServices() {\n  return s.run(t);\n}\n")
+    write(tmp_path, "card.tsx", "export const Card = (props) => {\n  return props.t + props.s;\n};\n")
+    write(tmp_path, "page.js", "function Page(s) {\n  const t = s.t;\n  return t;\n}\n")
+    result = links(tmp_path)
+    assert result["Card"] == []
+    assert result["Page"] == []
+    assert sorted(result["useServices"]) == ["Service", "Thing"]
+
+
+def test_removed_classes_drop_their_aliases(tmp_path):
+    write(tmp_path, "factory.js", "function make() {\n  const s = new Service();\n  return { s };\n}\nfunction use() {\n  return s;\n}\n")
+    project = NavigateTroughtProject().setProject(link=tmp_path)
+    index = DependencyIndex(project.classs)
+    assert index.dependenciesOf(project.classs[1]) == ["Service"]
+    index.removeClasses(project.classs)
+    assert index.aliases == {} and index.names == {}
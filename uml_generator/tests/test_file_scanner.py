@@ -0,0 +1,53 @@
+import json
+import sys
+from pathlib import Path
+
+from uml_generator.entities import Class, Project
+from uml_generator.file_scanner import FileScanner
+from uml_generator.parsers import parserFor
+
+DATA = Path(__file__).parent / "data"
+# Sortie du parcours Python d'avant les Query tree-sitter, sur les mêmes fichiers
+EXPECTED = json.loads((DATA / "extraction.json").read_text(encoding="utf-8"))
+
+
+def classData(classe:Class)->dict:
+    return {
+        "name": classe.name,
+        "type": classe.class_type,
+        "params": list(classe.params),
+        "retour": list(classe.retour),
+        "methods": [[method.name, list(method.params), list(method.retour)] for method in classe.method],
+        "instances": [[instance.name, instance.type] for instance in classe.instance],
+        "instanciations": dict(classe.instanciation_class),
+        "identifiers": sorted(set(classe.identifiers)),
+    }
+
+
+def scan(path:Path)->list[dict]:
+    project = FileScanner.fileScanner(link=path, project=Project(name='', classs=[], path=path), parser=parserFor(path.name))
+    return [classData(classe) for classe in project.classs]
+
+
+def test_extraction_matches_tree_walk():
+    assert sorted(EXPECTED) == ["shapes.ts", "store.js", "widget.tsx"]
+    for name, expected in EXPECTED.items():
+        assert scan(DATA / "extraction" / name) == expected, name
+
+
+def test_arrow_functions_and_instanciations():
+    store = {classe["name"]: classe for classe in scan(DATA / "extraction" / "store.js")}
+    assert store["handler"]["type"] == "arrow_function"
+    assert store["handler"]["params"] == ["event", "context"]
+    assert store["makeRepository"]["instanciations"] == {"orders": "OrderTable", "users": "UserTable"}
+    widget = {classe["name"]: classe for classe in scan(DATA / "extraction" / "widget.tsx")}
+    assert widget["Widget"]["type"] == "arrow_function"
+
+
+def test_deep_nesting_does_not_recurse(tmp_path):
+    # Plus profond que la limite de récursion : l'extraction passe par les Query, pas par un parcours récursif
+    depth = sys.getrecursionlimit() + 100
+    path = tmp_path / "deep.js"
+    path.write_text("class Deep {\n  run(a) {\n" + "if (a) {\n" * depth + "go(a);\n" + "}\n" * depth + "  }\n}\n")
+    [deep] = scan(path)
+    assert deep["methods"] == [["run", [], ["go"]]]
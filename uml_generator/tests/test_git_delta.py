@@ -0,0 +1,84 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from main import NavigateTroughtProject
+from uml_generator.git_delta import DeltaScanner, GitError
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(folder:Path, *args:str)->None:
+    subprocess.run(["git", "-C", str(folder), *args], check=True, capture_output=True)
+
+
+def write(folder:Path, name:str, text:str)->None:
+    path = folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def makeRepository(folder:Path)->None:
+    git(folder, "init", "-q")
+    git(folder, "config", "user.email", "test@example.com")
+    git(folder, "config", "user.name", "test")
+    write(folder, "src/store.ts", "export class Store {\n  get(key: string): Item { return new Item(key); }\n}\n")
+    write(folder, "src/item.ts", "export class Item {\n  constructor(key: string) {}\n}\n")
+    write(folder, "src/old.ts", "export class Old extends Store {}\n")
+    write(folder, "src/view.ts", "export class View {\n  render(store: Store) { return store; }\n}\n")
+    write(folder, "src/unrelated.ts", "export class Unrelated {}\n")
+    git(folder, "add", "-A")
+    git(folder, "commit", "-q", "-m", "initial")
+
+
+def runDelta(folder:Path, rev:str="HEAD"):
+    navigator = NavigateTroughtProject()
+    scanner = DeltaScanner(folder=folder, rev=rev, walker=navigator.walker(folder), scan=lambda files: navigator.scanFiles(files=files))
+    return scanner.run(), scanner.stats
+
+
+def test_added_removed_and_modified(tmp_path):
+    makeRepository(tmp_path)
+    # Modifiée : nouvelle méthode ; supprimée : Old ; ajoutées : une suivie, une non suivie
+    write(tmp_path, "src/item.ts", "export class Item {\n  constructor(key: string) {}\n  owner(): Store { return new Store(); }\n}\n")
+    (tmp_path / "src" / "old.ts").unlink()
+    write(tmp_path, "src/cache.ts", "export class Cache extends Store {}\n")
+    git(tmp_path, "add", "src/cache.ts")
+    write(tmp_path, "src/draft.ts", "export class Draft {\n  view: View;\n}\n")
+    delta, stats = runDelta(tmp_path)
+    assert sorted(classe.name for classe in delta.added) == ["Cache", "Draft"]
+    assert [classe.name for classe in delta.removed] == ["Old"]
+    assert [classe.name for classe in delta.modified] == ["Item"]
+    assert sorted(delta.addedEdges) == [("Cache", "Store"), ("Draft", "View"), ("Item", "Store")]
+    assert delta.removedEdges == [("Old", "Store")]
+    assert stats.changedFiles == 4
+    # Contexte : store.ts (définit Store, cite Item) et view.ts (définit View) ; unrelated.ts n'est pas lu
+    assert stats.contextFiles == 2
+    lines = list(delta.lines("demo", "HEAD"))
+    assert "Item --> Store : ajouté" in lines
+    assert "Old ..> Store : supprimé" in lines
+    assert not any("Unrelated" in line for line in lines)
+
+
+def test_unchanged_tree_has_empty_delta(tmp_path):
+    makeRepository(tmp_path)
+    delta, stats = runDelta(tmp_path)
+    assert (delta.added, delta.removed, delta.modified, delta.addedEdges, delta.removedEdges) == ([], [], [], [], [])
+    assert stats.changedFiles == 0
+
+
+def test_delta_against_older_revision(tmp_path):
+    makeRepository(tmp_path)
+    write(tmp_path, "src/view.ts", "export class View {\n  render(store: Store, item: Item) { return store; }\n}\n")
+    git(tmp_path, "commit", "-q", "-am", "view uses item")
+    delta, _ = runDelta(tmp_path, "HEAD~1")
+    assert [classe.name for classe in delta.modified] == ["View"]
+    assert delta.addedEdges == [("View", "Item")]
+
+
+def test_unknown_revision(tmp_path):
+    makeRepository(tmp_path)
+    with pytest.raises(GitError, match="unknown revision"):
+        runDelta(tmp_path, "no-such-branch")
@@ -0,0 +1,24 @@
+import pytest
+
+from uml_generator.mermaid import openOutput
+
+
+def test_output_is_replaced_on_success(tmp_path):
+    output = tmp_path / "diagram.mmd"
+    output.write_text("old")
+    with openOutput(output) as sink:
+        sink.write("classDiagram")
+        assert output.read_text() == "old"
+    assert output.read_text() == "classDiagram"
+    assert [path.name for path in tmp_path.iterdir()] == ["diagram.mmd"]
+
+
+def test_failed_write_keeps_previous_output(tmp_path):
+    output = tmp_path / "diagram.mmd"
+    output.write_text("old")
+    with pytest.raises(RuntimeError):
+        with openOutput(output) as sink:
+            sink.write("classDiagram")
+            raise RuntimeError("scan failed")
+    assert output.read_text() == "old"
+    assert [path.name for path in tmp_path.iterdir()] == ["diagram.mmd"]
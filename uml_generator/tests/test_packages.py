@@ -0,0 +1,97 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+from uml_generator.entities import Class, Project
+from uml_generator.packages import PackageWriter
+
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+ROOT = Path("/repo")
+
+
+def makeProject(classes:list[tuple[str, str, list[str]]])->Project:
+    # (chemin relatif, nom, dépendances)
+    classs = [
+        Class(class_type="class_declaration", path=ROOT / path, name=name, code=None, node=None, children=children)
+        for path, name, children in classes
+    ]
+    return Project(name="repo", classs=classs, path=ROOT)
+
+
+PROJECT = makeProject([
+    ("app/ui/button.ts", "Button", ["Store", "Store", "Theme"]),
+    ("app/ui/form.ts", "Form", ["Button", "Store", "Api"]),
+    ("app/state/store.ts", "Store", ["Api"]),
+    ("lib/api.ts", "Api", []),
+    ("lib/theme/theme.ts", "Theme", []),
+    ("main.ts", "Main", ["Form", "Api", "Missing"]),
+])
+
+
+def aggregate(depth:int, project:Project=PROJECT)->tuple[dict, dict]:
+    return PackageWriter(io.StringIO(), depth=depth).aggregate(project)
+
+
+def test_aggregation_levels():
+    sizes, weights = aggregate(1)
+    assert sizes == {".": 1, "app": 3, "lib": 2}
+    # Les liens internes à un dossier disparaissent, les autres sont sommés
+    assert weights == {(".", "app"): 1, (".", "lib"): 1, ("app", "lib"): 3}
+    sizes, weights = aggregate(2)
+    assert sizes == {".": 1, "app/state": 1, "app/ui": 2, "lib": 1, "lib/theme": 1}
+    assert weights == {
+        (".", "app/ui"): 1, (".", "lib"): 1,
+        ("app/state", "lib"): 1,
+        ("app/ui", "app/state"): 3, ("app/ui", "lib"): 1, ("app/ui", "lib/theme"): 1,
+    }
+
+
+def test_homonymous_classes_count_for_each_folder():
+    project = makeProject([
+        ("a/x.ts", "User", ["Config"]),
+        ("b/config.ts", "Config", []),
+        ("c/config.ts", "Config", []),
+    ])
+    assert aggregate(1, project)[1] == {("a", "b"): 1, ("a", "c"): 1}
+
+
+def test_min_weight_drops_thin_edges():
+    sink = io.StringIO()
+    writer = PackageWriter(sink, depth=1, minWeight=2)
+    writer.writeProject(PROJECT)
+    assert sink.getvalue().splitlines() == [
+        "flowchart LR",
+        '%% Vue par dossiers du projet "repo" (profondeur 1)',
+        'p0[".<br/>1 classes"]',
+        'p1["app<br/>3 classes"]',
+        'p2["lib<br/>2 classes"]',
+        "p1 -->|3| p2",
+    ]
+    assert (writer.classCount, writer.packageCount, writer.edgeCount, writer.dropped) == (6, 3, 1, 2)
+    assert writer.report() == "📦 Vue par dossiers : 3 dossiers, 1 liens (2 sous le seuil de 2)"
+
+
+def test_packages_with_focus_from_cli(tmp_path):
+    for name, content in {
+        "app/ui/button.ts": "export class Button { render(store: Store) { return new Store(); } }\n",
+        "app/state/store.ts": "export class Store { load(api: Api) { return new Api(); } }\n",
+        "lib/api.ts": "export class Api {}\n",
+        "lib/theme.ts": "export class Theme {}\n",
+    }.items():
+        path = tmp_path / "repo" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    output = tmp_path / "packages.mmd"
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "get_uml", str(tmp_path / "repo"), "--no-cache", "--no-daemon", "--output", str(output),
+         "--packages", "2", "--focus", "Button", "--direction", "dependencies", "--depth", "1"],
+        capture_output=True, cwd=tmp_path, text=True,
+    )
+    assert "analyse terminée" in completed.stdout, completed.stdout + completed.stderr
+    # Voisinage de Button seulement : ni Api ni Theme
+    assert output.read_text().splitlines()[2:] == [
+        'p0["app/state<br/>1 classes"]',
+        'p1["app/ui<br/>1 classes"]',
+        "p1 -->|1| p0",
+    ]
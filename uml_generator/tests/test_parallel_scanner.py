@@ -0,0 +1,27 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from uml_generator.synthetic_corpus import CorpusSpec, SyntheticCorpus
+
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+
+
+def diagram(folder:Path, output:Path, *options:str)->bytes:
+    # main() sort toujours avec le code 1 : on vérifie la fin de l'analyse
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "get_uml", str(folder), "--no-cache", "--no-daemon", "--output", str(output), *options],
+        capture_output=True, cwd=output.parent, text=True,
+    )
+    assert "analyse terminée" in completed.stdout, completed.stdout + completed.stderr
+    return output.read_bytes()
+
+
+def test_parallel_output_is_byte_identical(tmp_path):
+    corpus = tmp_path / "corpus"
+    SyntheticCorpus.generate(corpus, CorpusSpec(files=120, seed=7))
+    serial = diagram(corpus, tmp_path / "serial.mmd", "--readers", "0")
+    assert serial.count(b"\nclass ") > 100
+    assert diagram(corpus, tmp_path / "prefetch.mmd") == serial
+    assert diagram(corpus, tmp_path / "jobs2.mmd", "--jobs", "2") == serial
+    assert diagram(corpus, tmp_path / "jobs3.mmd", "--jobs", "3") == serial
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from uml_generator import parsers
+from uml_generator.parsers import ParserRegistry, grammarFor, isSupported
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def spyImports(monkeypatch)->list[str]:
+    imported = []
+    importModule = parsers.importlib.import_module
+    monkeypatch.setattr(parsers.importlib, "import_module", lambda name: imported.append(name) or importModule(name))
+    return imported
+
+
+def test_grammars_are_loaded_on_first_use(monkeypatch):
+    imported = spyImports(monkeypatch)
+    registry = ParserRegistry()
+    # Le filtrage du parcours ne charge rien
+    assert isSupported("src/a.ts") and isSupported("b.cjs") and not isSupported("c.py")
+    assert registry.parserFor("readme.md") is None
+    assert imported == [] and registry._languages == {}
+    first = registry.parserFor("src/a.ts")
+    assert registry.parserFor("src/b.mts") is first
+    assert list(registry._languages) == ["typescript"]
+    registry.parserFor("src/c.tsx")
+    registry.parserFor("d.jsx")
+    assert list(registry._languages) == ["typescript", "tsx", "javascript"]
+    assert imported == ["tree_sitter_typescript", "tree_sitter_typescript", "tree_sitter_javascript"]
+
+
+def test_extension_table():
+    assert [grammarFor(name) for name in ("a.ts", "a.d.ts", "a.tsx", "a.mjs", "dir.ts/a", ".ts", "a.", "a")] == [
+        "typescript", "typescript", "tsx", "javascript", None, None, None, None,
+    ]
+
+
+def test_parsers_are_per_thread_languages_are_shared():
+    registry = ParserRegistry()
+    mainParser = registry.parserFor("a.ts")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        threadParser = executor.submit(registry.parserFor, "b.ts").result()
+    assert threadParser is not mainParser
+    assert threadParser.language is mainParser.language
+    assert list(registry._languages) == ["typescript"]
+
+
+def test_typescript_project_does_not_import_javascript_grammar(tmp_path):
+    (tmp_path / "a.ts").write_text("export class A {}\n")
+    script = (
+        "import sys\nfrom pathlib import Path\nfrom main import NavigateTroughtProject\n"
+        f"NavigateTroughtProject().setProject(Path({str(tmp_path)!r}))\n"
+        "print(sorted(name for name in sys.modules if name in ('tree_sitter_javascript', 'tree_sitter_typescript')))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, cwd=ROOT, text=True)
+    assert completed.stdout.splitlines()[-1] == "['tree_sitter_typescript']", completed.stdout + completed.stderr
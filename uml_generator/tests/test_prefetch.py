@@ -0,0 +1,82 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from uml_generator import prefetch
+from uml_generator.parallel_scanner import ParallelScanner
+from uml_generator.prefetch import Prefetcher
+
+
+def test_results_keep_file_order_when_readers_finish_out_of_order():
+    files = [Path(f"f{index}.ts") for index in range(12)]
+
+    def load(path:Path)->bytes:
+        # Les premiers fichiers sont les plus lents à lire
+        time.sleep((12 - int(path.stem[1:])) * 0.005)
+        return path.name.encode()
+
+    results = [(path, future.result()) for path, future in Prefetcher(readers=4, depth=6, load=load).iterate(files)]
+    assert results == [(path, path.name.encode()) for path in files]
+
+
+def test_depth_bounds_reads_ahead():
+    depth = 3
+    lock = threading.Lock()
+    started = []
+    consumed = []
+    ahead = []
+
+    def load(path:Path)->bytes:
+        with lock:
+            started.append(path)
+            # Lectures demandées mais pas encore consommées par l'appelant
+            ahead.append(len(started) - len(consumed))
+        return b""
+
+    files = iter([Path(f"f{index}.ts") for index in range(20)])
+    pulled = []
+
+    def source():
+        for path in files:
+            pulled.append(path)
+            yield path
+
+    for path, future in Prefetcher(readers=2, depth=depth, load=load).iterate(source()):
+        future.result()
+        # La liste des fichiers n'est consommée que depth fichiers en avance
+        assert len(pulled) - len(consumed) <= depth + 1
+        time.sleep(0.001)
+        with lock:
+            consumed.append(path)
+    assert len(consumed) == 20
+    assert max(ahead) <= depth + 1
+
+
+def test_reader_errors_reach_the_caller(tmp_path):
+    good = tmp_path / "good.ts"
+    good.write_text("export class Good {}\n")
+    missing = tmp_path / "missing.ts"
+    iterator = Prefetcher(readers=2, depth=4).iterate([good, missing])
+    path, future = next(iterator)
+    assert path == good and future.result().startswith(b"export")
+    path, future = next(iterator)
+    assert path == missing
+    with pytest.raises(FileNotFoundError):
+        future.result()
+    # L'itérateur est abandonné sans close() : sa fermeture par le ramasse-miettes ne doit rien bloquer
+
+    # Et à travers le scanner : l'erreur n'est pas avalée
+    with pytest.raises(FileNotFoundError):
+        list(ParallelScanner.scanPrefetched(files=[good, missing]))
+
+
+def test_early_close_releases_pending_reads(monkeypatch):
+    closed = []
+    monkeypatch.setattr(prefetch, "closeSource", closed.append)
+    iterator = Prefetcher(readers=2, depth=4, load=lambda path: path.name.encode()).iterate([Path(f"f{index}.ts") for index in range(10)])
+    next(iterator)
+    iterator.close()
+    # Les lectures terminées mais jamais consommées sont libérées
+    assert 0 < len(closed) <= 4
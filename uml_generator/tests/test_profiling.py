@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+
+import pytest
+
+from uml_generator import profiling
+from uml_generator.parallel_scanner import ParallelScanner
+from uml_generator.profiling import ProfileEvent, Profiler
+
+
+def event(name:str, duration:float, path:str|None=None, **values)->ProfileEvent:
+    return ProfileEvent(name=name, start=0.0, duration=duration, pid=1, path=path, **values)
+
+
+def makeProfiler()->Profiler:
+    profiler = Profiler()
+    profiler.extend([
+        event("read", 0.001, "a.ts", bytes=2 * 1024 * 1024),
+        event("parse", 0.010, "a.ts"),
+        event("extract", 0.020, "a.ts", classes=3),
+        event("read", 0.050, "b.ts", bytes=1024 * 1024),
+        event("parse", 0.002, "b.ts"),
+        event("extract", 0.002, "b.ts", classes=1),
+        event("parse", 0.100, "c.ts"),
+        # Les sous-étapes d'extraction ne comptent pas dans le classement par fichier
+        event("query", 1.0, "b.ts"),
+        event("walk", 0.5),
+    ])
+    return profiler
+
+
+def test_stage_totals_and_summary():
+    profiler = makeProfiler()
+    totals = profiler.stageTotals()
+    assert totals["read"] == {"count": 2, "seconds": pytest.approx(0.051), "bytes": 3 * 1024 * 1024, "classes": 0}
+    assert (totals["extract"]["count"], totals["extract"]["classes"]) == (2, 4)
+    lines = profiler.summary(top=2)
+    # Étapes de la plus coûteuse à la moins coûteuse
+    assert [line.split()[0] for line in lines[1:6]] == ["query", "walk", "parse", "read", "extract"]
+    assert lines[4] == f"  {'read':<16} {51.0:10.1f} ms (2 appels, 3.00 Mo)"
+    assert lines[5] == f"  {'extract':<16} {22.0:10.1f} ms (2 appels, 4 classes)"
+    assert lines[6] == "🐢 2 fichiers les plus lents (parse + extraction) :"
+    assert lines[7].endswith("c.ts") and lines[8].endswith("a.ts")
+
+
+def test_slowest_files_rank_parse_and_extract():
+    slowest = makeProfiler().slowestFiles(top=10)
+    # b.ts est lent à lire, pas à analyser
+    assert [path for path, _ in slowest] == ["c.ts", "a.ts", "b.ts"]
+    assert slowest[1][1] == {"read": 0.001, "parse": 0.010, "extract": 0.020}
+    assert len(makeProfiler().slowestFiles(top=1)) == 1
+
+
+def test_hooks_and_drain():
+    profiler = Profiler()
+    seen = []
+    profiler.addHook(seen.append)
+    with profiler.span("parse", "a.ts") as span:
+        span.annotate(classes=2)
+    assert [(item.name, item.path, item.classes) for item in seen] == [("parse", "a.ts", 2)]
+    assert profiler.drain() == seen
+    assert profiler.events == []
+
+
+def test_worker_events_are_merged(tmp_path):
+    files = []
+    for index in range(6):
+        path = tmp_path / f"f{index}.ts"
+        path.write_text(f"export class C{index} {{ m() {{}} }}\n")
+        files.append(path)
+    profiler = profiling.enable()
+    try:
+        results = list(ParallelScanner.scanFiles(files, jobs=2, chunk=2))
+    finally:
+        profiling.disable()
+    assert len(results) == 6
+    parsed = [item for item in profiler.events if item.name == "parse"]
+    # Chaque fichier est mesuré dans un worker et rapatrié
+    assert sorted(item.path for item in parsed) == sorted(str(path) for path in files)
+    assert os.getpid() not in {item.pid for item in parsed}
+    assert sum(item.classes for item in profiler.events if item.name == "extract") == 6
+
+
+def test_chrome_trace_uses_thread_ids(tmp_path):
+    profiler = Profiler()
+    with profiler.span("walk"):
+        pass
+
+    def work():
+        with profiler.span("read", "a.ts") as span:
+            span.annotate(bytes=10)
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    output = tmp_path / "trace.json"
+    profiler.writeChromeTrace(output)
+    trace = json.loads(output.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    walk, read = trace["traceEvents"]
+    assert (walk["name"], walk["ph"], walk["pid"], walk["tid"]) == ("walk", "X", os.getpid(), threading.get_ident())
+    # Un fil par thread, pas un seul fil par processus
+    assert read["tid"] != walk["tid"]
+    assert read["args"] == {"path": "a.ts", "bytes": 10}
+    assert walk["args"] == {}
+    assert read["ts"] >= walk["ts"] >= 0 and read["dur"] >= 0
@@ -0,0 +1,43 @@
+import os
+import pickle
+
+import pytest
+
+from uml_generator.entities import Class, Method, Project
+from uml_generator.project_model import BINARY_MAGIC, ModelError, ProjectModel
+
+
+class Payload():
+    def __reduce__(self):
+        return (os.system, ("echo pwned",))
+
+
+def sampleProject(root)->Project:
+    classe = Class(
+        class_type="class", path=root / "src" / "a.ts", name="A", code=None, node=None,
+        method=[Method(name="run", params=["x: B"], retour=["B"])], instance=[], children=["B"],
+        params=[], retour=[], instanciation_class={}, span=(0, 10),
+    )
+    return Project(name="demo", classs=[classe], path=root)
+
+
+@pytest.mark.parametrize("name", ["model.json", "model.bin"])
+def test_round_trip(tmp_path, name):
+    ProjectModel.save(sampleProject(tmp_path), tmp_path / name)
+    loaded = ProjectModel.load(tmp_path / name)
+    assert [(classe.name, classe.path, classe.children, classe.method[0].params) for classe in loaded.classs] == [("A", tmp_path / "src" / "a.ts", ["B"], ["x: B"])]
+
+
+def test_binary_model_refuses_objects(tmp_path):
+    source = tmp_path / "model.bin"
+    source.write_bytes(BINARY_MAGIC + pickle.dumps({"format": "uml-project", "payload": Payload()}))
+    with pytest.raises(ModelError, match="posix.system|os.system|nt.system"):
+        ProjectModel.load(source)
+
+
+def test_truncated_binary_model(tmp_path):
+    source = tmp_path / "model.bin"
+    ProjectModel.save(sampleProject(tmp_path), source)
+    source.write_bytes(source.read_bytes()[:40])
+    with pytest.raises(ModelError):
+        ProjectModel.load(source)
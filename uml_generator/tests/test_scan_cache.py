@@ -0,0 +1,153 @@
+import builtins
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from main import NavigateTroughtProject
+from uml_generator import scan_cache, source_files
+from uml_generator.scan_cache import ScanCache
+from uml_generator.source_files import SourceLimits
+
+
+def scanNames(folder:Path, cacheFolder:Path, limits:SourceLimits)->list[str]:
+    navigator = NavigateTroughtProject(limits=limits)
+    with ScanCache(folder=cacheFolder) as cache:
+        results = list(navigator.scanFiles(files=navigator.projectFiles(folder), cache=cache))
+    return sorted(classe.name for result in results for classe in result.classs)
+
+
+def test_limits_invalidate_cache(tmp_path, monkeypatch):
+    source = tmp_path / "src"
+    (source / "generated").mkdir(parents=True)
+    (source / "app.ts").write_text("export class App {}\n")
+    # Reconnu comme généré au contenu seulement (commentaire de source map)
+    (source / "generated" / "injected.ts").write_text("export class Injected {}\n//# sourceMappingURL=injected.js.map\n")
+    cacheFolder = tmp_path / "cache"
+
+    keep = SourceLimits(skipGenerated=False)
+    monkeypatch.setattr(source_files, "_limits", keep)
+    assert scanNames(source, cacheFolder, keep) == ["App", "Injected"]
+
+    default = SourceLimits()
+    monkeypatch.setattr(source_files, "_limits", default)
+    assert scanNames(source, cacheFolder, default) == ["App"]
+
+
+def cachedScan(path:Path, cacheFolder:Path, **options)->tuple[list[str], int, int]:
+    # (classes, hits, misses) d'un scan d'un seul fichier avec le cache
+    jobs = options.pop("jobs", 1)
+    navigator = NavigateTroughtProject(**options)
+    with ScanCache(folder=cacheFolder) as cache:
+        results = list(navigator.scanFiles(files=[path], jobs=jobs, cache=cache))
+    return [classe.name for result in results for classe in result.classs], cache.hits, cache.misses
+
+
+def countOpens(monkeypatch, target:Path)->list:
+    # open() du lecteur de sources comme Path.read_bytes() passent par ici
+    opens = []
+    realOpen = builtins.open
+
+    def spy(file, *args, **kwargs):
+        if str(file) == str(target):
+            opens.append(file)
+        return realOpen(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", spy)
+    monkeypatch.setattr(io, "open", spy)
+    return opens
+
+
+@pytest.mark.parametrize("options", [{"readers": 0}, {}])
+def test_each_file_is_read_once(tmp_path, monkeypatch, options):
+    path = tmp_path / "a.ts"
+    path.write_text("export class A {}\n")
+    opens = countOpens(monkeypatch, path)
+    # Premier run : le hash est calculé sur les octets lus pour l'analyse
+    assert cachedScan(path, tmp_path / "cache", **options) == (["A"], 0, 1)
+    assert len(opens) == 1
+    assert cachedScan(path, tmp_path / "cache", **options) == (["A"], 1, 0)
+    assert len(opens) == 1
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cachedScan(path, tmp_path / "cache", **options) == (["A"], 1, 0)
+    assert len(opens) == 2
+
+
+def test_unchanged_file_is_a_hit(tmp_path):
+    path = tmp_path / "a.ts"
+    path.write_text("export class A {}\n")
+    assert cachedScan(path, tmp_path / "cache") == (["A"], 0, 1)
+    assert cachedScan(path, tmp_path / "cache") == (["A"], 1, 0)
+
+
+@pytest.mark.parametrize("options", [{"readers": 0}, {}, {"jobs": 2}])
+def test_touched_file_with_same_content_is_a_hit(tmp_path, options):
+    path = tmp_path / "a.ts"
+    path.write_text("export class A {}\n")
+    cachedScan(path, tmp_path / "cache", **options)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    # mtime différent, même contenu : le hash évite un nouveau parse
+    assert cachedScan(path, tmp_path / "cache", **options) == (["A"], 1, 0)
+    # Le nouveau mtime est enregistré : plus de hash au run suivant
+    assert cachedScan(path, tmp_path / "cache", **options) == (["A"], 1, 0)
+
+
+def test_skipped_files_are_cached(tmp_path, monkeypatch):
+    path = tmp_path / "bundle.ts"
+    path.write_text("export class Bundle {}\n//# sourceMappingURL=bundle.js.map\n")
+    opens = countOpens(monkeypatch, path)
+    for hits, misses in ((0, 1), (1, 0)):
+        navigator = NavigateTroughtProject()
+        with ScanCache(folder=tmp_path / "cache") as cache:
+            results = list(navigator.scanFiles(files=[path], cache=cache))
+        assert [result.skipped for result in results] == ["generated"]
+        assert (cache.hits, cache.misses) == (hits, misses)
+        # Le fichier écarté reste compté dans le rapport, même servi par le cache
+        assert navigator.skipped == {"generated": 1}
+    assert len(opens) == 1
+
+
+def test_content_change_is_a_miss(tmp_path):
+    path = tmp_path / "a.ts"
+    path.write_text("export class A {}\n")
+    cachedScan(path, tmp_path / "cache")
+    stat = path.stat()
+    # Même taille et même mtime : seul le contenu a changé
+    path.write_text("export class B {}\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cachedScan(path, tmp_path / "cache") == (["B"], 0, 1)
+    path.write_text("export class Longer {}\n")
+    assert cachedScan(path, tmp_path / "cache") == (["Longer"], 0, 1)
+
+
+def test_grammar_change_invalidates_cache(tmp_path, monkeypatch):
+    path = tmp_path / "a.ts"
+    path.write_text("export class A {}\n")
+    cachedScan(path, tmp_path / "cache")
+    monkeypatch.setattr(scan_cache, "SCANNER_VERSION", scan_cache.SCANNER_VERSION + 1)
+    assert cachedScan(path, tmp_path / "cache") == (["A"], 0, 1)
+    monkeypatch.setattr(scan_cache.metadata, "version", lambda package: "0.0.0-test")
+    assert cachedScan(path, tmp_path / "cache") == (["A"], 0, 1)
+    assert cachedScan(path, tmp_path / "cache") == (["A"], 1, 0)
+
+
+def test_hits_refresh_last_used_for_eviction(tmp_path):
+    paths = []
+    for name in ("A", "B", "C"):
+        path = tmp_path / f"{name}.ts"
+        path.write_text(f"export class {name} {{}}\n")
+        paths.append(path)
+    cacheFolder = tmp_path / "cache"
+    for path in paths:
+        cachedScan(path, cacheFolder)
+    # A, le plus ancien, vient d'être relu : B est évincé en premier
+    cachedScan(paths[0], cacheFolder)
+    with ScanCache(folder=cacheFolder) as cache:
+        sizes = cache._db.execute("SELECT payload_size FROM entries").fetchall()
+        cache.maxBytes = sum(size for size, in sizes) - 1
+        assert cache.evict() == 1
+        remaining = {Path(path).name for path, in cache._db.execute("SELECT path FROM entries")}
+    assert remaining == {"A.ts", "C.ts"}
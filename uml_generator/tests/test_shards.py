@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from uml_generator.entities import Class, Project
+from uml_generator.shards import INDEX_NAME, MANIFEST_NAME, ROOT_SHARD, ShardedOutput, shardFileName
+
+
+def test_shard_file_names_are_distinct():
+    shards = [ROOT_SHARD, "_root", "index", "a", "a/b", "a__b", "a_/b", "a/_b", "a_b", "src/app"]
+    names = [shardFileName(shard) for shard in shards]
+    assert len(set(names)) == len(names)
+    assert INDEX_NAME not in names
+    assert shardFileName("src/app") == "src__app.mmd"
+    assert shardFileName(ROOT_SHARD) == "_root.mmd"
+
+
+def classIn(root:Path, folder:str, name:str)->Class:
+    return Class(class_type="class", path=root / folder / f"{name}.ts", name=name, code=None, node=None, method=[], instance=[], children=[], params=[], retour=[], instanciation_class={}, span=(0, 0))
+
+
+def test_colliding_folders_get_their_own_shard(tmp_path):
+    root = tmp_path / "project"
+    project = Project(name="demo", classs=[classIn(root, "a/b", "Nested"), classIn(root, "a__b", "Flat")], path=root)
+    output = tmp_path / "shards"
+    stats = ShardedOutput(folder=output, depth=2, jobs=1).write(project)
+    assert stats.shards == stats.written == 2
+    files = sorted(path.name for path in output.iterdir() if path.name not in (INDEX_NAME, MANIFEST_NAME))
+    assert len(files) == 2
+    assert sorted("Nested" in (output / name).read_text() for name in files) == [False, True]
@@ -0,0 +1,116 @@
+import mmap
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from main import NavigateTroughtProject
+from uml_generator import source_files
+from uml_generator.parallel_scanner import ParallelScanner
+from uml_generator.parsers import parserFor
+from uml_generator.source_files import MMAP_THRESHOLD, SkippedSource, SourceLimits, loadSource, openSource, readSource
+
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+
+
+def makeTree(root:Path, files:dict[str, str])->None:
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def makeGeneratedTree(root:Path)->None:
+    makeTree(root, {
+        "src/app.ts": "export class App {}\n",
+        # Écartés au chemin, pendant le parcours
+        "src/vendor.min.js": "class Vendor {}\n",
+        "dist/out.js": "class Out {}\n",
+        "src/huge.ts": "export class Huge {}\n" + "// remplissage\n" * 600,
+        # Écartés au contenu, à la lecture
+        "src/bundle.js": "class Bundle {}\n//# sourceMappingURL=bundle.js.map\n",
+        "src/packed.js": "class Packed {}" + ";var x=1" * 1000 + "\n",
+    })
+
+
+def scanned(root:Path, limits:SourceLimits, monkeypatch)->tuple[NavigateTroughtProject, list[str]]:
+    # Réglage par processus, comme le fait main() à partir des options
+    monkeypatch.setattr(source_files, "_limits", limits)
+    navigator = NavigateTroughtProject(limits=limits)
+    project = navigator.setProject(root)
+    return navigator, sorted(classe.name for classe in project.classs)
+
+
+def test_generated_and_oversized_files_are_skipped_and_counted(tmp_path, monkeypatch):
+    makeGeneratedTree(tmp_path)
+    navigator, names = scanned(tmp_path, SourceLimits(maxBytes=8 * 1024), monkeypatch)
+    assert names == ["App"]
+    stats = navigator.walkStats
+    assert (stats.generatedFiles, stats.generatedDirectories, stats.oversizedFiles) == (1, 1, 1)
+    assert navigator.skipped == {"generated": 2}
+    assert navigator.skipReport() == "🧹 Non analysés : 3 fichiers minifiés/générés, 1 dossiers dist/build, 1 fichiers trop gros"
+
+
+def test_keep_generated_and_no_size_limit(tmp_path, monkeypatch):
+    makeGeneratedTree(tmp_path)
+    navigator, names = scanned(tmp_path, SourceLimits(maxBytes=None, skipGenerated=False), monkeypatch)
+    assert names == ["App", "Bundle", "Huge", "Out", "Packed", "Vendor"]
+    assert navigator.skipReport() is None
+
+
+def test_size_is_checked_again_at_read_time(tmp_path, monkeypatch):
+    # Fichier grossi entre le parcours et la lecture
+    path = tmp_path / "grown.ts"
+    path.write_text("export class Grown {}\n" * 100)
+    monkeypatch.setattr(source_files, "_limits", SourceLimits(maxBytes=1024))
+    with pytest.raises(SkippedSource) as skipped:
+        loadSource(path)
+    assert skipped.value.reason == "oversized"
+
+
+def test_skip_report_from_cli(tmp_path):
+    makeGeneratedTree(tmp_path / "repo")
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "get_uml", str(tmp_path / "repo"), "--no-cache", "--no-daemon", "--max-file-size", "8"],
+        capture_output=True, cwd=tmp_path, text=True,
+    )
+    assert "analyse terminée" in completed.stdout, completed.stdout + completed.stderr
+    assert "🧹 Non analysés : 3 fichiers minifiés/générés, 1 dossiers dist/build, 1 fichiers trop gros" in completed.stdout
+
+
+def writeLargeSource(path:Path)->None:
+    classes = "".join(f"export class Big{index} extends Big{index - 1} {{\n  run(input: Input{index}): Output{index} {{ return new Helper{index}(input); }}\n}}\n" for index in range(1, 4000))
+    path.write_text(classes)
+    assert path.stat().st_size >= MMAP_THRESHOLD
+
+
+def test_large_files_are_memory_mapped(tmp_path):
+    large = tmp_path / "large.ts"
+    writeLargeSource(large)
+    small = tmp_path / "small.ts"
+    small.write_text("export class Small {}\n")
+    with openSource(large) as code:
+        assert isinstance(code, mmap.mmap)
+        assert code[:12] == b"export class"
+        mapped = code
+    # Le mmap est libéré à la sortie du bloc
+    assert mapped.closed
+    with openSource(small) as code:
+        assert isinstance(code, bytes)
+    # readSource rend des bytes qui survivent au mmap
+    assert readSource(large) == large.read_bytes()
+
+
+def test_mapped_and_copied_reads_extract_the_same_classes(tmp_path, monkeypatch):
+    large = tmp_path / "large.ts"
+    writeLargeSource(large)
+
+    def extraction()->list:
+        result = ParallelScanner.scanFile(link=large, parser=parserFor(large.name))
+        return [(classe.name, tuple(method.name for method in classe.method)) for classe in result.classs]
+
+    mapped = extraction()
+    monkeypatch.setattr(source_files, "MMAP_THRESHOLD", 1 << 40)
+    assert extraction() == mapped
+    assert len(mapped) == 3999 and mapped[-1] == ("Big3999", ("run",))
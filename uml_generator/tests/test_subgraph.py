@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from uml_generator.entities import Class, Project
+from uml_generator.subgraph import Focus
+
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+ROOT = Path("/repo")
+
+
+def makeProject(classes:dict[str, tuple[str, list[str]]])->Project:
+    # nom -> (chemin relatif, dépendances)
+    classs = [
+        Class(class_type="class_declaration", path=ROOT / path, name=name, code=None, node=None, children=children)
+        for name, (path, children) in classes.items()
+    ]
+    return Project(name="repo", classs=classs, path=ROOT)
+
+
+# A -> B -> C -> D, E -> B ; F isolée
+CHAIN = makeProject({
+    "A": ("src/pkg0/a.ts", ["B"]),
+    "B": ("src/pkg0/b.ts", ["C"]),
+    "C": ("src/pkg1/c.ts", ["D"]),
+    "D": ("src/pkg1/deep/d.ts", []),
+    "E": ("lib/e.ts", ["B"]),
+    "F": ("lib/pkg0.ts", []),
+})
+
+
+def focused(*patterns:str, depth:int=1, direction:str="both")->list[str]:
+    return [classe.name for classe in Focus(patterns=patterns, depth=depth, direction=direction).apply(CHAIN).classs]
+
+
+def test_depth_bounds_the_search():
+    assert focused("B", depth=0) == ["B"]
+    assert focused("B", depth=1) == ["A", "B", "C", "E"]
+    assert focused("B", depth=2) == ["A", "B", "C", "D", "E"]
+    assert focused("A", depth=2, direction="dependencies") == ["A", "B", "C"]
+
+
+def test_directions():
+    assert focused("B", direction="dependencies") == ["B", "C"]
+    assert focused("B", direction="dependents") == ["A", "B", "E"]
+    assert focused("C", depth=5, direction="dependents") == ["A", "B", "C", "E"]
+
+
+def test_kept_links_stay_inside_the_subgraph():
+    children = {classe.name: classe.children for classe in Focus(patterns=("B",), depth=0).apply(CHAIN).classs}
+    assert children == {"B": []}
+
+
+def test_name_and_glob_seeds():
+    # Un nom de classe, un glob de fichiers, ou les deux
+    assert focused("D", depth=0) == ["D"]
+    assert focused("src/pkg1/*.ts", depth=0) == ["C"]
+    assert focused("**/d.ts", "E", depth=0) == ["D", "E"]
+    assert focused("Missing", depth=3) == []
+
+
+def test_directory_seeds():
+    assert focused("src/pkg0/", depth=0) == ["A", "B"]
+    assert focused("src/pkg1", depth=0) == ["C", "D"]
+    # Sans "/", le motif vise un dossier de ce nom à toute profondeur, pas lib/pkg0.ts
+    assert focused("pkg0", depth=0) == ["A", "B"]
+    assert focused("deep/", depth=0) == ["D"]
+    assert focused("src/", "!src/pkg1/deep/", depth=0) == ["A", "B", "C"]
+
+
+def test_negative_depth_is_rejected(tmp_path):
+    (tmp_path / "a.ts").write_text("export class A {}\n")
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "get_uml", str(tmp_path), "--no-cache", "--no-daemon", "--focus", "A", "--depth", "-1"],
+        capture_output=True, cwd=tmp_path, text=True,
+    )
+    assert "--depth must not be negative" in completed.stdout
+    assert "analyse terminée" not in completed.stdout
@@ -0,0 +1,42 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from uml_generator.synthetic_corpus import CorpusSpec, SyntheticCorpus
+
+MAIN = Path(__file__).resolve().parents[2] / "main.py"
+IMPORT = re.compile(r"from '([^']+)';")
+
+
+def test_imports_resolve_to_generated_files(tmp_path):
+    SyntheticCorpus.generate(tmp_path, CorpusSpec(files=120, seed=3))
+    files = {path.with_suffix("") for path in tmp_path.rglob("*.*")}
+    imports = 0
+    for path in tmp_path.rglob("*.*"):
+        for target in IMPORT.findall(path.read_text()):
+            assert (path.parent / target).resolve() in files, f"{path.name} -> {target}"
+            imports += 1
+    assert imports > 0
+
+
+def test_spec_bounds():
+    with pytest.raises(ValueError, match="--classes-per-file must be at least 1"):
+        CorpusSpec(classesPerFile=0)
+    with pytest.raises(ValueError, match="--files must be at least 1"):
+        CorpusSpec(files=0)
+    with pytest.raises(ValueError, match="--fan-out must be at least 0"):
+        CorpusSpec(fanOut=-1)
+    CorpusSpec(methodsPerClass=0, fanOut=0)
+
+
+def test_invalid_cli_options_are_rejected(tmp_path):
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "bench", str(tmp_path / "corpus"), "--generate", "--classes-per-file", "0"],
+        capture_output=True, cwd=tmp_path, text=True,
+    )
+    assert "--classes-per-file must be at least 1" in completed.stdout, completed.stdout + completed.stderr
+    assert "Traceback" not in completed.stderr
+    assert not (tmp_path / "corpus").exists()
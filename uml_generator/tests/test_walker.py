@@ -0,0 +1,100 @@
+from pathlib import Path
+
+from uml_generator.walker import IgnoreRules, ProjectWalker, globToRegex
+
+
+def makeTree(root:Path, files:dict[str, str])->None:
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def walked(root:Path, **options)->list[str]:
+    return sorted(path.relative_to(root).as_posix() for path in ProjectWalker(root, **options).walk())
+
+
+def test_nested_ignore_files_and_negation(tmp_path):
+    makeTree(tmp_path, {
+        ".gitignore": "*.gen.ts\n!keep.gen.ts\n/top.ts\nout/\n",
+        "top.ts": "",
+        "app.ts": "",
+        "a.gen.ts": "",
+        "keep.gen.ts": "",
+        "out/bundle.ts": "",
+        "sub/.gitignore": "local/\n!a.gen.ts\nnested/x.ts\n",
+        "sub/top.ts": "",
+        "sub/a.gen.ts": "",
+        "sub/b.gen.ts": "",
+        "sub/local/l.ts": "",
+        "sub/nested/x.ts": "",
+        "sub/nested/y.ts": "",
+        "sub/deeper/nested/x.ts": "",
+        "other/local/l.ts": "",
+    })
+    assert walked(tmp_path) == [
+        "app.ts",
+        "keep.gen.ts",
+        "other/local/l.ts",
+        # "/top.ts" est ancré au dossier du .gitignore racine
+        "sub/a.gen.ts",
+        "sub/deeper/nested/x.ts",
+        "sub/nested/y.ts",
+        "sub/top.ts",
+    ]
+    assert "a.gen.ts" in walked(tmp_path, useIgnoreFiles=False)
+
+
+def test_glob_semantics():
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["**/deep/*.ts"]).decide("a/b/deep/x.ts", False)
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["**/deep/*.ts"]).decide("deep/x.ts", False)
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["**/deep/*.ts"]).decide("deep/sub/x.ts", False) is None
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["src/**"]).decide("src/a/b.ts", False)
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["[ab].ts"]).decide("x/a.ts", False)
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["[!ab].ts"]).decide("a.ts", False) is None
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["?.ts"]).decide("ab.ts", False) is None
+    # Un motif terminé par "/" ne vise que les dossiers
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["build/"]).decide("build", False) is None
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["build/"]).decide("build", True)
+    # La dernière règle qui correspond l'emporte
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["*.ts", "!a.ts"]).decide("a.ts", False) is False
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["!a.ts", "*.ts"]).decide("a.ts", False) is True
+    assert IgnoreRules.fromPatterns(base="/r", patterns=["src/*.ts"]).decidePath("/r/src/a.ts", False)
+    assert globToRegex("*.ts") == r"[^/]*\.ts"
+
+
+def test_include_exclude_and_defaults(tmp_path):
+    makeTree(tmp_path, {
+        "src/a.ts": "",
+        "src/a.test.ts": "",
+        "src/__tests__/b.ts": "",
+        "src/legacy/c.js": "",
+        "lib/d.ts": "",
+        "node_modules/pkg/e.ts": "",
+        "dist/f.js": "",
+        "src/g.min.js": "",
+        "notes.md": "",
+    })
+    assert walked(tmp_path) == ["lib/d.ts", "src/a.ts", "src/legacy/c.js"]
+    assert walked(tmp_path, defaultExcludes=False) == ["lib/d.ts", "src/__tests__/b.ts", "src/a.test.ts", "src/a.ts", "src/legacy/c.js"]
+    assert walked(tmp_path, include=["src/**"], exclude=["legacy/"]) == ["src/a.ts"]
+    assert walked(tmp_path, skipGenerated=False) == ["dist/f.js", "lib/d.ts", "src/a.ts", "src/g.min.js", "src/legacy/c.js"]
+
+
+def test_accepts_matches_walk(tmp_path):
+    makeTree(tmp_path, {
+        ".gitignore": "ignored/\n",
+        "src/a.ts": "",
+        "src/a.spec.ts": "",
+        "src/dist/b.js": "",
+        "ignored/c.ts": "",
+        "deep/er/d.tsx": "",
+        "readme.md": "",
+    })
+    walker = ProjectWalker(tmp_path, exclude=["deep/er/"])
+    files = set(walker.walk())
+    assert files == {tmp_path / "src" / "a.ts"}
+    for path in tmp_path.rglob("*"):
+        if path.is_file() and path.parent.name != "ignored":
+            # accepts() laisse les .gitignore à git, le reste doit concorder
+            assert walker.accepts(path) == (path in files), path
@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+
+from main import NavigateTroughtProject
+from uml_generator import watcher as watcherModule
+from uml_generator.mermaid import MermaidFragments, iterMermaid, writeMermaidFile
+from uml_generator.watcher import ProjectWatcher
+
+
+def write(path:Path, text:str)->None:
+    # mtime avancé explicitement : deux écritures rapprochées peuvent garder le même
+    existed = path.exists()
+    mtime = path.stat().st_mtime_ns if existed else 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    if existed:
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def fullScan(root:Path)->str:
+    return "".join(iterMermaid(NavigateTroughtProject().setProject(link=root)))
+
+
+def startWatcher(root:Path)->ProjectWatcher:
+    navigator = NavigateTroughtProject()
+    results = list(navigator.scanFiles(files=navigator.projectFiles(root)))
+    return ProjectWatcher(walker=navigator.walker(root), results=results, render=lambda project: None)
+
+
+def update(watcher:ProjectWatcher)->list[Path]:
+    changed = watcher.poll()
+    watcher.applyChanges(changed)
+    return changed
+
+
+def makeProject(root:Path)->None:
+    write(root / "src" / "store.ts", "export class Store {\n  get(key: string): Item { return new Item(key); }\n}\n")
+    write(root / "src" / "item.ts", "export class Item {\n  constructor(key: string) {}\n}\n")
+    write(root / "src" / "view.ts", "export class View extends Store {\n  render(store: Store) { return Helper.format(store); }\n}\n")
+    write(root / "lib" / "helper.js", "class Helper {\n  static format(value) { return String(value); }\n}\nmodule.exports = Helper;\n")
+
+
+def test_edits_match_full_rescan(tmp_path):
+    makeProject(tmp_path)
+    watcher = startWatcher(tmp_path)
+    assert "".join(iterMermaid(watcher.project())) == fullScan(tmp_path)
+    # Nouvelle méthode et nouvelle dépendance
+    write(tmp_path / "src" / "item.ts", "export class Item {\n  constructor(key: string) {}\n  owner(): Store { return new Store(); }\n}\n")
+    # Classe renommée dans un fichier : les références à l'ancien nom tombent
+    write(tmp_path / "lib" / "helper.js", "class Formatter {\n  static format(value) { return String(value); }\n}\nmodule.exports = Formatter;\n")
+    assert sorted(update(watcher)) == [tmp_path / "lib" / "helper.js", tmp_path / "src" / "item.ts"]
+    assert "".join(iterMermaid(watcher.project())) == fullScan(tmp_path)
+
+
+def test_deletions_and_new_files_match_full_rescan(tmp_path):
+    makeProject(tmp_path)
+    watcher = startWatcher(tmp_path)
+    (tmp_path / "src" / "item.ts").unlink()
+    write(tmp_path / "src" / "cache.ts", "export class Cache extends Store {}\n")
+    update(watcher)
+    assert "Item" not in {classe.name for classe in watcher.project().classs}
+    assert "".join(iterMermaid(watcher.project())) == fullScan(tmp_path)
+    # Le symbole supprimé réapparaît ailleurs : les fichiers qui le citent sont re-résolus
+    write(tmp_path / "lib" / "item.js", "class Item {}\n")
+    update(watcher)
+    assert "".join(iterMermaid(watcher.project())) == fullScan(tmp_path)
+
+
+def test_renames_match_full_rescan(tmp_path):
+    makeProject(tmp_path)
+    watcher = startWatcher(tmp_path)
+    os.rename(tmp_path / "src" / "view.ts", tmp_path / "lib" / "view.ts")
+    os.rename(tmp_path / "src" / "store.ts", tmp_path / "src" / "stores.ts")
+    assert len(update(watcher)) == 4
+    assert "".join(iterMermaid(watcher.project())) == fullScan(tmp_path)
+    assert update(watcher) == []
+
+
+def test_file_removed_during_walk_is_a_deletion(tmp_path, monkeypatch):
+    makeProject(tmp_path)
+    watcher = startWatcher(tmp_path)
+    # Sauvegarde atomique : le fichier listé par scandir a disparu au moment du stat
+    entries = [entry for folder in ("src", "lib") for entry in os.scandir(tmp_path / folder)]
+    (tmp_path / "src" / "item.ts").unlink()
+    monkeypatch.setattr(watcher.walker, "walkEntries", lambda: iter(entries))
+    assert update(watcher) == [tmp_path / "src" / "item.ts"]
+    assert "Item" not in {classe.name for classe in watcher.project().classs}
+
+
+def test_settled_tree_is_not_walked_again(tmp_path, monkeypatch):
+    makeProject(tmp_path)
+    (tmp_path / ".gitignore").write_text("*.gen.ts\n")
+    # Sans fenêtre de précaution : seuls les mtimes décident d'un nouveau parcours
+    monkeypatch.setattr(watcherModule, "RACY_NS", 0)
+    watcher = startWatcher(tmp_path)
+    walk = watcher.walker.walkEntries
+    walks = []
+    monkeypatch.setattr(watcher.walker, "walkEntries", lambda: walks.append(1) or walk())
+    write(tmp_path / "src" / "item.ts", "export class Item {\n  owner(): Store { return new Store(); }\n}\n")
+    assert update(watcher) == [tmp_path / "src" / "item.ts"]
+    assert walks == []
+    # Nouveau fichier : le mtime du dossier change
+    write(tmp_path / "src" / "cache.ts", "export class Cache extends Store {}\n")
+    folder = (tmp_path / "src").stat().st_mtime_ns
+    os.utime(tmp_path / "src", ns=(folder + 10**9, folder + 10**9))
+    assert update(watcher) == [tmp_path / "src" / "cache.ts"]
+    assert walks == [1]
+    # .gitignore modifié sur place : même dossier, autres fichiers retenus
+    write(tmp_path / ".gitignore", "*.gen.ts\ncache.ts\n")
+    assert update(watcher) == [tmp_path / "src" / "cache.ts"]
+    assert "".join(iterMermaid(watcher.project())) == fullScan(tmp_path)
+
+
+def test_fragments_match_full_render(tmp_path):
+    makeProject(tmp_path)
+    watcher = startWatcher(tmp_path)
+    fragments = MermaidFragments()
+    writeMermaidFile(watcher.project(), tmp_path / "reused.mmd", fragments)
+    write(tmp_path / "lib" / "helper.js", "class Formatter {\n  static format(value) { return String(value); }\n}\nmodule.exports = Formatter;\n")
+    write(tmp_path / "src" / "extra.ts", "export class Extra extends View {}\n")
+    update(watcher)
+    writeMermaidFile(watcher.project(), tmp_path / "reused.mmd", fragments)
+    writeMermaidFile(watcher.project(), tmp_path / "full.mmd")
+    assert (tmp_path / "reused.mmd").read_text() == (tmp_path / "full.mmd").read_text() == fullScan(tmp_path)
@@ -0,0 +1,123 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from main import NavigateTroughtProject
+from uml_generator.parallel_scanner import ParallelScanner
+from uml_generator.parsers import parserFor
+from uml_generator.queries import queriesFor
+from uml_generator.workspace import ROOT_PACKAGE, Workspace, WorkspaceScanner, cacheName
+
+
+def writeSources(folder:Path, count:int)->list[Path]:
+    # Des fichiers de tailles différentes : une plage d'octets d'un autre fichier change les captures
+    files = []
+    for index in range(count):
+        classes = "".join(
+            f"export class C{index}_{position} extends C{index}_{position - 1} {{\n"
+            + "".join(f"  m{method}(p{method}: T{method}): R{index} {{ return helper{method}(p{method}); }}\n" for method in range(position + 1))
+            + "}\n"
+            for position in range(1, index % 7 + 2)
+        )
+        path = folder / f"f{index}.ts"
+        path.write_text(classes)
+        files.append(path)
+    return files
+
+
+def extraction(link:Path)->list:
+    result = ParallelScanner.scanFile(link=link, parser=parserFor(link.name))
+    return [(classe.name, tuple(classe.identifiers), tuple(method.name for method in classe.method)) for classe in result.classs]
+
+
+def test_queries_are_per_thread():
+    mainQueries = queriesFor("typescript")
+    assert queriesFor("typescript") is mainQueries
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        threadQueries = executor.submit(queriesFor, "typescript").result()
+    assert threadQueries[0] is not mainQueries[0]
+    assert threadQueries[1] is not mainQueries[1]
+
+
+def test_threaded_extraction_matches_serial(tmp_path):
+    files = writeSources(tmp_path, 40)
+    serial = [extraction(path) for path in files]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        threaded = list(executor.map(extraction, files * 5))
+    assert threaded == serial * 5
+
+
+def makePackage(folder:Path, name:str, dependencies:dict|None=None, files:dict|None=None)->None:
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "package.json").write_text(json.dumps({"name": name, "dependencies": dependencies or {}}))
+    for fileName, content in (files or {}).items():
+        (folder / fileName).write_text(content)
+
+
+def makeMonorepo(root:Path)->None:
+    (root / "package.json").write_text(json.dumps({"workspaces": ["packages/*", "apps/**", "!packages/ignored"]}))
+    makePackage(root / "packages" / "core", "@demo/core", files={"core.ts": "export class Core {}\n"})
+    makePackage(root / "packages" / "ui", "@demo/ui", {"@demo/core": "*", "left-pad": "*"}, {"ui.ts": "export class Ui extends Core {}\n"})
+    makePackage(root / "packages" / "ignored", "@demo/ignored")
+    # Pas de dépendance déclarée : pas de lien vers Core
+    makePackage(root / "apps" / "web", "web", files={"web.ts": "export class Web extends Core {}\n"})
+    makePackage(root / "apps" / "web" / "plugins" / "chart", "chart", {"@demo/ui": "*"}, {"chart.ts": "export class Chart extends Ui {}\n"})
+    (root / "scripts").mkdir()
+    (root / "scripts" / "build.ts").write_text("export class Build {}\n")
+
+
+def test_discover_packages(tmp_path):
+    makeMonorepo(tmp_path)
+    packages = {package.path.relative_to(tmp_path).as_posix(): package for package in Workspace.discover(tmp_path)}
+    assert sorted(packages) == ["apps/web", "apps/web/plugins/chart", "packages/core", "packages/ui"]
+    assert packages["packages/ui"].name == "@demo/ui"
+    assert packages["packages/ui"].dependencies == ("@demo/core",)
+    assert packages["apps/web"].nested == ("plugins/chart",)
+
+
+def test_discover_pnpm_workspace(tmp_path):
+    (tmp_path / "pnpm-workspace.yaml").write_text("packages:\n  - 'libs/*'\n  - '!libs/skip'\n# fin\n")
+    makePackage(tmp_path / "libs" / "one", "one")
+    makePackage(tmp_path / "libs" / "skip", "skip")
+    assert [package.name for package in Workspace.discover(tmp_path)] == ["one"]
+
+
+def scanWorkspace(root:Path, cacheFolder:Path, jobs:int=1)->WorkspaceScanner:
+    scanner = WorkspaceScanner(root=root, packages=Workspace.discover(root), navigator=NavigateTroughtProject(), jobs=jobs, cacheFolder=cacheFolder)
+    scanner.scan()
+    return scanner
+
+
+def test_packages_are_linked_through_declared_dependencies(tmp_path):
+    makeMonorepo(tmp_path)
+    scanner = scanWorkspace(tmp_path, tmp_path / ".uml_cache")
+    children = {classe.name: classe.children for classe in scanner.resolve().classs}
+    assert children == {"Build": [], "Core": [], "Ui": ["Core"], "Web": [], "Chart": ["Ui"]}
+
+
+def test_per_package_cache(tmp_path):
+    makeMonorepo(tmp_path)
+    cacheFolder = tmp_path / ".uml_cache"
+    first = scanWorkspace(tmp_path, cacheFolder)
+    assert all(scan.hits == 0 for scan in first.scans.values())
+    (tmp_path / "packages" / "ui" / "ui.ts").write_text("export class Ui extends Core { render() {} }\n")
+    second = scanWorkspace(tmp_path, cacheFolder)
+    counts = {path.relative_to(tmp_path).as_posix(): (scan.hits, scan.misses) for path, scan in second.scans.items()}
+    # Seul le paquet modifié est ré-analysé ; les paquets imbriqués ne sont vus qu'une fois
+    assert counts == {".": (1, 0), "packages/core": (1, 0), "packages/ui": (0, 1), "apps/web": (1, 0), "apps/web/plugins/chart": (1, 0)}
+    assert sorted(folder.name for folder in cacheFolder.iterdir()) == sorted(cacheName(tmp_path, package) for package in second.packages)
+
+
+def test_homonymous_packages_have_separate_caches(tmp_path):
+    (tmp_path / "package.json").write_text(json.dumps({"workspaces": ["a/*", "b/*"]}))
+    makePackage(tmp_path / "a" / "utils", "utils", files={"a.ts": "export class A {}\n"})
+    makePackage(tmp_path / "b" / "utils", "utils", files={"b.ts": "export class B {}\n"})
+    packages = Workspace.discover(tmp_path)
+    names = [cacheName(tmp_path, package) for package in packages]
+    assert len(set(names)) == len(names) == 2
+    assert cacheName(tmp_path, Workspace.rootPackage(tmp_path, packages)) == ROOT_PACKAGE
+    scanWorkspace(tmp_path, tmp_path / ".uml_cache")
+    second = scanWorkspace(tmp_path, tmp_path / ".uml_cache")
+    assert {path.name for path in second.scans} == {"utils", tmp_path.name}
+    assert sorted(classe.name for classe in second.resolve().classs) == ["A", "B"]
+    assert all(scan.misses == 0 for scan in second.scans.values())
@@ -0,0 +1,254 @@
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from uml_generator.parsers import isSupported
+
+IGNORE_FILES = (".gitignore", ".umlignore")
+# Dossiers jamais parcourus, élagués avant d'y descendre
+PRUNED_DIRECTORIES = ("node_modules", ".git", ".hg", ".svn", ".uml_cache")
+# Remplace l'ancien filtre "'test' in fileName", trop large
+DEFAULT_EXCLUDES = ("*.test.*", "*.spec.*", "__tests__/", "__mocks__/")
+# Fichiers minifiés/générés reconnus au chemin ; le contenu est vérifié à la lecture (source_files)
+GENERATED_PATTERNS = ("*.min.*", "*.bundle.*", "dist/", "build/")
+
+
+def globToRegex(pattern:str)->str:
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                content = pattern[index + 1:end]
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                regex += f"[{content}]"
+                index = end
+        else:
+            regex += re.escape(char)
+        index += 1
+    return regex
+
+
+@dataclass(frozen=True, slots=True)
+class IgnoreRule():
+    regex: re.Pattern
+    negated: bool
+    directoryOnly: bool
+
+    @classmethod
+    def parse(cls, line:str)->'IgnoreRule|None':
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            return None
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        directoryOnly = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+        # Avec un "/" au début ou au milieu, le motif est relatif au dossier du fichier
+        anchored = "/" in line
+        line = line.lstrip("/")
+        prefix = "" if anchored else "(?:.*/)?"
+        return cls(regex=re.compile(f"^{prefix}{globToRegex(line)}$"), negated=negated, directoryOnly=directoryOnly)
+
+    def matches(self, relative:str, isDirectory:bool)->bool:
+        if self.directoryOnly and not isDirectory:
+            return False
+        return self.regex.match(relative) is not None
+
+
+class IgnoreRules():
+    """Règles type .gitignore, rattachées au dossier qui les déclare."""
+
+    def __init__(self, base:str, rules:List[IgnoreRule]):
+        self.base = base
+        self.rules = rules
+        # Toutes les règles en une regex : la plupart des chemins ne correspondent à aucune
+        self.anyRule = re.compile("|".join(f"(?:{rule.regex.pattern})" for rule in rules)) if rules else None
+
+    @classmethod
+    def fromPatterns(cls, base:str, patterns:Iterable[str])->'IgnoreRules':
+        rules = [rule for rule in (IgnoreRule.parse(pattern) for pattern in patterns) if rule]
+        return cls(base=base, rules=rules)
+
+    @classmethod
+    def fromFolder(cls, folder:str)->'IgnoreRules|None':
+        patterns = []
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(folder, name), encoding="utf-8", errors="replace") as file:
+                    patterns.extend(file.readlines())
+            except OSError:
+                continue
+        if not patterns:
+            return None
+        return cls.fromPatterns(base=folder, patterns=patterns)
+
+    def decide(self, relative:str, isDirectory:bool)->bool|None:
+        # relative : chemin relatif à base, en "/". La dernière règle qui correspond l'emporte (comme git)
+        if self.anyRule is None or self.anyRule.match(relative) is None:
+            return None
+        for rule in reversed(self.rules):
+            if rule.matches(relative, isDirectory):
+                return not rule.negated
+        return None
+
+    def decidePath(self, path:str, isDirectory:bool)->bool|None:
+        # Chemin isolé : un relpath par appel, à éviter dans le parcours
+        return self.decide(os.path.relpath(path, self.base).replace(os.sep, "/"), isDirectory)
+
+
+@dataclass(slots=True)
+class WalkStats():
+    visitedDirectories: int = 0
+    prunedDirectories: int = 0
+    sourceFiles: int = 0
+    skippedFiles: int = 0
+    generatedDirectories: int = 0
+    generatedFiles: int = 0
+    oversizedFiles: int = 0
+
+    def report(self)->str:
+        return (
+            f"📂 Parcours : {self.visitedDirectories} dossiers visités, {self.prunedDirectories} élagués, "
+            f"{self.sourceFiles} fichiers source, {self.skippedFiles} fichiers ignorés"
+        )
+
+
+class ProjectWalker():
+    """Parcours os.scandir qui élague les dossiers ignorés avant d'y descendre.
+
+    L'ordre de sortie est celui d'os.walk (fichiers d'un dossier, puis ses
+    sous-dossiers), pour que le diagramme reste stable d'un run à l'autre.
+    Les règles reçoivent des chemins relatifs construits par concaténation
+    pendant la descente : aucun os.path.relpath par entrée.
+    """
+
+    def __init__(self, root:Path, include:Iterable[str]=(), exclude:Iterable[str]=(), useIgnoreFiles:bool=True, defaultExcludes:bool=True, skipGenerated:bool=True, maxFileBytes:int|None=None):
+        self.root = str(root)
+        self.useIgnoreFiles = useIgnoreFiles
+        excludes = list(exclude) + (list(DEFAULT_EXCLUDES) if defaultExcludes else [])
+        self.excludes = IgnoreRules.fromPatterns(base=self.root, patterns=excludes)
+        self.includes = IgnoreRules.fromPatterns(base=self.root, patterns=include)
+        self.generated = IgnoreRules.fromPatterns(base=self.root, patterns=GENERATED_PATTERNS if skipGenerated else ())
+        self.maxFileBytes = maxFileBytes
+        self.stats = WalkStats()
+        # Dossiers parcourus par le dernier walkEntries (mode watch)
+        self.folders: List[str] = []
+
+    def isIgnored(self, relative:str, isDirectory:bool, rules:List[Tuple[int, IgnoreRules]])->bool:
+        # relative : chemin relatif à la racine ; chaque jeu de règles en garde la fin,
+        # à partir de la position de son propre dossier
+        if isDirectory and relative.rpartition("/")[2] in PRUNED_DIRECTORIES:
+            return True
+        ignored = False
+        for offset, ruleSet in rules:
+            decision = ruleSet.decide(relative[offset:], isDirectory)
+            if decision is not None:
+                ignored = decision
+        if self.excludes.decide(relative, isDirectory):
+            return True
+        return ignored
+
+    def isGenerated(self, relative:str, isDirectory:bool)->bool:
+        return bool(self.generated.rules) and bool(self.generated.decide(relative, isDirectory))
+
+    def isOversized(self, entry:os.DirEntry)->bool:
+        if self.maxFileBytes is None:
+            return False
+        try:
+            return entry.stat().st_size > self.maxFileBytes
+        except OSError:
+            return False
+
+    def isIncluded(self, relative:str)->bool:
+        if not self.includes.rules:
+            return True
+        return bool(self.includes.decide(relative, isDirectory=False))
+
+    def accepts(self, path:Path)->bool:
+        # Même filtre que walkEntries pour un chemin isolé (fichiers signalés par git) ;
+        # les .gitignore sont déjà appliqués par git lui-même
+        path = Path(path)
+        try:
+            relative = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return False
+        if not isSupported(path.name) or not self.isIncluded(relative):
+            return False
+        parts = relative.split("/")
+        for depth in range(1, len(parts)):
+            folder = "/".join(parts[:depth])
+            if self.isIgnored(folder, True, []) or self.isGenerated(folder, True):
+                return False
+        return not (self.isIgnored(relative, False, []) or self.isGenerated(relative, False))
+
+    def walkEntries(self)->Iterator[os.DirEntry]:
+        self.stats = WalkStats()
+        self.folders = []
+        # (dossier, son chemin relatif à la racine, règles héritées avec leur position)
+        pending: List[Tuple[str, str, List[Tuple[int, IgnoreRules]]]] = [(self.root, "", [])]
+        while pending:
+            folder, folderRelative, rules = pending.pop()
+            prefix = folderRelative + "/" if folderRelative else ""
+            if self.useIgnoreFiles:
+                local = IgnoreRules.fromFolder(folder)
+                if local:
+                    rules = rules + [(len(prefix), local)]
+            try:
+                with os.scandir(folder) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                continue
+            self.stats.visitedDirectories += 1
+            self.folders.append(folder)
+            subfolders = []
+            for entry in entries:
+                relative = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if self.isIgnored(relative, True, rules):
+                        self.stats.prunedDirectories += 1
+                    elif self.isGenerated(relative, True):
+                        self.stats.prunedDirectories += 1
+                        self.stats.generatedDirectories += 1
+                    else:
+                        subfolders.append((entry.path, relative))
+                    continue
+                if not isSupported(entry.name) or self.isIgnored(relative, False, rules) or not self.isIncluded(relative):
+                    self.stats.skippedFiles += 1
+                    continue
+                if self.isGenerated(relative, False):
+                    self.stats.generatedFiles += 1
+                    continue
+                if self.isOversized(entry):
+                    self.stats.oversizedFiles += 1
+                    continue
+                self.stats.sourceFiles += 1
+                yield entry
+            for subfolder, subfolderRelative in reversed(subfolders):
+                pending.append((subfolder, subfolderRelative, rules))
+
+    def walk(self)->Iterator[Path]:
+        for entry in self.walkEntries():
+            yield Path(entry.path)
@@ -0,0 +1,228 @@
+import os
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+from tree_sitter import Tree
+
+from uml_generator.dependency_index import DependencyIndex
+from uml_generator.entities import FileResult, Project
+from uml_generator.file_scanner import FileScanner
+from uml_generator.parsers import parserFor
+from uml_generator.source_files import SkippedSource, readSource
+from uml_generator.walker import IGNORE_FILES, ProjectWalker
+
+# L'horloge des mtimes du noyau est grossière : un dossier modifié depuis moins
+# d'une seconde peut encore changer sans que son mtime bouge, on le reparcourt
+RACY_NS = 10**9
+
+
+def _commonPrefix(old:bytes, new:bytes)->int:
+    # Recherche dichotomique : les comparaisons de tranches se font en C
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _commonSuffix(old:bytes, new:bytes, prefix:int)->int:
+    low, high = 0, min(len(old), len(new)) - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:] == new[len(new) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _pointAt(code:bytes, offset:int)->Tuple[int, int]:
+    row = code.count(b"\n", 0, offset)
+    column = offset - (code.rfind(b"\n", 0, offset) + 1)
+    return (row, column)
+
+
+def applyEdit(tree:Tree, old:bytes, new:bytes)->None:
+    """Décrit à tree-sitter la plage modifiée entre deux versions d'un fichier."""
+    start = _commonPrefix(old, new)
+    suffix = _commonSuffix(old, new, start)
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    tree.edit(
+        start_byte=start,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_pointAt(old, start),
+        old_end_point=_pointAt(old, old_end),
+        new_end_point=_pointAt(new, new_end),
+    )
+
+
+class ProjectWatcher():
+    """Garde le projet en mémoire et ne ré-analyse que les fichiers modifiés.
+
+    Les changements sont détectés par scrutation des mtimes, sans dépendance à
+    inotify : tant que les dossiers parcourus et leurs .gitignore gardent le
+    même mtime, un stat par fichier connu suffit ; sinon l'arborescence est
+    reparcourue avec ProjectWalker. Les arbres
+    tree-sitter des fichiers déjà édités sont conservés pour un re-parse
+    incrémental.
+    """
+
+    def __init__(self, walker:ProjectWalker, results:Iterable[FileResult], render:Callable[[Project], None], interval:float=0.3):
+        self.walker = walker
+        self.link = Path(walker.root)
+        self.render = render
+        self.interval = interval
+        self.results: Dict[Path, FileResult] = {result.path: result for result in results}
+        self.index = DependencyIndex()
+        self.referrers: Dict[str, set[Path]] = {}
+        self.trees: Dict[Path, Tuple[bytes, Tree]] = {}
+        self.folders: List[str] = []
+        self.stamps: Dict[str, int|None] = {}
+        self.stampedAt = 0
+        for path, result in self.results.items():
+            self.index.addClasses(result.classs)
+            self._addReferrers(path, result)
+        for path, result in self.results.items():
+            self.results[path] = FileResult(path=path, classs=self.index.resolveClasses(result.classs))
+        self.mtimes = self.snapshot()
+
+    def _addReferrers(self, path:Path, result:FileResult)->None:
+        for classe in result.classs:
+            for token in classe.identifiers:
+                self.referrers.setdefault(token, set()).add(path)
+
+    def _removeReferrers(self, path:Path, result:FileResult)->None:
+        for classe in result.classs:
+            for token in classe.identifiers:
+                paths = self.referrers.get(token)
+                if paths:
+                    paths.discard(path)
+
+    def snapshot(self)->Dict[Path, int]:
+        # Parcours complet : un stat par fichier source, les dossiers ignorés ne sont pas parcourus
+        mtimes = {}
+        for entry in self.walker.walkEntries():
+            try:
+                mtimes[Path(entry.path)] = entry.stat().st_mtime_ns
+            except OSError:
+                # Disparu entre le listage et le stat (sauvegarde atomique d'un éditeur) : vu comme supprimé
+                continue
+        self.folders = self.walker.folders
+        self.stampedAt = time.time_ns()
+        self.stamps = self.folderStamps()
+        return mtimes
+
+    def folderStamps(self)->Dict[str, int|None]:
+        # Le mtime d'un dossier change à chaque création, suppression ou renommage d'une entrée
+        names = IGNORE_FILES if self.walker.useIgnoreFiles else ()
+        stamps: Dict[str, int|None] = {}
+        for folder in self.folders:
+            for path in (folder, *(os.path.join(folder, name) for name in names)):
+                try:
+                    stamps[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    stamps[path] = None
+        return stamps
+
+    def structureChanged(self)->bool:
+        racy = self.stampedAt - RACY_NS
+        if any(mtime is not None and mtime >= racy for mtime in self.stamps.values()):
+            return True
+        return self.folderStamps() != self.stamps
+
+    def restat(self)->Dict[Path, int]:
+        mtimes = {}
+        for path in self.mtimes:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    def poll(self)->List[Path]:
+        # Arborescence inchangée : pas de reparcours ni de règles d'exclusion à réévaluer
+        current = self.snapshot() if self.structureChanged() else self.restat()
+        changed = [path for path, mtime in current.items() if self.mtimes.get(path) != mtime]
+        changed += [path for path in self.mtimes if path not in current]
+        self.mtimes = current
+        return changed
+
+    def parseFile(self, path:Path)->FileResult:
+        try:
+            code = readSource(path)
+        except SkippedSource as skipped:
+            self.trees.pop(path, None)
+            return FileResult(path=path, skipped=skipped.reason)
+        parser = parserFor(path.name)
+        previous = self.trees.get(path)
+        if previous:
+            old_code, old_tree = previous
+            applyEdit(old_tree, old_code, code)
+            tree = parser.parse(code, old_tree)
+        else:
+            tree = parser.parse(code)
+        self.trees[path] = (code, tree)
+        return FileResult(path=path, classs=FileScanner.scanTree(root=tree.root_node, link=path, code=code))
+
+    @classmethod
+    def _signature(cls, result:FileResult|None)->tuple:
+        if result is None:
+            return ()
+        return tuple((classe.name, tuple(sorted(classe.instanciation_class.items()))) for classe in result.classs)
+
+    def applyChanges(self, changed:Iterable[Path])->None:
+        affected = set()
+        for path in changed:
+            old = self.results.pop(path, None)
+            new = None
+            if path.exists():
+                try:
+                    new = self.parseFile(path)
+                except (OSError, UnicodeDecodeError) as error:
+                    print(f"⚠️ {path} ignoré : {error}")
+            if new is None:
+                self.trees.pop(path, None)
+            touched = set()
+            if self._signature(old) != self._signature(new):
+                touched = DependencyIndex.definedSymbols(old.classs if old else []) | DependencyIndex.definedSymbols(new.classs if new else [])
+            if old:
+                self.index.removeClasses(old.classs)
+                self._removeReferrers(path, old)
+            if new:
+                self.index.addClasses(new.classs)
+                self._addReferrers(path, new)
+                self.results[path] = new
+                affected.add(path)
+            # Seuls les fichiers qui citent un symbole ajouté ou retiré sont re-résolus
+            for symbol in touched:
+                affected |= self.referrers.get(symbol, set())
+        for path in affected:
+            result = self.results.get(path)
+            if result:
+                self.results[path] = replace(result, classs=self.index.resolveClasses(result.classs))
+
+    def project(self)->Project:
+        # Ordre du parcours, comme un scan complet : un fichier modifié garde sa place
+        classs = [classe for path in self.mtimes if path in self.results for classe in self.results[path].classs]
+        return Project(name=self.link.name, classs=classs, path=self.link)
+
+    def run(self)->None:
+        print(f"👀 Surveillance de {self.link} (Ctrl+C pour arrêter)")
+        try:
+            while True:
+                changed = self.poll()
+                if changed:
+                    start = time.perf_counter()
+                    self.applyChanges(changed)
+                    self.render(self.project())
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"🔁 {len(changed)} fichier(s) modifié(s), diagramme régénéré en {elapsed:.1f} ms")
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("arrêt de la surveillance")
@@ -0,0 +1,235 @@
+import copy
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from uml_generator import profiling, source_files
+from uml_generator.dependency_index import DependencyIndex
+from uml_generator.entities import Class, FileResult, Project
+from uml_generator.parallel_scanner import _initWorker
+from uml_generator.scan_cache import DEFAULT_MAX_BYTES, ScanCache
+from uml_generator.walker import PRUNED_DIRECTORIES, WalkStats, globToRegex
+
+DEPENDENCY_FIELDS = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+# Sans --jobs, les paquets sont parcourus dans des threads : walk, stat et cache se recouvrent
+WORKSPACE_THREADS = 4
+ROOT_PACKAGE = "_root"
+
+
+@dataclass(frozen=True, slots=True)
+class WorkspacePackage():
+    name: str
+    path: Path
+    dependencies: Tuple[str, ...] = ()
+    # Sous-dossiers qui sont eux-mêmes des paquets, exclus de ce paquet
+    nested: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class PackageScan():
+    name: str
+    results: List[FileResult] = field(default_factory=list)
+    walkStats: WalkStats = field(default_factory=WalkStats)
+    skipped: Dict[str, int] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+
+def _readJson(path:Path)->Dict:
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _pnpmPatterns(path:Path)->List[str]:
+    # Lecture minimale de pnpm-workspace.yaml : la liste "packages:", sans dépendance YAML
+    try:
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except OSError:
+        return []
+    patterns, inPackages = [], False
+    for line in lines:
+        stripped = line.split("#", 1)[0].strip()
+        if not stripped:
+            continue
+        if not line[0].isspace():
+            inPackages = stripped == "packages:"
+        elif inPackages and stripped.startswith("-"):
+            patterns.append(stripped[1:].strip().strip("'\""))
+    return patterns
+
+
+class Workspace():
+    """Paquets d'un monorepo yarn/npm (package.json "workspaces") ou pnpm (pnpm-workspace.yaml)."""
+
+    @classmethod
+    def patterns(cls, root:Path)->List[str]:
+        workspaces = _readJson(root / "package.json").get("workspaces", [])
+        if isinstance(workspaces, dict):
+            workspaces = workspaces.get("packages", [])
+        patterns = [pattern for pattern in workspaces if isinstance(pattern, str)]
+        return patterns + _pnpmPatterns(root / "pnpm-workspace.yaml")
+
+    @classmethod
+    def discover(cls, root:Path)->List[WorkspacePackage]:
+        root = Path(root)
+        patterns = cls.patterns(root)
+        included = [re.compile(globToRegex(pattern.strip("/"))) for pattern in patterns if not pattern.startswith("!")]
+        excluded = [re.compile(globToRegex(pattern[1:].strip("/"))) for pattern in patterns if pattern.startswith("!")]
+        if not included:
+            return []
+        # Profondeur de parcours bornée par les motifs, sauf "**"
+        maxDepth = None if any("**" in pattern for pattern in patterns) else max(pattern.strip("/").count("/") + 1 for pattern in patterns)
+        folders: List[str] = []
+        for folder, subfolders, files in os.walk(root):
+            relative = Path(folder).relative_to(root).as_posix()
+            depth = 0 if relative == "." else relative.count("/") + 1
+            subfolders[:] = sorted(name for name in subfolders if name not in PRUNED_DIRECTORIES and (maxDepth is None or depth < maxDepth))
+            if relative == "." or "package.json" not in files:
+                continue
+            if any(regex.fullmatch(relative) for regex in included) and not any(regex.fullmatch(relative) for regex in excluded):
+                folders.append(relative)
+        manifests = {relative: _readJson(root / relative / "package.json") for relative in folders}
+        names = {relative: manifests[relative].get("name") or Path(relative).name for relative in folders}
+        known = set(names.values())
+        packages = []
+        for relative in folders:
+            declared = [name for key in DEPENDENCY_FIELDS for name in manifests[relative].get(key, {}) or {}]
+            packages.append(WorkspacePackage(
+                name=names[relative],
+                path=root / relative,
+                dependencies=tuple(dict.fromkeys(name for name in declared if name in known)),
+                nested=tuple(other[len(relative) + 1:] for other in folders if other.startswith(relative + "/")),
+            ))
+        return packages
+
+    @classmethod
+    def rootPackage(cls, root:Path, packages:List[WorkspacePackage])->WorkspacePackage:
+        # Fichiers hors paquets (scripts, config) : un sous-projet de plus, lié à tous les paquets qu'il déclare
+        manifest = _readJson(Path(root) / "package.json")
+        known = {package.name for package in packages}
+        declared = [name for key in DEPENDENCY_FIELDS for name in manifest.get(key, {}) or {}]
+        return WorkspacePackage(
+            name=ROOT_PACKAGE,
+            path=Path(root),
+            dependencies=tuple(dict.fromkeys(name for name in declared if name in known)),
+            nested=tuple(package.path.relative_to(root).as_posix() for package in packages),
+        )
+
+
+def _scanPackage(navigator, package:WorkspacePackage, cacheFolder:Path|None, cacheBytes:int)->PackageScan:
+    # Un paquet = un sous-projet avec son propre cache : un paquet modifié n'invalide pas les autres
+    navigator = copy.copy(navigator)
+    navigator.exclude = list(navigator.exclude) + [f"/{nested}/" for nested in package.nested]
+    navigator.skipped = {}
+    cache = ScanCache(folder=cacheFolder, maxBytes=cacheBytes) if cacheFolder else None
+    try:
+        results = list(navigator.scanFiles(files=navigator.projectFiles(package.path), jobs=1, cache=cache))
+    finally:
+        if cache:
+            cache.close()
+    return PackageScan(
+        name=package.name,
+        results=results,
+        walkStats=navigator.walkStats,
+        skipped=navigator.skipped,
+        hits=cache.hits if cache else 0,
+        misses=cache.misses if cache else len(results),
+    )
+
+
+def cacheName(root:Path, package:WorkspacePackage)->str:
+    # Par dossier, comme self.scans : deux paquets homonymes n'ont pas le même cache.
+    # Nom lisible, plus un hash du chemin relatif (sans collision entre a/b et a__b)
+    relative = package.path.relative_to(root).as_posix()
+    if relative == ".":
+        return ROOT_PACKAGE
+    return f"{package.path.name}-{hashlib.blake2b(relative.encode('utf-8'), digest_size=6).hexdigest()}"
+
+
+class WorkspaceScanner():
+    """Analyse un monorepo paquet par paquet, en parallèle, puis relie les paquets.
+
+    Chaque paquet est parcouru comme un sous-projet (les paquets imbriqués en
+    sont exclus) avec son propre cache. Les liens d'une classe sont résolus
+    dans son paquet et dans les paquets du workspace dont il dépend dans son
+    package.json : deux paquets sans dépendance déclarée ne sont pas reliés.
+    """
+
+    def __init__(self, root:Path, packages:List[WorkspacePackage], navigator, jobs:int=1, cacheFolder:Path|None=None, cacheBytes:int=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.packages = [Workspace.rootPackage(self.root, packages)] + list(packages)
+        self.navigator = navigator
+        self.jobs = jobs
+        self.cacheFolder = Path(cacheFolder) if cacheFolder else None
+        self.cacheBytes = cacheBytes
+        # Par dossier : deux paquets peuvent porter le même nom
+        self.scans: Dict[Path, PackageScan] = {}
+
+    def scan(self)->Dict[Path, PackageScan]:
+        if self.jobs > 1:
+            executor = ProcessPoolExecutor(max_workers=min(self.jobs, len(self.packages)), initializer=_initWorker, initargs=(False, source_files.limits()))
+        else:
+            executor = ThreadPoolExecutor(max_workers=min(WORKSPACE_THREADS, len(self.packages)))
+        with executor:
+            futures = [
+                executor.submit(_scanPackage, self.navigator, package, self.cacheFolder / cacheName(self.root, package) if self.cacheFolder else None, self.cacheBytes)
+                for package in self.packages
+            ]
+            self.scans = {package.path: future.result() for package, future in zip(self.packages, futures)}
+        return self.scans
+
+    def resolve(self)->Project:
+        classes: Dict[Path, List[Class]] = {
+            path: [classe for result in scan.results for classe in result.classs] for path, scan in self.scans.items()
+        }
+        folders: Dict[str, List[Path]] = {}
+        for package in self.packages[1:]:
+            folders.setdefault(package.name, []).append(package.path)
+        resolved: List[Class] = []
+        for package in self.packages:
+            own = classes[package.path]
+            # Index limité au paquet et à ses dépendances du workspace
+            index = DependencyIndex(own)
+            for dependency in package.dependencies:
+                for folder in folders.get(dependency, ()):
+                    index.addClasses(classes[folder])
+            resolved += index.resolveClasses(own)
+        return Project(name=self.root.name, classs=resolved, path=self.root)
+
+    def project(self)->Project:
+        with profiling.stage("workspace"):
+            self.scan()
+        with profiling.stage("resolve"):
+            return self.resolve()
+
+    def walkStats(self)->WalkStats:
+        total = WalkStats()
+        for scan in self.scans.values():
+            for item in fields(WalkStats):
+                setattr(total, item.name, getattr(total, item.name) + getattr(scan.walkStats, item.name))
+        return total
+
+    def skipped(self)->Dict[str, int]:
+        total: Dict[str, int] = {}
+        for scan in self.scans.values():
+            for reason, count in scan.skipped.items():
+                total[reason] = total.get(reason, 0) + count
+        return total
+
+    def report(self)->List[str]:
+        lines = [f"🧩 Workspace : {len(self.packages) - 1} paquets"]
+        for package in self.packages:
+            scan = self.scans[package.path]
+            classCount = sum(len(result.classs) for result in scan.results)
+            lines.append(f"  {package.name:<30} {len(scan.results):>6} fichiers, {classCount:>6} classes, {scan.misses} analysés, {scan.hits} en cache")
+        return lines